@@ -0,0 +1,42 @@
+'''
+Created on October 18, 2026
+
+@author: Albert Rodriguez (@UncleFirefox)
+
+Geometry of a BMesh for the geodesic solvers, read in full every time.
+Kept apart from the providers working on plain arrays, which don't
+depend on Blender.
+
+'''
+
+from bmesh.types import BMesh
+import numpy as np
+from .geometry_provider import GeometryProvider
+
+
+class BMeshGeometry(GeometryProvider):
+    '''
+    Vertex ids are positions in bm.verts, the indices of the vertices
+    when they are up to date
+    '''
+
+    def __init__(self, bm: BMesh):
+        self.bm = bm
+
+    def read(self):
+        return read_bmesh(self.bm) + (None,)
+
+
+def read_bmesh(bm: BMesh):
+    '''
+    Vertex (N,3) and triangle (M,3) arrays of a BMesh of any kind of
+    faces, vertices are numbered in the order of bm.verts without
+    touching their indices
+    '''
+    vert_idx = {v: i for i, v in enumerate(bm.verts)}
+
+    verts = np.array([v.co[:] for v in bm.verts], dtype=np.float64)
+    tris = np.array([[vert_idx[loop.vert] for loop in tri]
+                     for tri in bm.calc_loop_triangles()], dtype=np.int64)
+
+    return verts.reshape(-1, 3), tris.reshape(-1, 3)
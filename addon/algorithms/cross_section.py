@@ -0,0 +1,426 @@
+'''
+Created on October 18, 2026
+
+@author: Albert Rodriguez (@UncleFirefox)
+
+Cross sections of a triangle mesh by a plane, kept in NumPy arrays so
+cutting it again at another height doesn't copy or touch the mesh.
+
+Every vertex gets its signed distance to the plane in one pass, only the
+triangles with vertices on both sides emit a segment and the points of
+the segments are shared through the mesh element they lie on: the edge
+they cross or the vertex when it's right on the plane.
+Sharing them is what lets the segments be walked into the loops of the
+section afterwards.
+
+Triangles are looked up by the interval they span along the normal of
+the plane, so cutting only visits the ones around it. The index is built
+along the normal of the first cut and again whenever the normal changes.
+
+'''
+
+import numpy as np
+
+
+class CrossSection(object):
+
+    def __init__(self, verts, tris):
+
+        self.verts = np.asarray(verts, dtype=np.float64).reshape(-1, 3)
+        self.tris = np.asarray(tris, dtype=np.int64).reshape(-1, 3)
+
+        # Edges of the mesh and the three edges of every triangle,
+        # told apart by a single integer key per vertex pair
+        corners = np.sort(
+            self.tris[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+        keys, tri_edges = np.unique(pair_keys(corners, self.vert_count),
+                                    return_inverse=True)
+        self.edges = np.stack(np.divmod(keys, self.vert_count), axis=1)
+        self.tri_edges = tri_edges.reshape(-1, 3)
+
+        self.index = None
+
+    @property
+    def vert_count(self) -> int:
+        return len(self.verts)
+
+    def slice(self, plane_co, plane_no, tri_idxs: np.ndarray = None):
+        '''
+        plane_co - point of the plane
+
+        plane_no - normal of the plane
+
+        tri_idxs - (optional) triangles to cut, the ones the index
+        finds around the plane by default. Triangles left out must not
+        reach the plane
+
+        returns - points (P,3) of the section and the segments (S,2)
+        joining them, segments follow no particular order
+        '''
+        plane_co = np.asarray(plane_co, dtype=np.float64)
+        plane_no = np.asarray(plane_no, dtype=np.float64)
+
+        if tri_idxs is None:
+            tri_idxs = self.find_tris(plane_co, plane_no)
+
+        dists = self.get_distances(
+            np.unique(self.tris[tri_idxs]), plane_co, plane_no)
+
+        tris = self.tris[tri_idxs]
+
+        # Vertices on the plane count as above it
+        above = dists >= 0
+
+        side_count = above[tris].sum(axis=1)
+        straddling = (side_count == 1) | (side_count == 2)
+
+        edges = self.tri_edges[tri_idxs[straddling]]
+
+        # Every straddling triangle crosses exactly two of its edges
+        crossed = above[self.edges[edges, 0]] != above[self.edges[edges, 1]]
+        edges = edges[crossed].reshape(-1, 2)
+
+        keys, points = self.get_crossings(edges.ravel(), dists)
+
+        unique_keys, first, segments = np.unique(
+            keys, return_index=True, return_inverse=True)
+        segments = segments.reshape(-1, 2)
+
+        # Triangles touching the plane at a vertex give empty segments,
+        # edges lying on it are given by the triangles at both sides
+        segments = np.sort(segments[segments[:, 0] != segments[:, 1]],
+                           axis=1)
+        segments = np.unique(pair_keys(segments, len(first)))
+        segments = np.stack(np.divmod(segments, len(first)), axis=1)
+
+        return points[first], segments
+
+    def find_tris(self, plane_co, plane_no) -> np.ndarray:
+        '''
+        returns - indices of the triangles that may reach the plane
+        '''
+        direction = plane_no / np.linalg.norm(plane_no)
+
+        if self.index is None or not self.index.is_along(direction):
+            self.index = IntervalIndex(self.verts, self.tris, direction)
+
+        return self.index.find(plane_co)
+
+    def get_distances(self, vert_idxs: np.ndarray, plane_co, plane_no):
+        '''
+        returns - (N,) signed distances to the plane, only filled
+        for the given vertices or all of them when None
+        '''
+        if vert_idxs is None:
+            return (self.verts - plane_co) @ plane_no
+
+        dists = np.zeros(self.vert_count)
+        dists[vert_idxs] = (self.verts[vert_idxs] - plane_co) @ plane_no
+
+        return dists
+
+    def get_crossings(self, edges: np.ndarray, dists: np.ndarray):
+        '''
+        returns - key of the mesh element every crossing lies on,
+        vertex index or vertex count plus the edge index, and the
+        crossing points
+        '''
+        start, end = self.edges[edges, 0], self.edges[edges, 1]
+        d_start, d_end = dists[start], dists[end]
+
+        t = d_start / (d_start - d_end)
+        points = self.verts[start] + \
+            t[:, None] * (self.verts[end] - self.verts[start])
+
+        keys = np.where(d_start == 0, start,
+                        np.where(d_end == 0, end, self.vert_count + edges))
+
+        return keys, points
+
+
+def pair_keys(pairs: np.ndarray, count: int) -> np.ndarray:
+    '''
+    returns - (N,) integer keys of (N,2) pairs of indices below count,
+    ordered like the pairs
+    '''
+    return pairs[:, 0].astype(np.int64) * count + pairs[:, 1]
+
+
+class IntervalIndex(object):
+    '''
+    Triangles bucketed by the interval they span along a direction,
+    a triangle is listed in every bucket its interval overlaps.
+    Buckets are about as long as the average interval so most
+    triangles fall in one or two of them.
+    '''
+
+    def __init__(self, verts: np.ndarray, tris: np.ndarray, direction):
+
+        self.direction = np.asarray(direction, dtype=np.float64)
+
+        heights = (verts @ self.direction)[tris]
+        self.low = heights.min(axis=1)
+        self.high = heights.max(axis=1)
+
+        start = self.low.min() if len(tris) > 0 else 0.
+        extent = (self.high.max() - start) if len(tris) > 0 else 0.
+        span = (self.high - self.low).mean() if len(tris) > 0 else 0.
+
+        self.start = start
+        self.bucket_count = int(np.clip(extent / max(span, 1e-12),
+                                        1, max(len(tris), 1)))
+        self.bucket_size = max(extent / self.bucket_count, 1e-12)
+
+        first = self.get_buckets(self.low)
+        counts = self.get_buckets(self.high) - first + 1
+
+        # Buckets in CSR form, triangles sorted by bucket
+        tri_idxs = np.repeat(np.arange(len(tris)), counts)
+        buckets = np.repeat(first - np.cumsum(counts) + counts, counts) + \
+            np.arange(counts.sum())
+
+        order = np.argsort(buckets, kind='stable')
+        self.bucket_tris = tri_idxs[order]
+        self.offsets = np.concatenate(([0], np.cumsum(
+            np.bincount(buckets, minlength=self.bucket_count))))
+
+    def is_along(self, direction) -> bool:
+        return abs(self.direction.dot(direction)) > 1 - 1e-9
+
+    def get_buckets(self, heights):
+        return np.clip(((heights - self.start) / self.bucket_size)
+                       .astype(np.int64), 0, self.bucket_count - 1)
+
+    def find(self, point) -> np.ndarray:
+        '''
+        returns - indices of the triangles whose interval contains
+        the height of point
+        '''
+        height = np.dot(point, self.direction)
+
+        bucket = int(self.get_buckets(np.array([height]))[0])
+        tri_idxs = self.bucket_tris[
+            self.offsets[bucket]:self.offsets[bucket+1]]
+
+        inside = (self.low[tri_idxs] <= height) & \
+            (height <= self.high[tri_idxs])
+
+        return tri_idxs[inside]
+
+
+class Contour(object):
+    '''
+    Polyline of a cross section, closed ones don't repeat
+    their first point at the end
+    '''
+
+    def __init__(self, points: np.ndarray, closed: bool):
+        self.points = points
+        self.closed = closed
+
+        ends = np.concatenate((points, points[:1])) if closed else points
+        self.length = float(
+            np.linalg.norm(np.diff(ends, axis=0), axis=1).sum())
+
+        self.bbox_min = points.min(axis=0)
+        self.bbox_max = points.max(axis=0)
+
+        self.hull = None
+        self.hull_normal = None
+
+    def get_bbox_distance(self, point) -> float:
+        gap = np.maximum(self.bbox_min - point, point - self.bbox_max)
+        return float(np.linalg.norm(np.maximum(gap, 0)))
+
+    def get_distance(self, point) -> float:
+        return float(np.linalg.norm(self.points - point, axis=1).min())
+
+    def get_hull(self, plane_no) -> np.ndarray:
+        '''
+        Points of the contour a tape around it would touch, the convex
+        hull of the contour in the plane with the given normal
+
+        returns - (K,3) hull points counterclockwise around the normal
+        '''
+        plane_no = np.asarray(plane_no, dtype=np.float64)
+
+        if self.hull is None or \
+                not np.array_equal(plane_no, self.hull_normal):
+            frame = get_plane_frame(plane_no)
+            self.hull = self.points[convex_hull(self.points @ frame.T)]
+            self.hull_normal = plane_no
+
+        return self.hull
+
+    def get_hull_length(self, plane_no) -> float:
+        return float(get_hull_lengths([self], plane_no)[0])
+
+
+def trace_contours(points: np.ndarray, segments: np.ndarray):
+    '''
+    Walks the segments of a cross section into polylines, open ones
+    are walked from one of their ends
+
+    returns - list of Contour
+    '''
+    count = len(points)
+
+    # Segments around every point in CSR form
+    ends = np.concatenate((segments, segments[:, ::-1]))
+    order = np.argsort(ends[:, 0], kind='stable')
+    offsets = np.concatenate(([0], np.cumsum(
+        np.bincount(ends[:, 0], minlength=count)))).tolist()
+    neighbors = ends[order, 1].tolist()
+    segment_ids = np.tile(np.arange(len(segments)), 2)[order].tolist()
+
+    used = [False] * len(segments)
+    degrees = np.diff(offsets)
+
+    contours = []
+    starts = np.concatenate((np.flatnonzero(degrees == 1),
+                             np.flatnonzero(degrees > 1)))
+
+    for start in starts.tolist():
+        while True:
+            path = walk(start, offsets, neighbors, segment_ids, used)
+            if len(path) < 2:
+                break
+
+            closed = len(path) > 2 and path[0] == path[-1]
+            if closed:
+                path.pop()
+
+            contours.append(Contour(points[path], closed))
+
+    return contours
+
+
+def walk(start, offsets, neighbors, segment_ids, used):
+
+    path = [start]
+    current = start
+
+    while True:
+        for i in range(offsets[current], offsets[current+1]):
+            if not used[segment_ids[i]]:
+                break
+        else:
+            return path
+
+        used[segment_ids[i]] = True
+        current = neighbors[i]
+        path.append(current)
+
+        if current == start:
+            return path
+
+
+def get_closest_contour(contours, point):
+    '''
+    returns - index of the contour closest to point, None if there
+    are none. Contours are checked in order of their bounding box
+    distance and skipped once it's farther than the best so far
+    '''
+    point = np.asarray(point, dtype=np.float64)
+
+    bbox_distances = [c.get_bbox_distance(point) for c in contours]
+
+    result, min_distance = None, np.inf
+    for i in np.argsort(bbox_distances, kind='stable').tolist():
+        if bbox_distances[i] > min_distance:
+            break
+
+        distance = contours[i].get_distance(point)
+        if distance < min_distance:
+            result, min_distance = i, distance
+
+    return result
+
+
+def get_plane_frame(plane_no) -> np.ndarray:
+    '''
+    returns - (2,3) orthonormal axes of the plane, counterclockwise
+    around the normal
+    '''
+    normal = plane_no / np.linalg.norm(plane_no)
+
+    # Start from the world axis farthest from the normal
+    axis = np.zeros(3)
+    axis[np.argmin(np.abs(normal))] = 1
+
+    u = np.cross(axis, normal)
+    u /= np.linalg.norm(u)
+
+    return np.stack((u, np.cross(normal, u)))
+
+
+def convex_hull(points: np.ndarray) -> np.ndarray:
+    '''
+    Monotone chain convex hull of (N,2) points
+
+    Points inside the quadrilateral of the extreme points can't be in
+    the hull, they are dropped in one vectorized pass before the chain
+    so it usually only walks a few of them
+
+    returns - indices of the hull points, counterclockwise
+    '''
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+
+    if len(points) < 3:
+        return np.arange(len(points))
+
+    x, y = points[:, 0], points[:, 1]
+    quad = points[[np.argmin(x), np.argmin(y), np.argmax(x), np.argmax(y)]]
+
+    inside = np.ones(len(points), dtype=bool)
+    for a, b in zip(quad, np.roll(quad, -1, axis=0)):
+        edge, offsets = b - a, points - a
+        inside &= edge[0] * offsets[:, 1] - edge[1] * offsets[:, 0] > 0
+
+    candidates = np.flatnonzero(~inside)
+    order = candidates[np.lexsort((y[candidates], x[candidates]))].tolist()
+
+    xs, ys = x.tolist(), y.tolist()
+
+    def half_hull(order):
+        hull = []
+        for i in order:
+            while len(hull) >= 2:
+                a, b = hull[-2], hull[-1]
+                turn = (xs[b] - xs[a]) * (ys[i] - ys[a]) - \
+                    (ys[b] - ys[a]) * (xs[i] - xs[a])
+                if turn > 0:
+                    break
+                hull.pop()
+            hull.append(i)
+        return hull
+
+    lower = half_hull(order)
+    upper = half_hull(reversed(order))
+
+    return np.array(lower[:-1] + upper[:-1], dtype=np.int64)
+
+
+def get_hull_lengths(contours, plane_no) -> np.ndarray:
+    '''
+    returns - (N,) tape lengths of the contours of a section, the sides
+    of all their hulls are measured in one pass over them concatenated
+    '''
+    hulls = [c.get_hull(plane_no) for c in contours]
+    counts = np.array([len(h) for h in hulls], dtype=np.int64)
+
+    if counts.sum() == 0:
+        return np.zeros(len(hulls))
+
+    points = np.concatenate(hulls)
+
+    # Every point is joined to the following one of its hull,
+    # the last one of a hull to its first
+    starts = np.cumsum(counts) - counts
+    following = np.arange(1, len(points) + 1)
+    following[(starts + counts - 1)[counts > 0]] = starts[counts > 0]
+
+    sides = np.linalg.norm(points[following] - points, axis=1)
+
+    return np.bincount(np.repeat(np.arange(len(hulls)), counts),
+                       weights=sides, minlength=len(hulls))
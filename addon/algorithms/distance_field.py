@@ -0,0 +1,418 @@
+'''
+Created on October 18, 2026
+
+@author: Albert Rodriguez (@UncleFirefox)
+
+Distance fields from a source vertex kept by the backends that compute
+them (fast marching, heat method). A later query from the same source,
+or to it, only walks down the field it already has: moving a key point
+around keeps asking for paths from the key points next to it.
+
+Placing a point subdivides a face or an edge without moving the surface,
+a field takes the new vertices with the value it had at their position,
+interpolated from the corners of the removed triangle they lie in. The
+field over the new triangles is the same one so is its descent.
+
+'''
+
+from collections import OrderedDict
+import numpy as np
+from .fast_marching_arrays import FAR, FIXED, Front, Marching_Mode, \
+    MarchingMesh, march_bidirectional
+from .mesh_gradient import trace_path
+
+# Memory the distance fields of a solver can take
+MAX_FIELD_CACHE_BYTES = 64 * 1024 * 1024
+
+
+class DistanceField(object):
+    '''
+    Distances from the source to every vertex of the mesh
+    '''
+    def __init__(self, mesh: MarchingMesh, source: int,
+                 distances: np.ndarray):
+        self.mesh = mesh
+        self.source = source
+        self.distances = np.asarray(distances, dtype=np.float64)
+
+    @property
+    def nbytes(self) -> int:
+        return self.distances.nbytes
+
+    def covers(self, vert_idxs: "list[int]") -> bool:
+        return True
+
+    def extend(self, vert_idxs: "list[int]", max_iters: int = None):
+        '''
+        Makes sure the distances of the vertices are known
+        '''
+        pass
+
+    def path_to(self, vert_idx: int) -> np.ndarray:
+        '''
+        returns - (K,3) points from the source to the vertex
+        '''
+        # Descent goes from the vertex to the source of the field
+        return trace_path(self.mesh, self.distances, vert_idx,
+                          self.source)[::-1]
+
+    def patch(self, removed_tris, added_tris) -> bool:
+        '''
+        Takes the vertices added to the mesh since the field was computed
+
+        removed_tris, added_tris - (R,3) and (A,3) triangles of the patch
+
+        returns - False when the field can't follow the patch
+        '''
+        values = interpolate_new_verts(self.mesh, self.distances,
+                                       removed_tris)
+        if values is None:
+            return False
+
+        self.distances = np.concatenate((self.distances, values))
+
+        return True
+
+
+class MarchedField(DistanceField):
+    '''
+    Distances of a front marched from the source, only the ones of
+    the vertices it fixed are known. Extending it carries on the march
+    '''
+    def __init__(self, front: Front):
+        self.front = front
+        self.mesh = front.mesh
+        self.source = front.source
+
+    @property
+    def distances(self) -> np.ndarray:
+        return self.front.geos
+
+    @property
+    def nbytes(self) -> int:
+        return self.front.geos.nbytes + self.front.state.nbytes
+
+    def covers(self, vert_idxs: "list[int]") -> bool:
+        return bool((self.front.state[list(vert_idxs)] == FIXED).all())
+
+    def extend(self, vert_idxs: "list[int]", max_iters: int = None):
+        self.front.advance(set(vert_idxs), max_iters)
+
+    def patch(self, removed_tris, added_tris) -> bool:
+        '''
+        Keeps the field when the patch is either within the vertices
+        the front fixed or ahead of the front
+        '''
+        front = self.front
+        count = len(front.geos)
+
+        corners = np.concatenate((np.ravel(removed_tris),
+                                  np.ravel(added_tris))).astype(np.int64)
+        fixed = front.state[corners[corners < count]] == FIXED
+
+        if fixed.all():
+            values = interpolate_new_verts(self.mesh, front.geos,
+                                           removed_tris)
+            if values is None:
+                return False
+            state = FIXED
+        elif not fixed.any():
+            # The front will reach the new vertices on its own
+            values = np.full(self.mesh.vert_count - count, np.inf)
+            state = FAR
+        else:
+            return False
+
+        front.geos = np.concatenate((front.geos, values))
+        front.state = np.concatenate(
+            (front.state, np.full(len(values), state, dtype=np.uint8)))
+
+        return True
+
+
+class FieldCache(object):
+    '''
+    Distance fields of the most recently used sources, the least recently
+    used ones are dropped once they take more than max_bytes
+    '''
+    def __init__(self, max_bytes: int = MAX_FIELD_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.fields = OrderedDict()
+
+    def __contains__(self, source: int) -> bool:
+        return source in self.fields
+
+    def get(self, source: int) -> DistanceField:
+        field = self.fields.get(source)
+
+        if field is not None:
+            self.fields.move_to_end(source)
+
+        return field
+
+    def add(self, field: DistanceField):
+        self.fields[field.source] = field
+
+        # Always keep the newest one
+        while len(self.fields) > 1 and self.nbytes > self.max_bytes:
+            self.fields.popitem(last=False)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(field.nbytes for field in self.fields.values())
+
+    def patch(self, removed_tris, added_tris):
+        '''
+        Fields that can't follow the patch are dropped,
+        they are computed again the next time they're needed
+        '''
+        for source, field in list(self.fields.items()):
+            if not field.patch(removed_tris, added_tris):
+                del self.fields[source]
+
+
+class FieldSolver(object):
+    '''
+    Geodesic paths walking down the distance fields of their ends.
+    The field of the start is used if it's cached, otherwise the one of
+    the end, and only when neither is a new one is computed from the
+    start. Subclasses compute the fields, the ones that can follow local
+    edits of the mesh patch the cached fields with it.
+    '''
+    def __init__(self, verts, tris, max_bytes: int = MAX_FIELD_CACHE_BYTES):
+        self.mesh = MarchingMesh(verts, tris)
+        self.fields = FieldCache(max_bytes)
+
+    def compute_field(self, source: int) -> DistanceField:
+        raise NotImplementedError
+
+    def field(self, source: int, vert_idxs: "list[int]" = (),
+              max_iters: int = None) -> DistanceField:
+        '''
+        Field of the source covering the vertices, the cached one
+        if there is, extended if needed
+
+        max_iters - (optional) limits the work to extend the field
+        '''
+        field = self.fields.get(source)
+
+        if field is None:
+            field = self.compute_field(source)
+            self.fields.add(field)
+
+        if not field.covers(vert_idxs):
+            field.extend(vert_idxs, max_iters)
+
+        return field
+
+    def find_geodesic_path(self, start_vert_idx: int, end_vert_idx: int,
+                           max_iters: int = None):
+
+        if start_vert_idx not in self.fields and \
+                end_vert_idx in self.fields:
+            return self.field(end_vert_idx, [start_vert_idx],
+                              max_iters).path_to(start_vert_idx)[::-1]
+
+        return self.field(start_vert_idx, [end_vert_idx],
+                          max_iters).path_to(end_vert_idx)
+
+    def find_geodesic_paths(self, start_vert_idx: int,
+                            end_vert_idxs: "list[int]",
+                            max_iters: int = None):
+        '''
+        Paths from the start to every end out of a single field
+        '''
+        field = self.field(start_vert_idx, end_vert_idxs, max_iters)
+
+        return [field.path_to(end_vert_idx)
+                for end_vert_idx in end_vert_idxs]
+
+
+class FastMarchingSolver(FieldSolver):
+    '''
+    Fields are fronts marched from their source until the vertices asked
+    for are fixed, carried on when a later query needs more of them
+    '''
+    def compute_field(self, source: int) -> MarchedField:
+        return MarchedField(Front(self.mesh, source))
+
+    def patch(self, verts, removed_tris, added_tris):
+        self.mesh.patch(verts, removed_tris, added_tris)
+        self.fields.patch(removed_tris, added_tris)
+
+    def find_geodesic_path(self, start_vert_idx: int, end_vert_idx: int,
+                           max_iters: int = None,
+                           mode: Marching_Mode = Marching_Mode.FORWARD):
+        '''
+        Walks down the field of one of the ends, or marches from both
+        until they meet, the fronts of the latter are not kept
+        '''
+        if mode == Marching_Mode.BIDIRECTIONAL:
+            return self.find_geodesic_path_bidirectional(
+                start_vert_idx, end_vert_idx, max_iters)
+
+        return super().find_geodesic_path(start_vert_idx, end_vert_idx,
+                                          max_iters)
+
+    def find_geodesic_path_bidirectional(self, start_vert_idx: int,
+                                         end_vert_idx: int,
+                                         max_iters: int = None):
+        '''
+        Joins the descents from the meeting vertex of both fronts
+        '''
+        meeting, (start_front, end_front) = march_bidirectional(
+            self.mesh, start_vert_idx, end_vert_idx, max_iters)
+
+        # Ends not connected, same straight segment a single front gives
+        if meeting < 0:
+            return self.mesh.verts[[start_vert_idx, end_vert_idx]]
+
+        to_start = trace_path(self.mesh, start_front.geos, meeting,
+                              start_vert_idx)
+        to_end = trace_path(self.mesh, end_front.geos, meeting,
+                            end_vert_idx)
+
+        return np.concatenate((to_start[::-1], to_end[1:]))
+
+
+class SourceFieldSolver(FieldSolver):
+    '''
+    Fields computed by compute_distance(source), a function that only
+    knows the vertices the solver was built with, like the factored
+    heat method. The vertices patched in are located in the triangle
+    they split:
+    - fields get their values interpolated from its corners
+    - the field of a new vertex is the shortest way to go through one
+    of the corners, the distance to the corner plus its field. It's an
+    upper bound off by less than the size of the triangle and exact
+    along the path through the corner it goes.
+    The function is never called with a vertex it doesn't know, the
+    solver is not built again when points are placed.
+    '''
+    def __init__(self, verts, tris, compute_distance,
+                 max_bytes: int = MAX_FIELD_CACHE_BYTES):
+        super().__init__(verts, tris, max_bytes)
+        self.compute_distance = compute_distance
+        self.base_vert_count = self.mesh.vert_count
+
+        # Triangle corners and weights of the new vertices in the order
+        # they were added, corners always come before the vertex
+        self.new_vert_corners = np.empty((0, 3), dtype=np.int64)
+        self.new_vert_weights = np.empty((0, 3))
+
+    def patch(self, verts, removed_tris, added_tris):
+        vert_count = self.mesh.vert_count
+
+        self.mesh.patch(verts, removed_tris, added_tris)
+        self.fields.patch(removed_tris, added_tris)
+
+        location = locate_new_verts(self.mesh, vert_count, removed_tris)
+
+        # Vertices out of a split triangle only follow their closest one
+        if location is None:
+            co = self.mesh.verts
+            closest = [np.linalg.norm(co[:vert_count] - p, axis=1).argmin()
+                       for p in co[vert_count:]]
+            location = (np.repeat(closest, 3).reshape(-1, 3),
+                        np.tile((1., 0, 0), (len(closest), 1)))
+
+        corners, weights = location
+        self.new_vert_corners = np.concatenate(
+            (self.new_vert_corners, corners))
+        self.new_vert_weights = np.concatenate(
+            (self.new_vert_weights, weights))
+
+    def compute_field(self, source: int) -> DistanceField:
+
+        if source < self.base_vert_count:
+            return DistanceField(self.mesh, source, self.extend_values(
+                self.compute_distance(source)))
+
+        co = self.mesh.verts
+        corners = self.new_vert_corners[source - self.base_vert_count]
+
+        distances = np.min(
+            [np.linalg.norm(co[source] - co[corner]) +
+             self.field(corner).distances
+             for corner in set(corners.tolist())], axis=0)
+        distances[source] = 0
+
+        return DistanceField(self.mesh, source, distances)
+
+    def extend_values(self, values) -> np.ndarray:
+        '''
+        Values on the base vertices followed by the ones interpolated
+        for the new vertices
+        '''
+        result = np.empty(self.mesh.vert_count)
+        result[:self.base_vert_count] = values
+
+        for i, (corners, weights) in enumerate(
+                zip(self.new_vert_corners, self.new_vert_weights),
+                self.base_vert_count):
+            result[i] = (weights * result[corners]).sum()
+
+        return result
+
+
+def interpolate_new_verts(mesh: MarchingMesh, values: np.ndarray,
+                          removed_tris) -> np.ndarray:
+    '''
+    Values of the vertices the mesh has after the first len(values),
+    interpolated linearly in the removed triangle each one lies in
+
+    returns - (K,) values, None if there are new vertices but
+    no removed triangle to take their values from
+    '''
+    location = locate_new_verts(mesh, len(values), removed_tris)
+    if location is None:
+        return None
+
+    corners, weights = location
+
+    return (weights * values[corners]).sum(axis=-1)
+
+
+def locate_new_verts(mesh: MarchingMesh, vert_count: int, removed_tris):
+    '''
+    Removed triangle each vertex after the first vert_count lies in
+
+    returns - (K,3) corners and (K,3) barycentric weights, None if there
+    are new vertices but no removed triangle
+    '''
+    new_verts = mesh.verts[vert_count:]
+    removed_tris = np.asarray(removed_tris, dtype=np.int64).reshape(-1, 3)
+
+    if len(new_verts) == 0:
+        return np.empty((0, 3), dtype=np.int64), np.empty((0, 3))
+
+    if len(removed_tris) == 0:
+        return None
+
+    # Barycentric coordinates of every new vertex in every triangle,
+    # projected on the plane of the triangle
+    a, b, c = (mesh.verts[removed_tris[:, i]][:, None] for i in range(3))
+    e1, e2, p = b - a, c - a, new_verts[None] - a
+
+    d11 = (e1 * e1).sum(-1)
+    d12 = (e1 * e2).sum(-1)
+    d22 = (e2 * e2).sum(-1)
+    dp1 = (p * e1).sum(-1)
+    dp2 = (p * e2).sum(-1)
+
+    det = d11 * d22 - d12 * d12
+    det = np.where(det == 0, 1, det)
+
+    v = (d22 * dp1 - d12 * dp2) / det
+    w = (d11 * dp2 - d12 * dp1) / det
+    bary = np.stack((1 - v - w, v, w), axis=-1)
+
+    # The triangle the vertex is the deepest in, new vertices lie
+    # inside or on the border of one of them
+    best = bary.min(axis=-1).argmax(axis=0)
+    cols = np.arange(len(new_verts))
+
+    weights = np.clip(bary[best, cols], 0, None)
+    weights /= weights.sum(axis=-1, keepdims=True)
+
+    return removed_tris[best], weights
@@ -0,0 +1,191 @@
+'''
+Created on October 18, 2026
+
+@author: Albert Rodriguez (@UncleFirefox)
+
+Shortest paths along the edges of a mesh
+
+The edges are kept in CSR form (per vertex offsets into flat neighbor
+and length arrays) and the search is Dijkstra's algorithm over a heap,
+optionally guided towards the target like A*. The tree of the search
+lives in a predecessor array and the search stops as soon as the target
+is settled.
+
+Local edits of the mesh are patched in without building the arrays
+again, the vertices they touch get their edges from a dictionary.
+
+'''
+
+from heapq import heappop, heappush
+import numpy as np
+from .mesh_arrays import grow
+
+
+class EdgeGraph(object):
+
+    def __init__(self, verts, tris):
+
+        self.vert_buffer = np.asarray(
+            verts, dtype=np.float64).reshape(-1, 3)
+        self.verts = self.vert_buffer
+        tris = np.asarray(tris, dtype=np.int64).reshape(-1, 3)
+
+        vert_count = len(self.verts)
+
+        # Both directions of every edge, without repetitions. Every
+        # triangle goes once through each direction of its edges
+        src = np.concatenate((tris.ravel(), tris[:, [1, 2, 0]].ravel()))
+        dst = np.concatenate((tris[:, [1, 2, 0]].ravel(), tris.ravel()))
+        keys, tri_counts = np.unique(src * vert_count + dst,
+                                     return_counts=True)
+        src, dst = keys // vert_count, keys % vert_count
+
+        counts = np.bincount(src, minlength=vert_count)
+        self.offsets = np.concatenate(([0], np.cumsum(counts)))
+        self.neighbors = dst
+        self.lengths = np.linalg.norm(self.verts[src] - self.verts[dst],
+                                      axis=1)
+        self.tri_counts = tri_counts
+
+        # Vertices touched by patches:
+        # vertex -> {neighbor: number of triangles of the edge}
+        # vertex -> (neighbors, lengths) arrays
+        self.patched_counts = dict()
+        self.patched_edges = dict()
+
+    @property
+    def vert_count(self) -> int:
+        return len(self.verts)
+
+    def get_edges(self, v: int):
+        '''
+        returns - neighbors and lengths of the edges leaving v
+        '''
+        edges = self.patched_edges.get(v)
+        if edges is not None:
+            return edges
+
+        start, end = self.offsets[v], self.offsets[v+1]
+        return self.neighbors[start:end], self.lengths[start:end]
+
+    def patch(self, verts, removed_tris, added_tris):
+        '''
+        Applies local edits of the mesh
+
+        verts - (K,3) coordinates of the new vertices,
+        numbered after the existing ones
+
+        removed_tris, added_tris - (R,3) and (A,3) triangles
+        '''
+        verts = np.asarray(verts, dtype=np.float64).reshape(-1, 3)
+        vert_count = self.vert_count
+
+        if vert_count + len(verts) > len(self.vert_buffer):
+            self.vert_buffer = grow(self.vert_buffer,
+                                    vert_count + len(verts))
+        self.vert_buffer[vert_count:vert_count + len(verts)] = verts
+        self.verts = self.vert_buffer[:vert_count + len(verts)]
+
+        touched = set()
+
+        for tris, step in ((removed_tris, -1), (added_tris, 1)):
+            for tri in np.asarray(tris).reshape(-1, 3).tolist():
+                for u, v in zip(tri, tri[1:] + tri[:1]):
+                    self.count_edge(u, v, step)
+                    self.count_edge(v, u, step)
+                touched.update(tri)
+
+        for v in touched:
+            neighbors = np.fromiter(self.patched_counts[v], dtype=np.int64)
+            self.patched_edges[v] = (neighbors, np.linalg.norm(
+                self.verts[neighbors] - self.verts[v], axis=1))
+
+    def count_edge(self, u: int, v: int, step: int):
+
+        counts = self.patched_counts.get(u)
+
+        if counts is None:
+            counts = dict()
+            if u < len(self.offsets) - 1:
+                start, end = self.offsets[u], self.offsets[u+1]
+                counts = dict(zip(self.neighbors[start:end].tolist(),
+                                  self.tri_counts[start:end].tolist()))
+            self.patched_counts[u] = counts
+
+        count = counts.get(v, 0) + step
+
+        # The edge is gone with its last triangle
+        if count > 0:
+            counts[v] = count
+        else:
+            counts.pop(v, None)
+
+
+def shortest_path(graph: EdgeGraph,
+                  start_vert_idx: int,
+                  end_vert_idx: int,
+                  guided: bool = True) -> np.ndarray:
+    '''
+    graph - edges of the mesh -> EdgeGraph
+
+    start_vert_idx - Starting Vertex Id -> int
+
+    end_vert_idx - Ending Vertex Id -> int
+
+    guided - (optional) order the search by the distance plus the
+    straight line distance to the target (A*), the path found is the
+    same but fewer vertices are visited
+
+    returns - (K,) vertex indices from start to end,
+    None if the end can't be reached
+    '''
+
+    dists = np.full(graph.vert_count, np.inf)
+    preds = np.full(graph.vert_count, -1, dtype=np.int64)
+    settled = np.zeros(graph.vert_count, dtype=bool)
+
+    target = graph.verts[end_vert_idx]
+
+    dists[start_vert_idx] = 0
+    heap = [(0., start_vert_idx)]
+
+    while heap:
+
+        _, v = heappop(heap)
+
+        # Skip entries left behind by decreased distances
+        if settled[v]:
+            continue
+
+        settled[v] = True
+
+        if v == end_vert_idx:
+            break
+
+        neighbors, lengths = graph.get_edges(v)
+        new_dists = dists[v] + lengths
+
+        better = new_dists < dists[neighbors]
+        if not better.any():
+            continue
+
+        neighbors, new_dists = neighbors[better], new_dists[better]
+        dists[neighbors] = new_dists
+        preds[neighbors] = v
+
+        keys = new_dists
+        if guided:
+            keys = keys + np.linalg.norm(graph.verts[neighbors] - target,
+                                         axis=1)
+
+        for key, n in zip(keys.tolist(), neighbors.tolist()):
+            heappush(heap, (key, n))
+
+    if not settled[end_vert_idx]:
+        return None
+
+    path = [end_vert_idx]
+    while path[-1] != start_vert_idx:
+        path.append(int(preds[path[-1]]))
+
+    return np.array(path[::-1], dtype=np.int64)
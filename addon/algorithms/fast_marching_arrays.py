@@ -0,0 +1,372 @@
+'''
+Created on October 18, 2026
+
+@author: Albert Rodriguez (@UncleFirefox)
+
+Array backed fast marching engine used by geodesic_fast_marching
+
+Vertex coordinates are extracted once into an (N,3) array and the
+vertex -> triangle adjacency is kept in CSR form, the marching state
+lives in flat arrays indexed by vertex index instead of dictionaries
+and sets keyed by BMesh elements.
+
+Local edits of the mesh are patched in without building the arrays
+again, the vertices they touch get their triangles from a dictionary.
+
+'''
+
+from enum import Enum
+from heapq import heappop, heappush
+from math import sqrt
+import numpy as np
+from .mesh_arrays import grow
+
+# Marching state of every vertex, indexed by vertex index
+FAR = 0
+CLOSE = 1
+FIXED = 2
+
+
+class MarchingMesh(object):
+
+    def __init__(self, verts, tris):
+
+        self.vert_buffer = np.asarray(
+            verts, dtype=np.float64).reshape(-1, 3)
+        self.tri_buffer = np.asarray(tris, dtype=np.int64).reshape(-1, 3)
+        self.verts = self.vert_buffer
+        self.tris = self.tri_buffer
+
+        # Vertex -> triangle adjacency in CSR form
+        corners = self.tris.ravel()
+        counts = np.bincount(corners, minlength=len(self.verts))
+        self.vert_tri_offsets = np.concatenate(([0], np.cumsum(counts)))
+        self.vert_tris = np.argsort(corners, kind='stable') // 3
+
+        # Triangles of the vertices touched by patches
+        self.patched_vert_tris = dict()
+
+    @property
+    def vert_count(self) -> int:
+        return len(self.verts)
+
+    def get_vert_tris(self, v: int) -> np.ndarray:
+        tris = self.patched_vert_tris.get(v)
+        if tris is not None:
+            return tris
+
+        start, end = self.vert_tri_offsets[v], self.vert_tri_offsets[v+1]
+        return self.vert_tris[start:end]
+
+    def patch(self, verts, removed_tris, added_tris):
+        '''
+        Applies local edits of the mesh, removed triangles are left
+        in the arrays but no vertex refers to them anymore
+
+        verts - (K,3) coordinates of the new vertices,
+        numbered after the existing ones
+
+        removed_tris, added_tris - (R,3) and (A,3) triangles
+        '''
+        verts = np.asarray(verts, dtype=np.float64).reshape(-1, 3)
+        added_tris = np.asarray(added_tris, dtype=np.int64).reshape(-1, 3)
+
+        self.vert_buffer, self.verts = append_rows(
+            self.vert_buffer, self.vert_count, verts)
+
+        tri_count = len(self.tris)
+        self.tri_buffer, self.tris = append_rows(
+            self.tri_buffer, tri_count, added_tris)
+
+        vert_tris = dict()
+
+        def get_tris(v):
+            if v not in vert_tris:
+                # New vertices have no entry in the CSR arrays
+                known = v in self.patched_vert_tris or \
+                    v < len(self.vert_tri_offsets) - 1
+                vert_tris[v] = list(self.get_vert_tris(v)) if known else []
+            return vert_tris[v]
+
+        for tri in np.asarray(removed_tris).reshape(-1, 3).tolist():
+            corners = set(tri)
+            slot = next(f for f in get_tris(tri[0])
+                        if set(self.tris[f].tolist()) == corners)
+            for v in tri:
+                get_tris(v).remove(slot)
+
+        for slot, tri in enumerate(added_tris.tolist(), tri_count):
+            for v in tri:
+                get_tris(v).append(slot)
+
+        for v, tris in vert_tris.items():
+            self.patched_vert_tris[v] = np.array(tris, dtype=np.int64)
+
+    def get_vert_neighbors(self, v: int) -> np.ndarray:
+        neighbors = self.tris[self.get_vert_tris(v)].ravel()
+        return np.unique(neighbors[neighbors != v])
+
+
+class Marching_Mode(Enum):
+    # A single front from the start until the end is fixed
+    FORWARD = 0,
+    # Fronts from both ends until they meet
+    BIDIRECTIONAL = 1
+
+
+class Front(object):
+    '''
+    March from a vertex that can be carried on later, vertices are
+    always fixed in order of distance so the values of the fixed ones
+    are the same the whole march would give
+    '''
+    def __init__(self, mesh: MarchingMesh, start_vert_idx: int):
+
+        self.mesh = mesh
+        self.source = start_vert_idx
+
+        self.geos = np.full(mesh.vert_count, np.inf)
+        self.state = np.zeros(mesh.vert_count, dtype=np.uint8)
+
+        # Close vertices ordered by their T value, when a T value
+        # decreases a new entry is pushed and the old one becomes stale
+        self.close_heap = []
+
+        co = mesh.verts
+
+        self.geos[start_vert_idx] = 0
+        self.state[start_vert_idx] = FIXED
+
+        for nv in mesh.get_vert_neighbors(start_vert_idx):
+            self.geos[nv] = sqrt(((co[nv] - co[start_vert_idx])**2).sum())
+            self.state[nv] = CLOSE
+            heappush(self.close_heap, (self.geos[nv], nv))
+
+    def peek(self) -> float:
+        '''
+        returns - value of the next vertex to fix, inf if there's none
+        '''
+        heap = self.close_heap
+
+        # Drop the stale entries left behind by updated T values
+        while heap and self.state[heap[0][1]] != CLOSE:
+            heappop(heap)
+
+        return heap[0][0] if heap else np.inf
+
+    def step(self) -> int:
+        '''
+        Fixes the close vertex with the smallest T value
+
+        returns - the vertex, -1 when the front can't go further
+        '''
+        if self.peek() == np.inf:
+            return -1
+
+        T, trial_v = heappop(self.close_heap)
+        self.state[trial_v] = FIXED
+
+        update_close(self.mesh, trial_v, self.geos, self.state,
+                     self.close_heap)
+
+        return trial_v
+
+    def advance(self, targets: "set[int]" = None, max_iters: int = None):
+        '''
+        Marches until all the targets are fixed, all the vertices it can
+        reach without targets
+
+        max_iters - (optional) limits number of marching steps, no limit
+        by default. Reaching it before the targets are fixed raises
+        ValueError, the distances would silently be left out otherwise
+        '''
+        pending = None
+        if targets is not None:
+            pending = {v for v in targets if self.state[v] != FIXED}
+
+        iters = 0
+
+        while pending is None or pending:
+
+            if max_iters is not None and iters >= max_iters:
+                if self.peek() == np.inf:
+                    break
+                raise ValueError(
+                    "Marching stopped after {} steps before reaching "
+                    "its targets".format(max_iters))
+
+            trial_v = self.step()
+            if trial_v < 0:
+                break
+
+            if pending is not None:
+                pending.discard(trial_v)
+
+            iters += 1
+
+
+def march(mesh: MarchingMesh,
+          start_vert_idx: int,
+          targets: "set[int]" = None,
+          max_iters: int = None):
+    '''
+    mesh - arrays of the mesh -> MarchingMesh
+
+    start_vert_idx - Starting Vertex Id -> int
+
+    targets - (optional) stop once all these vertices are fixed.
+    The front is always accepted in order of distance, the values of
+    the fixed vertices are the same the whole march would give
+
+    max_iters - (optional) limits number of marching steps,
+    see Front.advance
+
+    returns - distances (N,) float64 array, inf where not reached
+    and states (N,) uint8 array of FAR, CLOSE or FIXED values
+    '''
+    front = Front(mesh, start_vert_idx)
+    front.advance(targets, max_iters)
+
+    return front.geos, front.state
+
+
+def march_bidirectional(mesh: MarchingMesh,
+                        start_vert_idx: int,
+                        end_vert_idx: int,
+                        max_iters: int = None):
+    '''
+    Marches from both ends, always advancing the front with the smallest
+    value, until no vertex left can join them for less than the best
+    one found. A short query covers two discs of half its length
+    instead of a disc of its whole length.
+
+    Each front fixes its vertices in order of distance, their values are
+    the ones their whole march would give. The meeting vertex is the one
+    fixed by a front with the lowest sum of both values, the value of
+    the other front may still be the tentative one of a close vertex
+
+    max_iters - (optional) limits number of marching steps of both
+    fronts, raises ValueError when reached before they meet
+
+    returns - meeting vertex, -1 if the ends are not connected,
+    and the fronts from the start and from the end
+    '''
+    fronts = (Front(mesh, start_vert_idx), Front(mesh, end_vert_idx))
+
+    if start_vert_idx == end_vert_idx:
+        return start_vert_idx, fronts
+
+    best, meeting = np.inf, -1
+    iters = 0
+
+    while True:
+        values = (fronts[0].peek(), fronts[1].peek())
+
+        # Vertices fixed from now on are farther than values from
+        # their front and the other one
+        if values[0] + values[1] >= best:
+            break
+
+        if max_iters is not None and iters >= max_iters:
+            raise ValueError(
+                "Marching stopped after {} steps before the fronts "
+                "met".format(max_iters))
+
+        i = 0 if values[0] <= values[1] else 1
+        front, other = fronts[i], fronts[1 - i]
+
+        v = front.step()
+        iters += 1
+
+        total = front.geos[v] + other.geos[v]
+        if total < best:
+            best, meeting = total, v
+
+    return meeting, fronts
+
+
+def update_close(mesh: MarchingMesh, trial_v: int,
+                 geos: np.ndarray, state: np.ndarray, close_heap: list):
+    '''
+    Compute the distance values for all vertices from Close (UNION)
+    Unprocessed which are incident to triangles containing Trial
+    and another vertex in fixed
+
+    Only a handful of triangles are updated per accepted vertex, scalar
+    math is a lot faster than setting up NumPy calls for them
+    '''
+    co = mesh.verts
+
+    for f in mesh.get_vert_tris(trial_v).tolist():
+        others = [v for v in mesh.tris[f].tolist() if v != trial_v]
+        fvs = [v for v in others if state[v] == FIXED]
+
+        # all link faces have Trial as one vert. need exactly 1 fixed
+        if len(fvs) != 1:
+            continue
+
+        fv = fvs[0]
+        cv = others[0] if others[1] == fv else others[1]
+
+        T = calc_T(co[fv], co[trial_v], co[cv], geos[fv], geos[trial_v])
+
+        # Either a new Close vertex or a decreased key,
+        # any previous entry of the vertex becomes stale
+        if T < geos[cv] or state[cv] == FAR:
+            geos[cv] = min(geos[cv], T)
+            state[cv] = CLOSE
+            heappush(close_heap, (geos[cv], cv))
+
+
+def calc_T(p1, p2, p3, Tv1: float, Tv2: float) -> float:
+    '''
+    Distance at p3 given the distances Tv1, Tv2 at p1, p2
+
+    Calculates the 2 origins which are the 2 intersections of 2 circles
+    centered on p1 and p2 with radii Tv1, Tv2 respectively and returns
+    the distance to the furthest one
+    http://mathworld.wolfram.com/Circle-CircleIntersection.html
+    '''
+
+    # transform points into the reference frame of p1 with p2 on x axis,
+    # the triangle lies on the xy plane so p3 is (x3, y3)
+    ux, uy, uz = p2[0] - p1[0], p2[1] - p1[1], p2[2] - p1[2]
+    cx, cy, cz = p3[0] - p1[0], p3[1] - p1[1], p3[2] - p1[2]
+
+    v2x_sq = ux*ux + uy*uy + uz*uz
+    v2x = sqrt(v2x_sq)
+
+    # Collapsed edges fall back to walking from p1
+    if v2x == 0:
+        return Tv1 + sqrt(cx*cx + cy*cy + cz*cz)
+
+    x3 = (ux*cx + uy*cy + uz*cz) / v2x
+    y3 = sqrt(max(cx*cx + cy*cy + cz*cz - x3*x3, 0))
+
+    # solution to the intersection of the 2 circles
+    A = 2 * Tv1**2 * v2x_sq - v2x_sq**2 + 2 * Tv2**2 * v2x_sq
+    B = (Tv1**2 - Tv2**2)**2
+
+    x = 1/2 * (v2x_sq + Tv1**2 - Tv2**2)/v2x
+    # circles not intersecting, the origin is taken on the x axis
+    y = 1/2 * sqrt(A-B)/v2x if A > B else 0
+
+    # the origin in the opposite side of p3 is the furthest one
+    return sqrt((x3 - x)**2 + (y3 + y)**2)
+
+
+def append_rows(buffer: np.ndarray, count: int, rows: np.ndarray):
+    '''
+    Writes rows after the first count ones of buffer, growing it if
+    they don't fit
+
+    returns - the buffer and a view of its count + len(rows) first rows
+    '''
+    size = count + len(rows)
+
+    if size > len(buffer):
+        buffer = grow(buffer, size)
+
+    buffer[count:size] = rows
+
+    return buffer, buffer[:size]
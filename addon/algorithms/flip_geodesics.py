@@ -0,0 +1,361 @@
+'''
+Created on October 18, 2026
+
+@author: Albert Rodriguez (@UncleFirefox)
+
+based on work by Nicholas Sharp and Keenan Crane
+https://nmwsharp.com/media/papers/flip-geodesics/flip_geodesics.pdf
+
+FlipOut solver of geodesic_edge_flipping_poc, edges are flipped in an
+intrinsic triangulation of the mesh until the path is straight and the
+result is traced back over the input mesh. It only works on the arrays
+of the mesh so it doesn't depend on Blender.
+
+'''
+
+from enum import Enum
+from heapq import heappop, heappush
+from math import inf, pi
+from typing import Tuple
+
+import numpy as np
+from .edge_graph import EdgeGraph, shortest_path
+from .intrinsic_triangulation import IntrinsicTriangulation, \
+    IntrinsicOverlay, edge
+
+EPS_ANGLE: float = 1e-5
+
+
+class Angle_Type(Enum):
+    SHORTEST = 0,
+    LEFT_TURN = 1,
+    RIGHT_TURN = 2
+
+
+class FlipOutSolver(object):
+    '''
+    Triangulation and edge graph of the input mesh, built once and only
+    read by the queries. Every query flips edges in its own overlay
+    '''
+    def __init__(self, verts, tris):
+        self.triangulation = IntrinsicTriangulation(verts, tris)
+        self.graph = EdgeGraph(verts, tris)
+
+    def patch(self, verts, removed_tris, added_tris):
+        self.triangulation.patch(verts, removed_tris, added_tris)
+        self.graph.patch(verts, removed_tris, added_tris)
+
+    def find_geodesic_path(self, start_vert_idx: int, end_vert_idx: int,
+                           max_iters: int = None) -> np.ndarray:
+
+        tri = IntrinsicOverlay(self.triangulation)
+
+        # Part 1: Perform a path as a reference
+        vert_path = shortest_path(self.graph, start_vert_idx, end_vert_idx)
+
+        if vert_path is None:
+            vert_path = [start_vert_idx]
+
+        path = [tri.get_half_edge(a, b)
+                for a, b in zip(vert_path[:-1], vert_path[1:])]
+
+        short_path: "list[int]" = iterative_shorten(tri, path, max_iters)
+
+        return trace_path(tri, self.triangulation, short_path,
+                          start_vert_idx)
+
+
+def trace_path(tri: IntrinsicTriangulation,
+               input_tri: IntrinsicTriangulation,
+               path: "list[int]",
+               start_vert_idx: int) -> np.ndarray:
+    '''
+    returns - (K,3) points of the path over the input mesh
+    '''
+    points = [input_tri.verts[start_vert_idx]]
+
+    for h in path:
+        points.extend(tri.trace_half_edge(h, input_tri)[1:])
+
+    return np.array(points)
+
+
+def iterative_shorten(tri: IntrinsicTriangulation,
+                      path: "list[int]",
+                      maxIterations: int = None) -> "list[int]":
+
+    iterations = 0
+
+    path_list = PathList(path)
+
+    # Edges of the path can't be flipped, count how many
+    # times the path goes through each of them
+    fixed: "dict[int, int]" = dict()
+    for h in path:
+        fixed[edge(h)] = fixed.get(edge(h), 0) + 1
+
+    # Wedges ordered by their angle, every entry keeps the stamp its
+    # node had when it was pushed. Shortening a wedge bumps the stamp
+    # of the nodes it touches so their old entries become stale and
+    # are skipped when popped instead of being searched and removed
+    wedges: "list[tuple[float, int, int]]" = []
+    for node in path_list.nodes():
+        push_wedge(wedges, tri, path_list, node)
+
+    while wedges and (maxIterations is None or
+                      iterations < maxIterations):
+
+        min_angle, node, stamp = heappop(wedges)
+
+        # Check if its a stale entry
+        if not path_list.is_current(node, stamp):
+            continue
+
+        # The smallest wedge is straight, the path is a geodesic
+        if min_angle >= pi - EPS_ANGLE:
+            break
+
+        path_segment = path_list.get_wedge(node)
+
+        curr_angle, angle_type = get_minwedge_angle(tri, path_segment)
+
+        shortened_path = locally_shorten_at(tri, path_segment, angle_type,
+                                            fixed)
+
+        iterations += 1
+
+        if shortened_path is None:
+            continue
+
+        for h in path_segment:
+            fixed[edge(h)] -= 1
+        for h in shortened_path:
+            fixed[edge(h)] = fixed.get(edge(h), 0) + 1
+
+        # Replace the path segment with the new path and re-evaluate
+        # only the wedges around the new edges
+        before, after = path_list.replace(node, shortened_path)
+
+        node = before if before is not None else path_list.head
+
+        while node is not None and node != after:
+            push_wedge(wedges, tri, path_list, node)
+            node = path_list.next[node]
+
+    return path_list.half_edges()
+
+
+def push_wedge(wedges: list, tri: IntrinsicTriangulation,
+               path_list: "PathList", node: int):
+    '''
+    Pushes the wedge between the edge of the node and the next one
+    '''
+    if node is None or path_list.next[node] is None:
+        return
+
+    angle = get_minwedge_angle(tri, path_list.get_wedge(node))[0]
+
+    heappush(wedges, (angle, node, path_list.stamp[node]))
+
+
+class PathList(object):
+    '''
+    Half-edge path stored as a doubly linked list over node indices,
+    so a wedge can be replaced in place without searching the path.
+    Removed nodes are never reused, their stamp tells heap entries
+    pointing to them or to a modified wedge are out of date
+    '''
+    def __init__(self, path: "list[int]"):
+        self.edge: "list[int]" = []
+        self.prev: "list[int]" = []
+        self.next: "list[int]" = []
+        self.stamp: "list[int]" = []
+        self.alive: "list[bool]" = []
+        self.head = None
+
+        last = None
+        for h in path:
+            last = self.new_node(h, last)
+
+    def new_node(self, h: int, prev: int) -> int:
+
+        node = len(self.edge)
+
+        self.edge.append(h)
+        self.prev.append(prev)
+        self.next.append(None)
+        self.stamp.append(0)
+        self.alive.append(True)
+
+        if prev is None:
+            self.head = node
+        else:
+            self.next[prev] = node
+
+        return node
+
+    def nodes(self):
+        node = self.head
+        while node is not None:
+            yield node
+            node = self.next[node]
+
+    def half_edges(self) -> "list[int]":
+        return [self.edge[node] for node in self.nodes()]
+
+    def get_wedge(self, node: int) -> Tuple[int, int]:
+        return (self.edge[node], self.edge[self.next[node]])
+
+    def is_current(self, node: int, stamp: int) -> bool:
+        return (self.alive[node] and self.next[node] is not None
+                and self.stamp[node] == stamp)
+
+    def replace(self, node: int, new_edges: "list[int]"):
+        '''
+        Replaces the wedge starting at node with the given edges
+
+        returns - nodes right before and after the new edges
+        '''
+        second = self.next[node]
+        before, after = self.prev[node], self.next[second]
+
+        for old in (node, second):
+            self.alive[old] = False
+
+        # The wedge ending on the replaced edges changes too
+        if before is not None:
+            self.stamp[before] += 1
+
+        tail = before
+
+        for h in new_edges:
+            tail = self.new_node(h, tail)
+
+        if tail is None:
+            self.head = after
+        else:
+            self.next[tail] = after
+
+        if after is not None:
+            self.prev[after] = tail
+
+        return before, after
+
+
+def get_minwedge_angle(tri: IntrinsicTriangulation,
+                       path_segment: Tuple[int, int]) \
+                       -> Tuple[float, Angle_Type]:
+
+    h_in, h_out = path_segment
+
+    pivot_vert = tri.tail(h_out)
+    back_angle = tri.angle(h_in ^ 1)
+    out_angle = tri.angle(h_out)
+
+    # Counter clockwise from the incoming edge the wedge
+    # lies on the right side of the path
+    if tri.is_boundary_vert(pivot_vert):
+        # The side going through the boundary can't be shortened
+        if out_angle >= back_angle:
+            right, left = out_angle - back_angle, inf
+        else:
+            right, left = inf, back_angle - out_angle
+    else:
+        right = (out_angle - back_angle) % tri.angle_sum(pivot_vert)
+        left = tri.angle_sum(pivot_vert) - right
+
+    angle, angle_type = (left, Angle_Type.LEFT_TURN) if left < right \
+        else (right, Angle_Type.RIGHT_TURN)
+
+    if angle >= pi - EPS_ANGLE:
+        return (angle, Angle_Type.SHORTEST)
+
+    return (angle, angle_type)
+
+
+def locally_shorten_at(tri: IntrinsicTriangulation,
+                       path_segment: Tuple[int, int],
+                       angle_type: Angle_Type,
+                       fixed: "dict[int, int]") \
+                       -> "list[int]":
+
+    if angle_type == Angle_Type.SHORTEST:
+        return None
+
+    h_in, h_out = path_segment
+
+    # Compute the initial path length
+    init_path_length = tri.length(h_in) + tri.length(h_out)
+
+    # The straightening logic below always walks CCW,
+    # so flip the ordering if this is a left turn
+    s_prev: int
+    s_next: int
+    is_reversed: bool = False
+    if angle_type == Angle_Type.RIGHT_TURN:
+        s_prev = h_in ^ 1
+        s_next = h_out
+    else:
+        s_prev = h_out
+        s_next = h_in ^ 1
+        is_reversed = True
+
+    # == Main logic: flip until a shorter path exists
+    any_flipped = True
+    while any_flipped:
+
+        any_flipped = False
+
+        h = tri.ccw(s_prev)
+
+        while h >= 0 and h != s_next:
+
+            next_h = tri.ccw(h)
+
+            if is_edge_flippable(tri, h, fixed) and \
+                    tri.flip_edge(edge(h)):
+                any_flipped = True
+
+            h = next_h
+
+    # Build the list of edges representing the new path
+    # walking along the boundary of the wedge
+    new_path: "list[int]" = []
+
+    h = s_prev
+    while h >= 0 and h != s_next:
+        new_path.append(tri.next(h))
+        h = tri.ccw(h)
+
+    new_path_length = sum(tri.length(h) for h in new_path)
+
+    # Make sure the new path is actually shorter
+    # (this would never happen in the Reals,
+    # but can rarely happen if an edge is numerically
+    # unflippable for floating point reasons)
+    if h < 0 or new_path_length > init_path_length:
+        return None
+
+    # Make sure the new path orientation matches
+    # the orientation of the input edges
+    if is_reversed:
+        new_path = [h ^ 1 for h in reversed(new_path)]
+
+    return new_path
+
+
+def is_edge_flippable(tri: IntrinsicTriangulation, h: int,
+                      fixed: "dict[int, int]") -> bool:
+    '''
+    h - half-edge leaving the pivot vertex inside the wedge
+    '''
+
+    if fixed.get(edge(h), 0) > 0:
+        return False
+
+    # Check Bi < pi, the angle at the other end of the edge
+    # between its neighbors along the wedge, otherwise the
+    # path is straightened enough and there's nothing to do
+    beta = tri.corner_angle(tri.next(h)) + tri.corner_angle(h ^ 1)
+
+    return beta < pi
@@ -0,0 +1,126 @@
+'''
+Created on October 18, 2026
+
+@author: Albert Rodriguez (@UncleFirefox)
+
+Registry of the geodesic path backends, every module listed here exposes
+
+create_cache(geometry) - SolverCache building its solver
+
+geodesic_walk(bm, start, end, m, max_iters, cache, mesh_version) - list
+of Vector points of the path between the two vertices, m is ignored and
+only kept so max_iters stays the fifth argument
+
+and optionally
+
+geodesic_walks(bm, start, ends, max_iters, cache, mesh_version) - paths
+from one vertex to several others, cheaper than a walk for each of them
+
+PATCHABLE - False when the solver can't follow the points placed on the
+mesh. It is built again from the whole mesh for the first query
+involving a new vertex, that is for every click and for every mouse move
+of a dragged point. Drags with such backends are always previewed with
+PREVIEW_BACKEND and the geodesic is only computed on release.
+
+Every placed point subdivides the mesh:
+- Edge Path, Fast Marching and Edge Flipping (Python) patch their
+solvers with the new vertex and triangles
+- Heat Method keeps its factorization and places the new vertices in
+the triangles they split
+- Edge Flipping is rebuilt (PATCHABLE = False)
+
+'''
+
+from importlib import import_module
+
+# identifier, name, description, module
+BACKENDS = [
+    ('EDGE_FLIPPING', 'Edge Flipping',
+     'Exact geodesics by flipping edges of an intrinsic triangulation, '
+     'built again for every placed point',
+     'geodesic_edge_flipping'),
+    ('EDGE_FLIPPING_PYTHON', 'Edge Flipping (Python)',
+     'Exact geodesics without compiled dependencies, slower',
+     'geodesic_edge_flipping_poc'),
+    ('HEAT_METHOD', 'Heat Method',
+     'Fast approximate geodesics, the solver is prefactored once per mesh',
+     'geodesic_heat_method'),
+    ('FAST_MARCHING', 'Fast Marching',
+     'Approximate geodesics marching a front from the start point',
+     'geodesic_fast_marching'),
+    ('EDGE_PATH', 'Edge Path',
+     'Shortest path along the mesh edges, fastest but not a geodesic',
+     'geodesic_edge_path'),
+]
+
+DEFAULT_BACKEND = 'EDGE_FLIPPING'
+
+# Backend of the rough paths shown while dragging points
+PREVIEW_BACKEND = 'EDGE_PATH'
+
+
+# Items handed to Blender, it doesn't keep its own reference to them
+backend_items = []
+
+
+def is_available(module: str) -> bool:
+    '''
+    Whether the module of a backend and its dependencies can be imported
+    '''
+    try:
+        import_module('.' + module, __package__)
+    except ImportError:
+        return False
+
+    return True
+
+
+def is_patchable(backend) -> bool:
+    '''
+    Whether the solver of a backend module follows the points placed
+    on the mesh instead of being built again
+    '''
+    return getattr(backend, 'PATCHABLE', True)
+
+
+def get_backend_items(self=None, context=None):
+    '''
+    Items for an EnumProperty selecting the backend, only the ones that
+    can be imported. They are numbered by their position in BACKENDS so
+    the selection stays the same when the dependencies are installed
+    '''
+    global backend_items
+
+    backend_items = [(identifier, name, description, number)
+                     for number, (identifier, name, description, module)
+                     in enumerate(BACKENDS) if is_available(module)]
+
+    return backend_items
+
+
+def get_default_backend() -> str:
+    '''
+    DEFAULT_BACKEND if it can be imported, the first one that can otherwise
+    '''
+    available = [backend[0] for backend in BACKENDS
+                 if is_available(backend[3])]
+
+    if DEFAULT_BACKEND in available or not available:
+        return DEFAULT_BACKEND
+
+    return available[0]
+
+
+def get_backend(identifier: str = None):
+    '''
+    Module of the backend with the given identifier,
+    the default one when it's empty
+    '''
+    if not identifier:
+        identifier = get_default_backend()
+
+    for backend in BACKENDS:
+        if backend[0] == identifier:
+            return import_module('.' + backend[3], __package__)
+
+    raise ValueError("Unknown geodesic backend {}".format(identifier))
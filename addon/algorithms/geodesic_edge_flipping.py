@@ -12,31 +12,56 @@ https://github.com/nmwsharp/flip-geodesics-demo
 
 This version uses the Python bindings exposed by the same authors
 
+The compiled solver can't take local edits of the mesh, it keeps
+answering queries between the vertices it was built with and it is
+built again from the whole mesh the first time a query involves a new
+vertex. Dragging a point places a new vertex on every move, the drag is
+previewed along the edges even if the preview is turned off.
+
 '''
 
 from bmesh.types import BMesh
 from bpy.types import Mesh
 from mathutils import Vector
+from .bmesh_geometry import BMeshGeometry
+from .geometry_provider import GeometryProvider
+from .solver_cache import SolverCache
 import potpourri3d as pp3d
-import numpy as np
 # import time
 
+# Rebuilt for every new vertex, drags are previewed (see geodesic_backends)
+PATCHABLE = False
+
+
+def create_cache(geometry: GeometryProvider) -> SolverCache:
+    return SolverCache(pp3d.EdgeFlipGeodesicSolver, geometry)
+
 
 def geodesic_walk(bm: BMesh,
                   start_vert_idx: int,
                   end_vert_idx: int,
                   m: Mesh = None,
-                  max_iters: int = 100000):
+                  max_iters: int = None,
+                  cache: SolverCache = None,
+                  mesh_version: int = None):
     '''
-    bm - BMesh of the object
+    bm - BMesh of the object, only read when the cache has no geometry
 
     start_vert_idx - Starting Vertex Id -> int
 
     end_vert_idx - Ending Vertex Id -> int
 
-    m - (optional) selected mesh in the scene -> Mesh
+    m - (deprecated) ignored, kept for the callers passing max_iters
+    after it
 
-    max_iters - (optional) limits number of marching steps
+    max_iters - (optional) unused, the compiled solver runs until
+    the path is a geodesic
+
+    cache - (optional) solver cache to reuse between calls -> SolverCache
+    when its geometry is patched the vertex ids are slots in its arrays
+
+    mesh_version - (optional) version of the mesh the cache is keyed by,
+    by default the one of the geometry of the cache
 
     '''
 
@@ -45,18 +70,15 @@ def geodesic_walk(bm: BMesh,
 
     # total_start = time.time()
 
-    # Fast allocation of data structures
-    # https://developer.blender.org/rBae9d61e7fea25535803e92298f44b184c9190f76
-    V = np.zeros((len(m.vertices), 3), dtype=np.float)
-    m.vertices.foreach_get("co", V.ravel())
-
-    F = np.zeros((len(m.polygons), 3), dtype=np.int)
-    m.polygons.foreach_get("vertices", F.ravel())
+    if cache is None:
+        cache = create_cache(BMeshGeometry(bm))
 
-    path_solver = pp3d.EdgeFlipGeodesicSolver(V, F)
+    path_solver = cache.get_solver(
+        mesh_version, (start_vert_idx, end_vert_idx))
 
-    path_ptsA = path_solver.find_geodesic_path(v_start=start_vert_idx,
-                                               v_end=end_vert_idx)
+    path_ptsA = path_solver.find_geodesic_path(
+        v_start=cache.solver_index(start_vert_idx),
+        v_end=cache.solver_index(end_vert_idx))
 
     result: "list[Vector]" = list(
         map(lambda x: Vector((x[0], x[1], x[2])), path_ptsA)
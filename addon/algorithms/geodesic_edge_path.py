@@ -0,0 +1,79 @@
+'''
+Created on October 18, 2026
+
+@author: Albert Rodriguez (@UncleFirefox)
+
+Shortest path walking along the edges of the mesh. It is not a geodesic,
+it zigzags over the surface and comes out longer, but it is the cheapest
+to compute and always follows the real edges of the mesh.
+
+'''
+
+from bmesh.types import BMesh
+from bpy.types import Mesh
+from mathutils import Vector
+from .bmesh_geometry import BMeshGeometry
+from .edge_graph import EdgeGraph, shortest_path
+from .geometry_provider import GeometryProvider
+from .solver_cache import SolverCache
+
+
+def create_cache(geometry: GeometryProvider) -> SolverCache:
+    return SolverCache(EdgePathSolver, geometry)
+
+
+def geodesic_walk(bm: BMesh,
+                  start_vert_idx: int,
+                  end_vert_idx: int,
+                  m: Mesh = None,
+                  max_iters: int = None,
+                  cache: SolverCache = None,
+                  mesh_version: int = None):
+    '''
+    bm - BMesh of the object, only read when the cache has no geometry
+
+    start_vert_idx - Starting Vertex Id -> int
+
+    end_vert_idx - Ending Vertex Id -> int
+
+    m - (deprecated) ignored, kept for the callers passing max_iters
+    after it
+
+    max_iters - (optional) unused, the search is bounded by the mesh
+
+    cache - (optional) solver cache to reuse between calls -> SolverCache
+    when its geometry is patched the vertex ids are slots in its arrays
+
+    mesh_version - (optional) version of the mesh the cache is keyed by,
+    by default the one of the geometry of the cache
+
+    '''
+
+    if cache is None:
+        cache = create_cache(BMeshGeometry(bm))
+
+    solver = cache.get_solver(
+        mesh_version, (start_vert_idx, end_vert_idx))
+
+    path = solver.find_geodesic_path(cache.solver_index(start_vert_idx),
+                                     cache.solver_index(end_vert_idx))
+
+    return [Vector(p) for p in path]
+
+
+class EdgePathSolver(object):
+
+    def __init__(self, verts, tris):
+        self.graph = EdgeGraph(verts, tris)
+
+    def patch(self, verts, removed_tris, added_tris):
+        self.graph.patch(verts, removed_tris, added_tris)
+
+    def find_geodesic_path(self, start_vert_idx: int, end_vert_idx: int):
+
+        path = shortest_path(self.graph, start_vert_idx, end_vert_idx)
+
+        if path is None:
+            return self.graph.verts[[start_vert_idx]]
+
+        return self.graph.verts[path]
@@ -10,365 +10,102 @@ Based on the original idea from Patrick Moore: https://github.com/patmo141/cut_m
 # import time
 
 # blender imports
-import bmesh
 from bmesh.types import BMesh
 from bpy.types import Mesh
-from mathutils import Vector, Quaternion, Matrix
-from mathutils.geometry import intersect_point_line, intersect_line_line
+from mathutils import Vector, Quaternion
+from .bmesh_geometry import BMeshGeometry
+from .distance_field import FastMarchingSolver
+from .fast_marching_arrays import Marching_Mode
+from .geometry_provider import GeometryProvider
+from .solver_cache import SolverCache
 # import time
 
 
+def create_cache(geometry: GeometryProvider) -> SolverCache:
+    return SolverCache(FastMarchingSolver, geometry)
+
+
 def geodesic_walk(bm: BMesh,
                   start_vert_idx: int,
                   end_vert_idx: int,
                   m: Mesh = None,
-                  max_iters: int = 100000):
+                  max_iters: int = None,
+                  cache: SolverCache = None,
+                  mesh_version: int = None,
+                  mode: Marching_Mode = Marching_Mode.FORWARD):
     '''
-    bm - BMesh of the object
+    bm - BMesh of the object, only read when the cache has no geometry
 
     start_vert_idx - Starting Vertex Id -> int
 
     end_vert_idx - Ending Vertex Id -> int
 
-    m - (optional) object representing the mesh in the scene -> Mesh
-
-    max_iters - (optional) limits number of marching steps
-
-    '''
-
-    # start = time.time()
-
-    # Copy the bmesh to do manipulations
-    # on the object without affecting the caller
-    # TODO: Clone only if necessary
-    # my_bm = bm.copy()
-
-    geos = dict()
-
-    fixed_verts = set()
-    close_verts = set()
-    stop_targets = set()
-
-    far = set(bm.verts)
-
-    # Threshold value for gradient descent
-    epsilon = .0000001
-
-    start_vert = bm.verts[start_vert_idx]
-    end_vert = bm.verts[end_vert_idx]
-
-    geos[start_vert] = 0
-
-    # Simulating face neighbors
-    neighbors = [(e.calc_length(), e.other_vert(start_vert))
-                 for e in start_vert.link_edges]
-
-    for (distance, neighbor) in neighbors:
-        geos[neighbor] = distance
-
-    fixed_verts.update([start_vert])
-    far.difference_update([start_vert])
-
-    for ed in start_vert.link_edges:
-
-        efs = [fc for fc in ed.link_faces if start_vert in fc.verts]
+    m - (deprecated) ignored, kept for the callers passing max_iters
+    after it
 
-        if not len(efs):
-            continue  # seed on border case
+    max_iters - (optional) limits number of marching steps, no limit
+    by default. Reaching it before the end is fixed raises ValueError
 
-        ef = efs[0]
+    cache - (optional) solver cache to reuse between calls -> SolverCache
+    when its geometry is patched the vertex ids are slots in its arrays
 
-        nv = ed.other_vert(start_vert)
+    mesh_version - (optional) version of the mesh the cache is keyed by,
+    by default the one of the geometry of the cache
 
-        close_verts.add(nv)
-        v1 = min(ed.verts, key=geos.get)
-        v2 = max(ed.verts, key=geos.get)
+    mode - (optional) FORWARD marches from the start until the end is
+    reached, BIDIRECTIONAL marches from both ends until they meet and
+    fixes about half the vertices on long paths -> Marching_Mode
 
-        T = calc_T(nv, v2, v1, ef, geos, ignore_obtuse=True)
+    '''
 
-        if nv in geos:
-            # perhaps min() is better but its supposed
-            # to be monotonicly increasing!
-            geos[nv] = max(geos[nv], T)
-        else:
-            geos[nv] = T
+    # start = time.time()
 
-    stop_targets.add(end_vert)
+    if cache is None:
+        cache = create_cache(BMeshGeometry(bm))
 
-    iters = 0
+    solver = cache.get_solver(
+        mesh_version, (start_vert_idx, end_vert_idx))
 
-    while (should_algorithm_continue(far, close_verts, iters, max_iters,
-                                     stop_targets)):
+    path = solver.find_geodesic_path(cache.solver_index(start_vert_idx),
+                                     cache.solver_index(end_vert_idx),
+                                     max_iters, mode)
 
-        begin_loop(close_verts, far, geos, fixed_verts, stop_targets)
-        iters += 1
+    # end = time.time()
 
-    path_elements, path = gradient_descent(geos, end_vert, epsilon)
+    # print(f"Total time taken: {end-start}")
 
-    # Resulting path from grading descent
-    # goes from end_vert to start_vert,
-    # were interested in the opposite
-    path.reverse()
+    return [Vector(p) for p in path]
 
-    # end = time.time()
 
-    # print(f"Total time taken: {end-start}")
+def geodesic_walks(bm: BMesh,
+                   start_vert_idx: int,
+                   end_vert_idxs: "list[int]",
+                   max_iters: int = None,
+                   cache: SolverCache = None,
+                   mesh_version: int = None):
+    '''
+    Paths from one vertex to several others, the front is marched once
+    until all of them are reached
 
-    return path
+    end_vert_idxs - Ending Vertex Ids -> list[int]
 
+    The rest of the parameters are the ones of geodesic_walk
 
-def calc_T(v3, v2, v1, f, geos, ignore_obtuse=False):
-    if not ignore_obtuse and v2 not in geos:
-        if not test_accute(v3.co, v1.co, v2.co):
-            print('new vert is obtuse and we made a virtual edge')
-            vco, v2, vcos = unwrap_tri_obtuse(v1, v3, f)
-        else:
-            print("V2 not in geos and triangle is not obtuse")
-
-    # potentially use custom bmesh layer instead of a dictionary
-    Tv1 = geos[v1]
-    Tv2 = geos[v2]
-
-    # calculate 2 origins which are the 2 intersections of 2 circles
-    # ceneterd on v1 and v2 with radii Tv1, Tv2 respectively
-    # http://mathworld.wolfram.com/Circle-CircleIntersection.html
-
-    # transform points into the reference frame of v1 with v2 on x axis
-    # http://math.stackexchange.com/questions/856666/how-can-i-transform-a-3d-triangle-to-xy-plane
-    u = v2.co - v1.co  # x - axis
-    v2x = u.length
-
-    U = u.normalized()
-
-    c = v3.co - v1.co
-    w = u.cross(c)  # z axis
-
-    W = w.normalized()
-    V = U.cross(W)  # y axis   x,y,z = u,v,w
-
-    # rotation matrix from principal axes
-    T = Matrix.Identity(3)  # make the columns of matrix U, V, W
-    T[0][0], T[0][1], T[0][2] = U[0], V[0], W[0]
-    T[1][0], T[1][1], T[1][2] = U[1], V[1], W[1]
-    T[2][0], T[2][1], T[2][2] = U[2], V[2], W[2]
-
-    v3p = T.transposed() @ c
-    # print('converted vector to coordinates on Vo so Z should be 0')
-    # print(v3p)
-    # solution to the intersection of the 2 circles
-    A = 2 * Tv1**2 * v2x**2 - v2x**4 + 2 * Tv2**2 * v2x**2
-    B = (Tv1**2 - Tv2**2)**2
-
-    x = 1/2 * (v2x**2 + Tv1**2 - Tv2**2)/(v2x)
-    y = 1/2 * ((A-B)**.5)/v2x
-
-    if isinstance(x, complex):
-        # print('x is complex')
-        # print(x)
-        x = 0
-    if isinstance(y, complex):
-        # print('y is complex, setting to 0')
-        # print(A-B)
-        # print(y)
-        y = 0
-
-    T3a = v3p - Vector((x, y, 0))
-    T3b = v3p - Vector((x, -y, 0))
-    T3 = max(T3a.length, T3b.length)
-
-    return T3
-
-
-def begin_loop(close, far, geos, fixed_verts, stop_targets):
-    # Let Trial be the vertex in close with the smallest T value
-    trial_v = min(close, key=geos.get)
-    fixed_verts.add(trial_v)  # add this vertex to Fixed
-    close.remove(trial_v)  # remove it from close
-
-    if trial_v in stop_targets:
-        stop_targets.remove(trial_v)
-
-    # Compute the distance values for all vertices from Close (UNION)
-    # Unprocessed which are incident to triangles containing Trial
-    # and another vertex in fixed
-
-    for f in trial_v.link_faces:
-        # all link faces have Trial as one vert.  need exactly 1 fixed_vert
-        fvs = [v for v in f.verts if v != trial_v and v in fixed_verts]
-        cvs = [v for v in f.verts if v != trial_v and v not in fixed_verts]
-        if len(fvs) == 1:
-
-            if len(cvs) != 1:
-                print('not one close vert in the triangle, what the heck')
-
-            cv = cvs[0]
-            fv = fvs[0]
-
-            if cv not in close:
-                close.add(cv)
-                if cv in far:
-                    far.remove(cv)
-
-            T = calc_T(cv, trial_v, fv, f, geos)
-            if cv in geos:
-                # print('close vert already calced before')
-                if T != geos[cv]:
-                    # print('and the distance value is changing! %f, %f' \
-                    #  % (geos[cv],T))
-                    geos[cv] = min(geos[cv], T)  # maybe min?
-            else:
-                geos[cv] = T
-
-
-def should_algorithm_continue(far, close, iters, max_iters,
-                              stop_targets):
-    return (len(far) and
-            len(close) and
-            ((max_iters and iters < max_iters) or max_iters is None) and
-            (len(stop_targets)))
-
-
-def gradient_descent(geos, start_vert, epsilon=.0000001):
-
-    def grad_v(v):
-        '''
-        walk down from a vert
-        '''
-        eds = [ed for ed in v.link_edges
-               if ed.other_vert(v) in geos
-               and geos[ed.other_vert(v)] <= geos[v]]
-
-        if len(eds) == 0:
-            # print('lowest vert or local minima')
-            return None, None, None
-
-        fs = set()
-
-        for ed in eds:
-            fs.update(ed.link_faces)
-
-        ffs = []
-        for f in fs:
-            if all([vert in geos for vert in f.verts]):
-                ffs.append(f)
-
-        # fs = set(filter(lambda x: all(vert in geos for vert in x.verts), fs))
-
-        minf = min(ffs,
-                   key=lambda x:
-                   sum([geos[vrt] for vrt in x.verts if vrt in geos]))
-
-        for ed in minf.edges:
-            if v not in ed.verts:
-                g = gradient_face(minf, geos)
-                L = minf.calc_perimeter()
-
-                v0, v1 = intersect_line_line(
-                    ed.verts[0].co, ed.verts[1].co, v.co, v.co-L*g)
-
-                V = v0 - ed.verts[0].co
-                edV = ed.verts[1].co - ed.verts[0].co
-
-                if V.length - edV.length > epsilon:
-                    continue
-                    # print('intersects outside segment')
-                elif V.dot(edV) < 0:
-                    # print('intersects behind')
-                    continue
-                else:
-                    # print('regular edge crossing')
-
-                    return v0, ed, minf
-
-        # we were not able to walk through a face
-        # print('must walk on edge')
-        vs = [ed.other_vert(v) for ed in eds]
-        minv = min(vs, key=geos.get)
-
-        if geos[minv] > geos[v]:
-            print('Found smallest geodesic already')
-            return None, None, None
-
-        return minv.co, minv, None
-
-    def grad_f_ed(ed, p, last_face):
-        # walk around non manifold edges
-        if len(ed.link_faces) == 1:
-            minv = min(ed.verts, key=geos.get)
-            return minv.co, minv, None
-
-        f = [fc for fc in ed.link_faces if fc != last_face][0]
-        g = gradient_face(f, geos)
-        L = f.calc_perimeter()
-
-        # test for vert intersection
-        for v in f.verts:
-            v_inter, pct = intersect_point_line(v.co, p, p-L*g)
-
-            delta = v.co - v_inter
-            if delta.length < epsilon:
-                # print('intersect vert')
-                return v.co, v, None
-
-        tests = [e for e in f.edges if e != ed]
-
-        for e in tests:
-            v0, v1 = intersect_line_line(
-                e.verts[0].co, e.verts[1].co, p, p-L*g)
-
-            V = v0 - e.verts[0].co
-            edV = e.verts[1].co - e.verts[0].co
-            Vi = v0 - p
-
-            if V.length - edV.length > epsilon:
-                # print('intersects outside segment')
-                continue
-            elif V.dot(edV) < 0:
-                # print('intersects behind')
-                continue
-            # remember we watnt to travel DOWN the gradient
-            elif Vi.dot(g) > 0:
-                # print('shoots out the face, not across the face')
-                continue
-            else:
-                # print('regular face edge crossing')
-                return v0, e, f
-
-        # we didn't intersect across an edge, or on a vert,
-        # therefore, we should travel ALONG the edge
-
-        vret = min(ed.verts, key=geos.get)
-        return vret.co, vret, None
-
-    iters = 0
-    path_elements = []
-    path_coords = []
-
-    new_ele = start_vert
-    new_coord = start_vert.co
-    last_face = None
-
-    while new_ele is not None and iters < 1000:
-        if new_ele not in path_elements:
-            path_elements += [new_ele]
-            path_coords += [new_coord]
-        else:
-            # print('uh oh we reversed')
-            # print('stopped walking at %i' % iters)
-            return path_elements, path_coords
+    returns - a list of Vector points per ending vertex
+    '''
 
-        if isinstance(path_elements[-1], bmesh.types.BMVert):
-            new_coord, new_ele, last_face = grad_v(path_elements[-1])
-        elif isinstance(path_elements[-1], bmesh.types.BMEdge):
-            new_coord, new_ele, last_face = grad_f_ed(
-                path_elements[-1], path_coords[-1], last_face)
+    if cache is None:
+        cache = create_cache(BMeshGeometry(bm))
 
-        # if new_coord is None:
-            # print('stopped walking at %i' % iters)
+    solver = cache.get_solver(
+        mesh_version, (start_vert_idx, *end_vert_idxs))
 
-        iters += 1
+    paths = solver.find_geodesic_paths(
+        cache.solver_index(start_vert_idx),
+        [cache.solver_index(idx) for idx in end_vert_idxs],
+        max_iters)
 
-    return path_elements, path_coords
+    return [[Vector(p) for p in path] for path in paths]
 
 
 def test_obtuse(f):
@@ -618,30 +355,6 @@ def unwrap_tri_obtuse(vcenter, vobtuse, face):
     return v_cos[i], verts[i], v_cos
 
 
-def gradient_face(f, geos):
-    # http://saturno.ge.imati.cnr.it/ima/personal-old/attene/PersonalPage/pdf/steepest-descent-paper.pdf
-    [vi, vj, vk] = f.verts
-
-    U = vj.co - vi.co
-    V = vk.co - vj.co
-    N = U.cross(V)
-    N.normalize()
-
-    T = Matrix.Identity(3)  # make the columns of matrix U, V, W
-    T[0][0], T[0][1], T[0][2] = U[0], U[1], U[2]
-    T[1][0], T[1][1], T[1][2] = V[0], V[1], V[2]
-    T[2][0], T[2][1], T[2][2] = N[0], N[1], N[2]
-
-    GeoV = Vector((geos[vj]-geos[vi],
-                   geos[vk]-geos[vj],
-                   0))
-
-    grad = T.inverted() @ GeoV
-    grad.normalize()
-
-    return grad
-
-
 def next_vert(ed, face):
     next_fs = [f for f in ed.link_faces if f != face]
 
@@ -0,0 +1,91 @@
+'''
+Created on October 18, 2026
+
+@author: Albert Rodriguez (@UncleFirefox)
+
+based on work by Keenan Crane, Clarisse Weischedel and Max Wardetzky
+https://www.cs.cmu.edu/~kmcrane/Projects/HeatMethod/
+
+This version uses the solver exposed by the potpourri3d Python bindings,
+the cotan Laplacian and the mass matrix are factored once per mesh and
+each distance query is then two sparse back-substitutions. The path is
+extracted walking down the gradient of the resulting distance field,
+the fields of the last sources are kept for the queries from or to them.
+
+The factorization can't take local edits of the mesh. It is kept for
+the vertices it was built with, the ones placed later are located in
+the triangle they split and take their distances from its corners (see
+SourceFieldSolver). Placing points doesn't factor the mesh again until
+the edits pile up past the threshold of the solver cache.
+
+'''
+
+from bmesh.types import BMesh
+from bpy.types import Mesh
+from mathutils import Vector
+from .bmesh_geometry import BMeshGeometry
+from .distance_field import SourceFieldSolver
+from .geometry_provider import GeometryProvider
+from .solver_cache import SolverCache
+import potpourri3d as pp3d
+# import time
+
+
+def create_cache(geometry: GeometryProvider) -> SolverCache:
+    return SolverCache(HeatMethodSolver, geometry)
+
+
+def geodesic_walk(bm: BMesh,
+                  start_vert_idx: int,
+                  end_vert_idx: int,
+                  m: Mesh = None,
+                  max_iters: int = None,
+                  cache: SolverCache = None,
+                  mesh_version: int = None):
+    '''
+    bm - BMesh of the object, only read when the cache has no geometry
+
+    start_vert_idx - Starting Vertex Id -> int
+
+    end_vert_idx - Ending Vertex Id -> int
+
+    m - (deprecated) ignored, kept for the callers passing max_iters
+    after it
+
+    max_iters - (optional) unused, the heat method computes the
+    distances of the whole mesh at once
+
+    cache - (optional) solver cache to reuse between calls -> SolverCache
+    when its geometry is patched the vertex ids are slots in its arrays
+
+    mesh_version - (optional) version of the mesh the cache is keyed by,
+    by default the one of the geometry of the cache
+
+    '''
+
+    # total_start = time.time()
+
+    if cache is None:
+        cache = create_cache(BMeshGeometry(bm))
+
+    solver = cache.get_solver(
+        mesh_version, (start_vert_idx, end_vert_idx))
+
+    path = solver.find_geodesic_path(cache.solver_index(start_vert_idx),
+                                     cache.solver_index(end_vert_idx),
+                                     max_iters)
+
+    # total_end = time.time()
+
+    # print(f"Total time taken: {total_end-total_start}")
+
+    return [Vector(p) for p in path]
+
+
+class HeatMethodSolver(SourceFieldSolver):
+
+    def __init__(self, verts, tris):
+        super().__init__(verts, tris, None)
+        self.solver = pp3d.MeshHeatMethodDistanceSolver(self.mesh.verts,
+                                                        self.mesh.tris)
+        self.compute_distance = self.solver.compute_distance
@@ -0,0 +1,82 @@
+'''
+Created on October 18, 2026
+
+@author: Albert Rodriguez (@UncleFirefox)
+
+Sources of the geometry the geodesic solvers are built from.
+
+A provider hands out the (N,3) vertex and (M,3) triangle arrays of a
+surface together with a version number that changes whenever they do,
+so the algorithms never have to know whether the surface lives in a
+BMesh (bmesh_geometry) or in arrays patched while it is being edited.
+
+'''
+
+from abc import ABC, abstractmethod
+import numpy as np
+from .mesh_arrays import MeshArrays
+
+
+class GeometryProvider(ABC):
+    '''
+    version - changes every time the arrays do, the owner of the
+    geometry calls touch() after editing it
+
+    patched - True when edits are local patches that don't move the
+    surface, solvers built for an older version can still answer
+    queries between the vertices they know. These providers also
+    tell which elements changed since a mark with read_edits()
+    '''
+    patched = False
+    version = 0
+
+    @abstractmethod
+    def read(self):
+        '''
+        returns - vertices (N,3), triangles (M,3) and an array mapping
+        every vertex id to its index in them, None when ids are indices
+        '''
+
+    def get_mark(self):
+        '''
+        returns - the current state for read_edits(), None when the
+        provider doesn't keep track of its edits
+        '''
+        return None
+
+    def read_edits(self, mark):
+        '''
+        returns - ids (K,) and coordinates (K,3) of the vertices added
+        since the mark, removed (R,3) and added (A,3) triangles as
+        vertex ids and ids of the removed vertices
+        '''
+        return None
+
+    def get_verts(self) -> np.ndarray:
+        return self.read()[0]
+
+    def get_tris(self) -> np.ndarray:
+        return self.read()[1]
+
+    def touch(self):
+        self.version += 1
+
+
+class MeshArraysGeometry(GeometryProvider):
+    '''
+    MeshArrays patched with every edit, vertex ids are slots
+    of the arrays
+    '''
+    patched = True
+
+    def __init__(self, arrays: MeshArrays):
+        self.arrays = arrays
+
+    def read(self):
+        return self.arrays.compact()
+
+    def get_mark(self):
+        return self.arrays.get_mark()
+
+    def read_edits(self, mark):
+        return self.arrays.get_edits(mark)
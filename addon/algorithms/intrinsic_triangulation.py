@@ -0,0 +1,718 @@
+'''
+Created on October 18, 2026
+
+@author: Albert Rodriguez (@UncleFirefox)
+
+Intrinsic triangulation of a mesh stored in flat half-edge arrays
+
+based on work by Nicholas Sharp, Yousuf Soliman and Keenan Crane
+https://nmwsharp.com/media/papers/int-tri-course/int_tri_course.pdf
+
+Edges are only described by their lengths. Flipping one lays out the two
+triangles around it in the plane and measures the other diagonal, so the
+surface stays the same while the connectivity changes. Every half-edge
+also keeps its signpost: the angle it leaves its tail vertex at, measured
+counter clockwise from a reference half-edge of the vertex, which is
+what allows tracing a flipped edge back over the input mesh.
+
+Half-edges come in pairs, the twin of half-edge h is h ^ 1 and its edge
+is h >> 1. Half-edges lying outside of a boundary have no face (-1).
+
+Local edits of the input mesh are patched in place. Removed faces leave
+their half-edges without a face, new ones reuse the edges they share with
+the mesh, and only the signposts of the vertices they touch are measured
+again.
+
+'''
+
+from math import acos, cos, sin, sqrt
+import numpy as np
+from .mesh_arrays import grow
+
+# Relative tolerance for a quad to be convex enough to flip its diagonal
+EPS_FLIP = 1e-9
+# Angles closer than this are the same direction
+EPS_ANGLE = 1e-9
+
+
+def twin(h: int) -> int:
+    return h ^ 1
+
+
+def edge(h: int) -> int:
+    return h >> 1
+
+
+class IntrinsicTriangulation(object):
+
+    def __init__(self, verts, tris):
+
+        verts = np.asarray(verts, dtype=np.float64).reshape(-1, 3)
+        tris = np.asarray(tris, dtype=np.int64).reshape(-1, 3)
+
+        self.vert_buffer = verts
+        self.verts = verts
+
+        tails = tris.ravel()
+        heads = tris[:, [1, 2, 0]].ravel()
+
+        # Pair the half-edges of every undirected edge, the one going
+        # from the lowest vertex index to the highest is the even one
+        keys = (np.minimum(tails, heads) * len(verts) +
+                np.maximum(tails, heads))
+        keys, edge_idx, counts = np.unique(keys, return_inverse=True,
+                                           return_counts=True)
+        he_idx = 2 * edge_idx.ravel() + (tails > heads)
+
+        if (counts > 2).any() or len(np.unique(he_idx)) != len(he_idx):
+            raise ValueError(
+                "Mesh has to be manifold and consistently oriented")
+
+        # Edges added by patches are looked up by their vertices instead
+        self.edge_keys = keys
+        self.key_base = len(verts)
+        self.added_edges: "dict[tuple[int, int], int]" = dict()
+        self.edge_count = len(keys)
+        self.free_faces: "list[int]" = []
+        self.face_slots = len(tris)
+
+        half_edge_count = 2 * len(keys)
+
+        self.he_vert = np.full(half_edge_count, -1, dtype=np.int64)
+        self.he_vert[he_idx ^ 1] = heads
+        self.he_vert[he_idx] = tails
+
+        self.he_face = np.full(half_edge_count, -1, dtype=np.int64)
+        self.he_face[he_idx] = np.arange(len(he_idx)) // 3
+
+        self.he_next = np.full(half_edge_count, -1, dtype=np.int64)
+        self.he_next[he_idx] = he_idx.reshape(-1, 3)[:, [1, 2, 0]].ravel()
+
+        self.face_he = he_idx[0::3].copy()
+
+        self.edge_length = np.linalg.norm(
+            verts[self.he_vert[0::2]] - verts[self.he_vert[1::2]], axis=1)
+
+        self.build_signposts()
+
+    def build_signposts(self):
+        '''
+        Signpost angle of every half-edge, the angle sum of every vertex
+        and the half-edge the angles of a vertex are measured from
+        '''
+        half_edge_count = len(self.he_vert)
+        vert_count = len(self.verts)
+        hes = np.arange(half_edge_count)
+
+        inner = np.flatnonzero(self.he_face >= 0)
+        corners = np.zeros(half_edge_count)
+        corners[inner] = self.calc_corner_angles(inner)
+
+        self.vert_angle_sum = np.bincount(self.he_vert[inner],
+                                          weights=corners[inner],
+                                          minlength=vert_count)
+
+        # Clockwise neighbor of every half-edge around its tail vertex
+        cw = np.full(half_edge_count, -1, dtype=np.int64)
+        has_cw = self.he_face[hes ^ 1] >= 0
+        cw[has_cw] = self.he_next[hes[has_cw] ^ 1]
+
+        # Boundary vertices start measuring from the half-edge following
+        # the boundary, the interior ones from their lowest half-edge
+        self.vert_he = np.full(vert_count, half_edge_count, dtype=np.int64)
+        np.minimum.at(self.vert_he, self.he_vert, hes)
+
+        self.vert_boundary = np.zeros(vert_count, dtype=bool)
+        self.vert_boundary[self.he_vert[~has_cw]] = True
+        self.vert_he[self.he_vert[~has_cw]] = hes[~has_cw]
+
+        cw[self.vert_he[self.vert_he < half_edge_count]] = -1
+        self.vert_he[self.vert_he == half_edge_count] = -1
+
+        # Accumulate the corner angles along the clockwise chains
+        # jumping pointers, each pass doubles the length of the chains
+        angles = np.where(cw >= 0, corners[cw], 0)
+        jump = cw
+
+        while (jump >= 0).any():
+            valid = jump >= 0
+            angles[valid] = angles[valid] + angles[jump[valid]]
+            jump = np.where(valid, jump[np.maximum(jump, 0)], -1)
+
+        self.he_angle = angles
+
+    def calc_corner_angles(self, hes: np.ndarray) -> np.ndarray:
+        '''
+        Angles at the tails of the given half-edges inside their faces
+        '''
+        prevs = self.he_next[self.he_next[hes]]
+
+        a = self.edge_length[hes >> 1]
+        b = self.edge_length[prevs >> 1]
+        c = self.edge_length[self.he_next[hes] >> 1]
+
+        return np.arccos(np.clip((a*a + b*b - c*c) / (2*a*b), -1, 1))
+
+    @property
+    def face_count(self) -> int:
+        return self.face_slots
+
+    # Connectivity
+
+    def tail(self, h: int) -> int:
+        return int(self.he_vert[h])
+
+    def head(self, h: int) -> int:
+        return self.tail(h ^ 1)
+
+    def next(self, h: int) -> int:
+        return int(self.he_next[h])
+
+    def face(self, h: int) -> int:
+        return int(self.he_face[h])
+
+    def length(self, h: int) -> float:
+        return float(self.edge_length[h >> 1])
+
+    def angle(self, h: int) -> float:
+        return float(self.he_angle[h])
+
+    def angle_sum(self, v: int) -> float:
+        return float(self.vert_angle_sum[v])
+
+    def is_boundary_vert(self, v: int) -> bool:
+        return bool(self.vert_boundary[v])
+
+    def ccw(self, h: int) -> int:
+        '''
+        Next half-edge leaving the tail of h counter clockwise,
+        -1 when the face of h is the outside of a boundary
+        '''
+        if self.face(h) < 0:
+            return -1
+        return self.next(self.next(h)) ^ 1
+
+    def vert_half_edge(self, v: int) -> int:
+        return int(self.vert_he[v])
+
+    def outgoing(self, v: int):
+        '''
+        Half-edges leaving v in counter clockwise order
+        '''
+        start = h = self.vert_half_edge(v)
+
+        while h >= 0:
+            yield h
+            h = self.ccw(h)
+            if h == start:
+                break
+
+    def get_half_edge(self, u: int, v: int) -> int:
+
+        for h in self.outgoing(u):
+            if self.head(h) == v:
+                return h
+
+        return -1
+
+    def corner_angle(self, h: int) -> float:
+        '''
+        Angle at the tail of h inside its face
+        '''
+        n = self.next(h)
+        return law_of_cosines(self.length(h), self.length(self.next(n)),
+                              self.length(n))
+
+    def wrap_angle(self, v: int, angle: float) -> float:
+        if self.is_boundary_vert(v):
+            return angle
+        return angle % self.angle_sum(v)
+
+    # Modification
+
+    def set_half_edge(self, h: int, vert: int, next_he: int, face: int):
+        self.he_vert[h] = vert
+        self.he_next[h] = next_he
+        self.he_face[h] = face
+
+    def set_angle(self, h: int, angle: float):
+        self.he_angle[h] = angle
+
+    def set_length(self, e: int, length: float):
+        self.edge_length[e] = length
+
+    def set_face_he(self, f: int, h: int):
+        self.face_he[f] = h
+
+    def set_vert_he(self, v: int, h: int):
+        self.vert_he[v] = h
+
+    def flip_edge(self, e: int) -> bool:
+        '''
+        Replaces the diagonal of the quad formed by the two triangles
+        around the edge with the other one, as long as the quad is convex
+
+        returns - whether the edge was flipped
+        '''
+        ha, hb = 2 * e, 2 * e + 1
+        fa, fb = self.face(ha), self.face(hb)
+
+        if fa < 0 or fb < 0:
+            return False
+
+        # Faces (i, j, k) and (j, i, l) around the i -> j half-edge
+        a1 = self.next(ha)
+        a2 = self.next(a1)
+        b1 = self.next(hb)
+        b2 = self.next(b1)
+
+        i, j = self.tail(ha), self.tail(hb)
+        k, ll = self.tail(a2), self.tail(b2)
+
+        # Lay the quad out with i at the origin and j on the x axis
+        l_ij = self.length(ha)
+        pk = layout_point(l_ij, self.length(a2), self.length(a1))
+        pl = layout_point(l_ij, self.length(b1), self.length(b2))
+        pl = (pl[0], -pl[1])
+
+        # The new diagonal has to cross the old one inside the quad
+        if pk[1] - pl[1] <= 0:
+            return False
+        t = pk[1] / (pk[1] - pl[1])
+        x = pk[0] + t * (pl[0] - pk[0])
+        if x <= EPS_FLIP * l_ij or x >= (1 - EPS_FLIP) * l_ij:
+            return False
+
+        new_length = sqrt((pk[0] - pl[0])**2 + (pk[1] - pl[1])**2)
+
+        # Faces (k, l, j) and (l, k, i) around the new k -> l half-edge
+        self.set_length(e, new_length)
+        self.set_half_edge(ha, k, b2, fa)
+        self.set_half_edge(b2, ll, a1, fa)
+        self.set_half_edge(a1, j, ha, fa)
+        self.set_half_edge(hb, ll, a2, fb)
+        self.set_half_edge(a2, k, b1, fb)
+        self.set_half_edge(b1, i, hb, fb)
+        self.set_face_he(fa, ha)
+        self.set_face_he(fb, hb)
+
+        if self.vert_half_edge(i) == ha:
+            self.set_vert_he(i, b1)
+        if self.vert_half_edge(j) == hb:
+            self.set_vert_he(j, a1)
+
+        # New signposts rotate from the sides of the quad they follow
+        self.set_angle(ha, self.wrap_angle(
+            k, self.angle(a2) + self.corner_angle(a2)))
+        self.set_angle(hb, self.wrap_angle(
+            ll, self.angle(b2) + self.corner_angle(b2)))
+
+        return True
+
+    # Patching
+
+    def find_edge(self, u: int, v: int) -> int:
+        '''
+        Edge between the vertices of the input mesh, -1 if there's none
+        '''
+        a, b = min(u, v), max(u, v)
+
+        e = self.added_edges.get((a, b))
+        if e is not None:
+            return e
+
+        if b >= self.key_base:
+            return -1
+
+        key = a * self.key_base + b
+        i = int(np.searchsorted(self.edge_keys, key))
+        if i < len(self.edge_keys) and self.edge_keys[i] == key:
+            return i
+
+        return -1
+
+    def add_half_edge(self, u: int, v: int) -> int:
+        '''
+        Half-edge from u to v, its edge is created if it doesn't exist
+        '''
+        e = self.find_edge(u, v)
+
+        if e < 0:
+            e = self.edge_count
+            self.edge_count += 1
+            self.added_edges[(min(u, v), max(u, v))] = e
+
+            size = 2 * self.edge_count
+            self.he_vert = reserve(self.he_vert, size, -1)
+            self.he_next = reserve(self.he_next, size, -1)
+            self.he_face = reserve(self.he_face, size, -1)
+            self.he_angle = reserve(self.he_angle, size, 0)
+            self.edge_length = reserve(self.edge_length, self.edge_count, 0)
+
+            h = 2 * e + (u > v)
+            self.he_vert[h] = u
+            self.he_vert[h ^ 1] = v
+            self.edge_length[e] = np.linalg.norm(
+                self.verts[u] - self.verts[v])
+
+        h = 2 * e + (u > v)
+
+        if self.face(h) >= 0:
+            raise ValueError(
+                "Mesh has to be manifold and consistently oriented")
+
+        return h
+
+    def patch(self, verts, removed_tris, added_tris):
+        '''
+        Applies local edits of the input mesh, it can't have been flipped
+
+        verts - (K,3) coordinates of the new vertices,
+        numbered after the existing ones
+
+        removed_tris, added_tris - (R,3) and (A,3) triangles
+        '''
+        verts = np.asarray(verts, dtype=np.float64).reshape(-1, 3)
+
+        vert_count = len(self.verts)
+        size = vert_count + len(verts)
+
+        if size > len(self.vert_buffer):
+            self.vert_buffer = grow(self.vert_buffer, size)
+        self.vert_buffer[vert_count:size] = verts
+        self.verts = self.vert_buffer[:size]
+
+        self.vert_he = reserve(self.vert_he, size, -1)
+        self.vert_angle_sum = reserve(self.vert_angle_sum, size, 0)
+        self.vert_boundary = reserve(self.vert_boundary, size, False)
+
+        # Half-edges that may still leave every touched vertex
+        candidates: "dict[int, list[int]]" = dict()
+
+        for a, b, c in np.asarray(removed_tris).reshape(-1, 3).tolist():
+
+            h = 2 * self.find_edge(a, b) + (a > b)
+            f = self.face(h)
+
+            for _ in range(3):
+                n = self.next(h)
+                self.he_face[h] = -1
+                self.he_next[h] = -1
+                candidates.setdefault(self.head(h), []).append(h ^ 1)
+                h = n
+
+            self.face_he[f] = -1
+            self.free_faces.append(f)
+
+        for tri in np.asarray(added_tris).reshape(-1, 3).tolist():
+
+            hes = [self.add_half_edge(tri[i], tri[(i + 1) % 3])
+                   for i in range(3)]
+
+            if self.free_faces:
+                f = self.free_faces.pop()
+            else:
+                f = self.face_slots
+                self.face_slots += 1
+                self.face_he = reserve(self.face_he, self.face_slots, -1)
+
+            for i, h in enumerate(hes):
+                self.he_face[h] = f
+                self.he_next[h] = hes[(i + 1) % 3]
+                candidates.setdefault(tri[i], []).append(h)
+
+            self.face_he[f] = hes[0]
+
+        for v, hes in candidates.items():
+            hes.append(self.vert_half_edge(v))
+            h = next((h for h in hes if h >= 0 and self.face(h) >= 0), -1)
+            self.update_signposts(v, h)
+
+    def update_signposts(self, v: int, h: int):
+        '''
+        Signposts of the half-edges leaving v measured again
+
+        h - any half-edge leaving v inside a face, -1 if there's none
+        '''
+        if h < 0:
+            self.vert_he[v] = -1
+            self.vert_angle_sum[v] = 0
+            self.vert_boundary[v] = False
+            return
+
+        # Boundary vertices are measured from the half-edge following
+        # the boundary, the interior ones from their lowest half-edge
+        first = start = h
+        while self.face(h ^ 1) >= 0:
+            h = self.next(h ^ 1)
+            if h == first:
+                boundary = False
+                break
+            start = min(start, h)
+        else:
+            start, boundary = h, True
+
+        angle = 0.
+        h = start
+        while h >= 0:
+            self.he_angle[h] = angle
+            if self.face(h) < 0:
+                break
+            angle += self.corner_angle(h)
+            h = self.ccw(h)
+            if h == start:
+                break
+
+        self.vert_he[v] = start
+        self.vert_angle_sum[v] = angle
+        self.vert_boundary[v] = boundary
+
+    # Tracing
+
+    def trace_half_edge(self, h: int,
+                        input_tri: "IntrinsicTriangulation") -> np.ndarray:
+        '''
+        Points where the half-edge crosses the edges of the input mesh
+
+        input_tri - triangulation of the input mesh, never flipped
+
+        returns - (K,3) points from the tail to the head of h
+        '''
+        v, target = self.tail(h), self.head(h)
+        angle, length = self.angle(h), self.length(h)
+
+        co = input_tri.verts
+
+        # Face of the input mesh the half-edge starts through
+        start = -1
+        for g in input_tri.outgoing(v):
+
+            offset = input_tri.wrap_angle(v, angle - input_tri.angle(g))
+            if not input_tri.is_boundary_vert(v) and \
+                    input_tri.angle_sum(v) - offset <= EPS_ANGLE:
+                offset = 0
+
+            # Edges of the input mesh are straight
+            if abs(offset) <= EPS_ANGLE and input_tri.head(g) == target:
+                return np.array([co[v], co[target]])
+
+            if input_tri.face(g) >= 0 and \
+                    -EPS_ANGLE <= offset < \
+                    input_tri.corner_angle(g) - EPS_ANGLE:
+                start, offset = g, max(offset, 0)
+                break
+
+        if start < 0:
+            return np.array([co[v], co[target]])
+
+        # Rotate the first edge of the face towards the direction
+        a, b, c = face_verts(input_tri, start)
+        normal = face_normal(co[a], co[b], co[c])
+        e = co[b] - co[a]
+        e = e / np.linalg.norm(e)
+        direction = cos(offset) * e + sin(offset) * np.cross(normal, e)
+
+        points = [co[v]]
+        point = co[v]
+        # only the edge opposite to the starting vertex can be crossed
+        candidates = [input_tri.next(start)]
+        remaining = length
+
+        for _ in range(input_tri.face_count):
+
+            crossing = exit_edge(input_tri, candidates, point, direction,
+                                 normal)
+
+            if crossing is None:
+                break
+
+            out, t, s = crossing
+            if t >= remaining:
+                break
+
+            p, q = co[input_tri.tail(out)], co[input_tri.head(out)]
+            point = p + s * (q - p)
+            remaining -= t
+            points.append(point)
+
+            # Walk into the next face unfolding the direction
+            # around the crossed edge
+            across = out ^ 1
+            if input_tri.face(across) < 0:
+                break
+
+            direction, normal = unfold(co, input_tri, out, direction)
+            candidates = [input_tri.next(across),
+                          input_tri.next(input_tri.next(across))]
+
+        points.append(co[target])
+
+        return np.array(points)
+
+
+class IntrinsicOverlay(IntrinsicTriangulation):
+    '''
+    Flippable view of a triangulation that leaves it untouched.
+    Flips write the elements they modify into dictionaries over the
+    arrays of the base triangulation (copy-on-write), so the time and
+    memory of a query depend on the flips it makes, not on the mesh.
+    '''
+    def __init__(self, base: IntrinsicTriangulation):
+
+        self.base = base
+
+        # Flips keep the vertices, their angle sums and the boundary
+        self.verts = base.verts
+        self.vert_angle_sum = base.vert_angle_sum
+        self.vert_boundary = base.vert_boundary
+
+        # half-edge -> (tail, next, face)
+        self.half_edges: "dict[int, tuple[int, int, int]]" = dict()
+        self.angles: "dict[int, float]" = dict()
+        self.lengths: "dict[int, float]" = dict()
+        self.vert_hes: "dict[int, int]" = dict()
+        self.face_hes: "dict[int, int]" = dict()
+
+    @property
+    def face_count(self) -> int:
+        return self.base.face_count
+
+    @property
+    def flipped_count(self) -> int:
+        return len(self.lengths)
+
+    def tail(self, h: int) -> int:
+        if h in self.half_edges:
+            return self.half_edges[h][0]
+        return self.base.tail(h)
+
+    def next(self, h: int) -> int:
+        if h in self.half_edges:
+            return self.half_edges[h][1]
+        return self.base.next(h)
+
+    def face(self, h: int) -> int:
+        if h in self.half_edges:
+            return self.half_edges[h][2]
+        return self.base.face(h)
+
+    def length(self, h: int) -> float:
+        if h >> 1 in self.lengths:
+            return self.lengths[h >> 1]
+        return self.base.length(h)
+
+    def angle(self, h: int) -> float:
+        if h in self.angles:
+            return self.angles[h]
+        return self.base.angle(h)
+
+    def vert_half_edge(self, v: int) -> int:
+        if v in self.vert_hes:
+            return self.vert_hes[v]
+        return self.base.vert_half_edge(v)
+
+    def set_half_edge(self, h: int, vert: int, next_he: int, face: int):
+        self.half_edges[h] = (vert, next_he, face)
+
+    def set_angle(self, h: int, angle: float):
+        self.angles[h] = angle
+
+    def set_length(self, e: int, length: float):
+        self.lengths[e] = length
+
+    def set_face_he(self, f: int, h: int):
+        self.face_hes[f] = h
+
+    def set_vert_he(self, v: int, h: int):
+        self.vert_hes[v] = h
+
+
+def exit_edge(tri: IntrinsicTriangulation, candidates: "list[int]",
+              point: np.ndarray, direction: np.ndarray, normal: np.ndarray):
+    '''
+    First of the candidate half-edges the ray leaves its face through
+
+    returns - half-edge, distance along the ray and parameter along
+    the half-edge or None if the ray misses them all
+    '''
+    co = tri.verts
+    best = None
+
+    for h in candidates:
+        p, q = co[tri.tail(h)], co[tri.head(h)]
+        edge_vec = q - p
+
+        denom = np.cross(direction, edge_vec) @ normal
+        if denom == 0:
+            continue
+
+        t = np.cross(p - point, edge_vec) @ normal / denom
+        s = np.cross(p - point, direction) @ normal / denom
+
+        if t > 0 and -EPS_FLIP <= s <= 1 + EPS_FLIP and \
+                (best is None or t < best[1]):
+            best = (h, t, min(max(s, 0), 1))
+
+    return best
+
+
+def unfold(co: np.ndarray, tri: IntrinsicTriangulation, h: int,
+           direction: np.ndarray):
+    '''
+    Direction in the face across h keeping the angle with the edge
+    '''
+    p, q = co[tri.tail(h)], co[tri.head(h)]
+    e = (q - p) / np.linalg.norm(q - p)
+
+    a, b, c = face_verts(tri, h ^ 1)
+    new_normal = face_normal(co[a], co[b], co[c])
+
+    # In plane perpendicular of the edge pointing into the new face
+    side = np.cross(new_normal, -e)
+
+    along = direction @ e
+    across = sqrt(max(direction @ direction - along * along, 0))
+
+    result = along * e + across * side
+
+    return result / np.linalg.norm(result), new_normal
+
+
+def reserve(array: np.ndarray, size: int, fill) -> np.ndarray:
+    '''
+    Array with room for at least size elements,
+    the ones that didn't exist yet are set to fill
+    '''
+    if size <= len(array):
+        return array
+
+    result = grow(array, size)
+    result[len(array):] = fill
+
+    return result
+
+
+def face_verts(tri: IntrinsicTriangulation, h: int):
+    n = tri.next(h)
+    return tri.tail(h), tri.tail(n), tri.tail(tri.next(n))
+
+
+def face_normal(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    n = np.cross(b - a, c - a)
+    return n / np.linalg.norm(n)
+
+
+def law_of_cosines(a: float, b: float, c: float) -> float:
+    '''
+    Angle between the sides a and b of a triangle with c opposite to it
+    '''
+    return acos(min(max((a*a + b*b - c*c) / (2*a*b), -1), 1))
+
+
+def layout_point(base: float, l0: float, l1: float):
+    '''
+    Apex of a triangle laid out over the (0, 0) - (base, 0) segment
+    at distances l0 and l1 from its ends, above the x axis
+    '''
+    x = (base*base + l0*l0 - l1*l1) / (2*base)
+    return (x, sqrt(max(l0*l0 - x*x, 0)))
@@ -0,0 +1,200 @@
+'''
+Created on October 18, 2026
+
+@author: Albert Rodriguez (@UncleFirefox)
+
+Vertex and triangle arrays of a triangulated mesh that can be patched
+with small local edits (a vertex inserted on an edge or inside a face)
+without reading the whole mesh back.
+
+Arrays are append-only: new elements take the next free slot and removed
+ones are only flagged as dead (tombstones), so slots handed out before
+an edit stay valid after it. Consumers that need a clean mesh call
+compact() to pack the live elements.
+
+Removals are also logged, so together with the slots handed out the
+edits made since any point can be told apart from what was already
+there and patched into structures built from the arrays.
+
+'''
+
+import numpy as np
+
+
+class MeshArrays(object):
+
+    def __init__(self, verts, tris):
+
+        verts = np.asarray(verts, dtype=np.float64).reshape(-1, 3)
+        tris = np.asarray(tris, dtype=np.int64).reshape(-1, 3)
+
+        self.verts = verts.copy()
+        self.vert_alive = np.ones(len(verts), dtype=bool)
+        self.vert_count = len(verts)
+
+        self.tris = tris.copy()
+        self.tri_alive = np.ones(len(tris), dtype=bool)
+        self.tri_count = len(tris)
+
+        # Vertex -> triangle incidence of the base mesh in CSR form,
+        # triangles appended later are tracked in a small dictionary
+        corners = tris.ravel()
+        counts = np.bincount(corners, minlength=len(verts))
+        self.base_offsets = np.concatenate(([0], np.cumsum(counts)))
+        self.base_vert_tris = np.argsort(corners, kind='stable') // 3
+        self.base_vert_count = len(verts)
+        self.added_vert_tris = dict()
+
+        # Slots of the removed elements in the order they were removed
+        self.removed_verts = []
+        self.removed_tris = []
+
+    def add_vert(self, co) -> int:
+
+        slot = self.vert_count
+
+        if slot == len(self.verts):
+            self.verts = grow(self.verts)
+            self.vert_alive = grow(self.vert_alive)
+
+        self.verts[slot] = co
+        self.vert_alive[slot] = True
+        self.vert_count += 1
+
+        return slot
+
+    def remove_vert(self, slot: int):
+        self.vert_alive[slot] = False
+        self.removed_verts.append(slot)
+
+    def add_tri(self, a: int, b: int, c: int) -> int:
+
+        slot = self.tri_count
+
+        if slot == len(self.tris):
+            self.tris = grow(self.tris)
+            self.tri_alive = grow(self.tri_alive)
+
+        self.tris[slot] = (a, b, c)
+        self.tri_alive[slot] = True
+        self.tri_count += 1
+
+        for v in (a, b, c):
+            self.added_vert_tris.setdefault(v, []).append(slot)
+
+        return slot
+
+    def remove_tri(self, a: int, b: int, c: int):
+
+        slot = self.find_tri(a, b, c)
+
+        if slot is None:
+            raise ValueError(
+                "Triangle ({}, {}, {}) is not part of the mesh".format(
+                    a, b, c))
+
+        self.tri_alive[slot] = False
+        self.removed_tris.append(slot)
+
+    def find_tri(self, a: int, b: int, c: int):
+
+        corners = {a, b, c}
+
+        for slot in self.get_vert_tris(a):
+            if self.tri_alive[slot] and set(self.tris[slot]) == corners:
+                return slot
+
+        return None
+
+    def get_vert_tris(self, v: int) -> "list[int]":
+
+        result = []
+
+        if v < self.base_vert_count:
+            start, end = self.base_offsets[v], self.base_offsets[v+1]
+            result.extend(self.base_vert_tris[start:end].tolist())
+
+        result.extend(self.added_vert_tris.get(v, []))
+
+        return result
+
+    def compact(self):
+        '''
+        Packs the live elements
+
+        returns - vertices (N,3), triangles (M,3) and an array mapping
+        every vertex slot to its packed index (-1 for dead slots)
+        '''
+        alive = self.vert_alive[:self.vert_count]
+
+        vert_map = np.full(self.vert_count, -1, dtype=np.int64)
+        vert_map[alive] = np.arange(np.count_nonzero(alive))
+
+        tris = self.tris[:self.tri_count][self.tri_alive[:self.tri_count]]
+
+        return self.verts[:self.vert_count][alive], vert_map[tris], vert_map
+
+    def get_mark(self):
+        '''
+        returns - the current state of the arrays for get_edits()
+        '''
+        return (self.vert_count, self.tri_count,
+                len(self.removed_verts), len(self.removed_tris))
+
+    def get_edits(self, mark):
+        '''
+        Net edits since the mark, elements added and removed
+        in between are left out
+
+        returns - slots (K,) and coordinates (K,3) of the added vertices,
+        removed (R,3) and added (A,3) triangles as vertex slots and slots
+        of the removed vertices
+        '''
+        vert_count, tri_count, removed_vert_count, removed_tri_count = mark
+
+        added_verts = vert_count + np.flatnonzero(
+            self.vert_alive[vert_count:self.vert_count])
+        added_tris = tri_count + np.flatnonzero(
+            self.tri_alive[tri_count:self.tri_count])
+
+        removed_verts = np.array(
+            [v for v in self.removed_verts[removed_vert_count:]
+             if v < vert_count], dtype=np.int64)
+        removed_tris = np.array(
+            [t for t in self.removed_tris[removed_tri_count:]
+             if t < tri_count], dtype=np.int64)
+
+        return (added_verts, self.verts[added_verts],
+                self.tris[removed_tris], self.tris[added_tris],
+                removed_verts)
+
+
+def split_tri(tri, vert) -> "list[tuple]":
+    '''
+    Triangles replacing tri when vert is placed inside it, wound like
+    tri. The vertices can be slots or any other vertex handles
+    '''
+    a, b, c = tri
+    return [(a, b, vert), (b, c, vert), (c, a, vert)]
+
+
+def split_tri_edge(tri, edge, vert) -> "list[tuple]":
+    '''
+    Triangles replacing tri when vert is placed on its edge, wound like
+    tri so they keep the orientation of the faces around them
+    '''
+    k = next(i for i in range(3) if tri[i] not in edge)
+    opposed, a, b = tri[k], tri[(k + 1) % 3], tri[(k + 2) % 3]
+    return [(a, vert, opposed), (vert, b, opposed)]
+
+
+def grow(array: np.ndarray, size: int = 0) -> np.ndarray:
+    '''
+    Doubles the capacity of an array along its first axis,
+    at least to size
+    '''
+    result = np.zeros((max(2 * len(array), 16, size),) + array.shape[1:],
+                      dtype=array.dtype)
+    result[:len(array)] = array
+
+    return result
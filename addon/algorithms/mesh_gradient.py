@@ -0,0 +1,239 @@
+'''
+Created on October 18, 2026
+
+@author: Albert Rodriguez (@UncleFirefox)
+
+Path extraction from a distance field stored per vertex, shared by the
+backends computing distance fields (fast marching, heat method). Fast
+marching stops once the end is reached, the field only has to cover the
+vertices the path goes through.
+
+The path walks down the gradient of the field across the triangles,
+which is constant per triangle as the field is interpolated linearly,
+until it reaches the minimum of the field: the source vertex. Fields
+that are not exact can have other local minima, the path then goes
+straight from the one it got stuck at to the source.
+
+Based on the steepest descent walk of the original fast marching version
+http://saturno.ge.imati.cnr.it/ima/personal-old/attene/PersonalPage/pdf/steepest-descent-paper.pdf
+
+'''
+
+import numpy as np
+from .fast_marching_arrays import MarchingMesh
+
+# Barycentric tolerance to snap a crossing to a vertex
+EPS_SNAP = 1e-6
+
+
+def trace_path(mesh: MarchingMesh,
+               geos: np.ndarray,
+               start_vert_idx: int,
+               source_vert_idx: int,
+               max_steps: int = None) -> np.ndarray:
+    '''
+    mesh - arrays of the mesh -> MarchingMesh
+
+    geos - (N,) distance of every vertex, inf where unknown
+
+    start_vert_idx - vertex where the descent starts -> int
+
+    source_vert_idx - vertex the distances are measured from,
+    the path always ends there -> int
+
+    max_steps - (optional) limits the number of crossed elements,
+    defaults to the number of triangles
+
+    returns - (K,3) points from the start vertex to the source
+    '''
+
+    if max_steps is None:
+        max_steps = len(mesh.tris)
+
+    co = mesh.verts
+
+    points = [co[start_vert_idx]]
+
+    # Current location, either a vertex or a point on an edge (a, b)
+    # at parameter t reached through the triangle last_tri
+    vert = start_vert_idx
+    edge = None
+    value = geos[start_vert_idx]
+
+    for _ in range(max_steps):
+
+        if vert is not None:
+            if value <= 0:
+                break
+            vert, edge, point, value = descend_from_vert(
+                mesh, geos, vert, value)
+        else:
+            vert, edge, point, value = descend_from_edge(
+                mesh, geos, edge, value)
+
+        if point is None:
+            break
+
+        points.append(point)
+
+    if vert != source_vert_idx:
+        points.append(co[source_vert_idx])
+
+    return np.array(points)
+
+
+def descend_from_vert(mesh: MarchingMesh, geos: np.ndarray,
+                      v: int, value: float):
+
+    co = mesh.verts
+
+    best = None
+    best_slope = 0
+
+    # Look for the triangle where the descent direction goes inside
+    for f in mesh.get_vert_tris(v):
+        a, b = [x for x in mesh.tris[f] if x != v]
+
+        if not np.isfinite(geos[[a, b]]).all():
+            continue
+
+        d = -face_gradient(co, mesh.tris[f], geos)
+        slope = np.linalg.norm(d)
+        if slope <= best_slope:
+            continue
+
+        alpha, beta = decompose(co[a] - co[v], co[b] - co[v], d)
+        if alpha < 0 or beta < 0 or alpha + beta <= 0:
+            continue
+
+        best = (f, a, b, beta / (alpha + beta))
+        best_slope = slope
+
+    if best is not None:
+        f, a, b, t = best
+        return edge_location(mesh, geos, f, a, b, t, value)
+
+    # We were not able to walk through a face, walk along an edge
+    neighbors = mesh.get_vert_neighbors(v)
+    lowest = neighbors[np.argmin(geos[neighbors])]
+
+    if geos[lowest] >= value:
+        # lowest vert or local minima
+        return None, None, None, value
+
+    return lowest, None, co[lowest], geos[lowest]
+
+
+def descend_from_edge(mesh: MarchingMesh, geos: np.ndarray,
+                      edge, value: float):
+
+    a, b, t, last_tri = edge
+    co = mesh.verts
+
+    tris = [f for f in mesh.get_vert_tris(a)
+            if f != last_tri and b in mesh.tris[f]]
+
+    # walk around boundary edges
+    if not tris:
+        return walk_to_lowest(co, geos, a, b, value)
+
+    f = tris[0]
+    c = [x for x in mesh.tris[f] if x != a and x != b][0]
+
+    if not np.isfinite(geos[c]):
+        return walk_to_lowest(co, geos, a, b, value)
+
+    d = -face_gradient(co, mesh.tris[f], geos)
+
+    # Barycentric coordinates of the point and the direction
+    # relative to c, the point lies on the ab edge
+    la, lb = 1 - t, t
+    da, db = decompose(co[a] - co[c], co[b] - co[c], d)
+
+    # Direction shoots out of the face, not across it
+    if da + db >= 0:
+        return walk_to_lowest(co, geos, a, b, value)
+
+    # Leave the face through the edge whose coordinate hits 0 first
+    sa = -la / da if da < 0 else np.inf
+    sb = -lb / db if db < 0 else np.inf
+
+    if sa <= sb:
+        # crossing the cb edge
+        s = sa
+        return edge_location(mesh, geos, f, c, b, lb + s * db, value)
+
+    # crossing the ca edge
+    s = sb
+    return edge_location(mesh, geos, f, c, a, la + s * da, value)
+
+
+def edge_location(mesh: MarchingMesh, geos: np.ndarray,
+                  f: int, a: int, b: int, t: float, value: float):
+    '''
+    Location at parameter t of the edge a -> b entered from triangle f,
+    snapped to the vertices when it is close enough to them
+    '''
+    co = mesh.verts
+
+    if t <= EPS_SNAP:
+        return a, None, co[a], geos[a]
+    if t >= 1 - EPS_SNAP:
+        return b, None, co[b], geos[b]
+
+    new_value = (1 - t) * geos[a] + t * geos[b]
+
+    # The field has to decrease, otherwise we're going around in circles
+    if new_value >= value:
+        return walk_to_lowest(co, geos, a, b, value)
+
+    point = (1 - t) * co[a] + t * co[b]
+
+    return None, (a, b, t, f), point, new_value
+
+
+def walk_to_lowest(co: np.ndarray, geos: np.ndarray,
+                   a: int, b: int, value: float):
+    '''
+    Travel ALONG the edge to its lowest vertex
+    '''
+    lowest = a if geos[a] <= geos[b] else b
+
+    if geos[lowest] >= value:
+        return None, None, None, value
+
+    return lowest, None, co[lowest], geos[lowest]
+
+
+def face_gradient(co: np.ndarray, tri: np.ndarray,
+                  geos: np.ndarray) -> np.ndarray:
+    '''
+    Gradient of the linear interpolation of geos over a triangle
+    '''
+    i, j, k = tri
+    n = np.cross(co[j] - co[i], co[k] - co[i])
+    double_area = np.linalg.norm(n)
+
+    if double_area == 0:
+        return np.zeros(3)
+
+    N = n / double_area
+
+    return (geos[i] * np.cross(N, co[k] - co[j]) +
+            geos[j] * np.cross(N, co[i] - co[k]) +
+            geos[k] * np.cross(N, co[j] - co[i])) / double_area
+
+
+def decompose(e1: np.ndarray, e2: np.ndarray, d: np.ndarray):
+    '''
+    Coefficients of d in the basis e1, e2 of the triangle plane
+    '''
+    g11, g12, g22 = e1 @ e1, e1 @ e2, e2 @ e2
+    r1, r2 = e1 @ d, e2 @ d
+
+    det = g11 * g22 - g12 * g12
+    if det == 0:
+        return 0., 0.
+
+    return ((g22 * r1 - g12 * r2) / det,
+            (g11 * r2 - g12 * r1) / det)
@@ -0,0 +1,178 @@
+'''
+Created on October 18, 2026
+
+@author: Albert Rodriguez (@UncleFirefox)
+
+Uniform grid hashing points by the cell they fall in, answers which
+points lie around a location without going through all of them.
+
+Points are added and removed in groups under a key (a key vertex, a
+segment of a path) so a group that changes is reindexed on its own.
+
+'''
+
+from itertools import product
+import numpy as np
+
+
+class PointGrid(object):
+
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self.cells = dict()
+        self.groups = dict()
+
+    def __contains__(self, key) -> bool:
+        return key in self.groups
+
+    def keys(self):
+        return self.groups.keys()
+
+    def get_points(self, key) -> np.ndarray:
+        return self.groups[key][0]
+
+    def add(self, key, points):
+
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        cells = list(map(tuple, self.get_cells(points).tolist()))
+
+        for i, cell in enumerate(cells):
+            self.cells.setdefault(cell, []).append((key, i))
+
+        self.groups[key] = (points, cells)
+
+    def remove(self, key):
+
+        _, cells = self.groups.pop(key)
+
+        for cell in set(cells):
+            entries = [e for e in self.cells[cell] if e[0] != key]
+            if entries:
+                self.cells[cell] = entries
+            else:
+                del self.cells[cell]
+
+    def query(self, point, radius: float):
+        '''
+        returns - (key, index in the group) of the points
+        within radius of point, closest first
+        '''
+        point = np.asarray(point, dtype=np.float64)
+        low, high = self.get_cells(np.stack((point - radius, point + radius)))
+
+        candidates = [entry
+                      for cell in product(*map(range, low, high + 1))
+                      for entry in self.cells.get(cell, ())]
+
+        if not candidates:
+            return []
+
+        points = np.array([self.groups[key][0][i] for key, i in candidates])
+        distances = np.linalg.norm(points - point, axis=1)
+
+        return [candidates[i] for i in np.argsort(distances, kind='stable')
+                if distances[i] <= radius]
+
+    def get_cells(self, points: np.ndarray) -> np.ndarray:
+        return np.floor(points / self.cell_size).astype(np.int64)
+
+
+class PathIndex(object):
+    '''
+    Points of the segments of a path in a PointGrid.
+
+    Segments are told apart by identity, update() only reindexes the
+    ones that are not the same objects they were on the last call.
+    '''
+
+    def __init__(self):
+        self.grid = None
+        self.segments = dict()
+        self.positions = dict()
+        self.max_lengths = dict()
+
+    def update(self, path_segments):
+
+        current = {id(s): s for s in path_segments if len(s) > 0}
+
+        for key in [k for k in self.segments if k not in current]:
+            self.segments.pop(key)
+            self.max_lengths.pop(key)
+            self.grid.remove(key)
+
+        for key, segment in current.items():
+            if key not in self.segments:
+                self.add(key, segment)
+
+        self.positions = {id(s): pos for pos, s in enumerate(path_segments)}
+
+    def add(self, key, segment):
+
+        points = np.array(segment, dtype=np.float64).reshape(-1, 3)
+        lengths = np.linalg.norm(np.diff(points, axis=0), axis=1)
+        max_length = lengths.max() if len(lengths) > 0 else 0.
+
+        # Cells are kept larger than the sub-segments so queries
+        # only ever look at the cells right around the point
+        if self.grid is None or max_length > self.grid.cell_size:
+            self.rebuild(max(2 * max_length, 1e-6))
+
+        self.segments[key] = segment
+        self.max_lengths[key] = max_length
+        self.grid.add(key, points)
+
+    def rebuild(self, cell_size: float):
+
+        grid = PointGrid(cell_size)
+
+        if self.grid is not None:
+            for key in self.grid.keys():
+                grid.add(key, self.grid.get_points(key))
+
+        self.grid = grid
+
+    def find_closest(self, point, epsilon: float):
+        '''
+        returns - position of the segment and index of the sub-segment
+        closest to point if it's within epsilon, None otherwise
+        '''
+        if not self.segments:
+            return None
+
+        point = np.asarray(point, dtype=np.float64)
+
+        # The closest point of a sub-segment is at most half its length
+        # away from one of its ends
+        radius = epsilon + max(self.max_lengths.values()) / 2
+
+        best, best_distance = None, epsilon
+        for key, i in self.grid.query(point, radius):
+            points = self.grid.get_points(key)
+            for j in (i-1, i):
+                if j < 0 or j + 1 >= len(points):
+                    continue
+                distance = point_segment_distance(
+                    point, points[j], points[j+1])
+                if distance <= best_distance:
+                    best, best_distance = (key, j), distance
+            if len(points) == 1:
+                distance = np.linalg.norm(point - points[0])
+                if distance <= best_distance:
+                    best, best_distance = (key, 0), distance
+
+        if best is None:
+            return None
+
+        return self.positions[best[0]], best[1]
+
+
+def point_segment_distance(point, start, end) -> float:
+
+    direction = end - start
+    length_squared = direction.dot(direction)
+
+    t = 0.
+    if length_squared > 0:
+        t = min(max((point - start).dot(direction) / length_squared, 0.), 1.)
+
+    return float(np.linalg.norm(point - (start + t * direction)))
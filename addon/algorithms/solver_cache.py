@@ -0,0 +1,138 @@
+'''
+Created on October 18, 2026
+
+@author: Albert Rodriguez (@UncleFirefox)
+
+Version keyed cache of the solver a geodesic backend builds for a mesh,
+shared by all the backends so callers can switch between them
+
+'''
+
+import numpy as np
+from .geometry_provider import GeometryProvider
+
+# Number of local edits a solver follows before it's built again.
+# Subdividing a face or an edge to place a point doesn't move the
+# surface, solvers that can be patched take the new elements in place
+# and the rest keep answering queries between the vertices they know.
+# Rebuilding from time to time packs the dead elements away
+REBUILD_THRESHOLD = 1024
+
+
+class SolverCache(object):
+    '''
+    Keeps the solver built for a given mesh version so repeated
+    queries on an unchanged mesh don't pay for its construction again.
+
+    build_solver is called with the (N,3) vertex and (M,3) triangle
+    arrays of the mesh and returns whatever the backend needs.
+
+    The arrays come from the geometry provider, the version is the one
+    of the provider unless the caller passes its own.
+
+    When the provider is patched with local edits:
+    - solvers with a patch(verts, removed_tris, added_tris) method get
+    the new vertices, numbered after the ones they have, and the
+    triangles that changed. The whole mesh is never read again until
+    the edits pile up past the threshold
+    - any other solver is kept while the queries only involve vertices
+    it knows, the first one that doesn't rebuilds it from scratch
+    '''
+    def __init__(self, build_solver, geometry: GeometryProvider,
+                 rebuild_threshold: int = REBUILD_THRESHOLD):
+        self.build_solver = build_solver
+        self.geometry = geometry
+        self.rebuild_threshold = rebuild_threshold
+        self.clear()
+
+    def get(self, version: int, *vert_idxs: int):
+        if self.solver is None or version is None:
+            return None
+
+        if version == self.version:
+            return self.solver
+
+        if not self.geometry.patched:
+            return None
+
+        if version - self.built_version >= self.rebuild_threshold:
+            return None
+
+        if hasattr(self.solver, 'patch'):
+            self.patch(version)
+            return self.solver
+
+        if not all(self.knows_vert(idx) for idx in vert_idxs):
+            return None
+
+        return self.solver
+
+    def build(self, version: int):
+
+        V, F, self.vert_map = self.geometry.read()
+        self.mark = self.geometry.get_mark()
+
+        self.version = self.built_version = version
+        self.vert_count = len(V)
+        self.solver = self.build_solver(V, F)
+
+        return self.solver
+
+    def patch(self, version: int):
+        '''
+        Brings the solver up to date with the edits made
+        to the geometry since it was built or last patched
+        '''
+        vert_ids, verts, removed_tris, added_tris, removed_vert_ids = \
+            self.geometry.read_edits(self.mark)
+        self.mark = self.geometry.get_mark()
+
+        # Vertex ids are handed out in order, the new ones come after
+        # the ones the map already has
+        size = max(len(self.vert_map), vert_ids.max(initial=-1) + 1)
+        vert_map = np.full(size, -1, dtype=np.int64)
+        vert_map[:len(self.vert_map)] = self.vert_map
+        vert_map[vert_ids] = np.arange(self.vert_count,
+                                       self.vert_count + len(vert_ids))
+
+        self.solver.patch(verts, vert_map[removed_tris],
+                          vert_map[added_tris])
+
+        vert_map[removed_vert_ids] = -1
+
+        self.vert_map = vert_map
+        self.vert_count += len(vert_ids)
+        self.version = version
+
+    def get_solver(self, version: int, vert_idxs: "list[int]"):
+        '''
+        Cached solver for the version, built if it's missing or
+        it can't answer a query between the given vertices
+        '''
+        if version is None:
+            version = self.geometry.version
+
+        solver = self.get(version, *vert_idxs)
+
+        if solver is None:
+            solver = self.build(version)
+
+        return solver
+
+    def knows_vert(self, idx: int) -> bool:
+        if self.vert_map is None:
+            return True
+        return idx < len(self.vert_map) and self.vert_map[idx] >= 0
+
+    def solver_index(self, idx: int) -> int:
+        if self.vert_map is None:
+            return idx
+        return int(self.vert_map[idx])
+
+    def clear(self):
+        self.version = None
+        self.built_version = None
+        self.solver = None
+        self.vert_map = None
+        self.vert_count = 0
+        self.mark = None
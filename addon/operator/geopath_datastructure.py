@@ -1,17 +1,22 @@
 import bmesh
 from bmesh.types import BMFace
-import bpy
 
 from bpy_extras import view3d_utils
-from functools import reduce
 from enum import Enum
+import numpy as np
 
 from mathutils import Vector
-# from ..algorithms.geodesic_fast_marching import geodesic_walk
-from ..algorithms.geodesic_edge_flipping import geodesic_walk
-from mathutils.geometry import intersect_point_line
+from ..algorithms.geodesic_backends import get_backend, is_patchable, \
+    PREVIEW_BACKEND
+from ..algorithms.geometry_provider import MeshArraysGeometry
+from ..algorithms.mesh_arrays import MeshArrays, split_tri, \
+    split_tri_edge
+from ..algorithms.point_grid import PathIndex, PointGrid
+from mathutils.geometry import closest_point_on_tri, intersect_point_line
 from ..utility import draw
-from ..utility.geometry import create_face_with_ccw_normal
+from ..utility.addon import get_prefs
+from ..utility.geometry import capture_face, restore_face
+from ..utility.triangulation import get_triangulation
 
 
 class GeoPath(object):
@@ -26,20 +31,73 @@ class GeoPath(object):
         self.bme = bmesh.new()
         self.bme.from_mesh(selected_obj.data)
         self.bme.verts.ensure_lookup_table()
-        self.bme.edges.ensure_lookup_table()
-        self.bme.faces.ensure_lookup_table()
+        self.bme.faces.index_update()
 
-        # Keep a backup of the original structure
-        self.original_bme = self.bme.copy()
+        # The working mesh is never written back to the object so rays
+        # keep hitting the original polygons. The faces we create are
+        # mapped to the polygon they come from to find which of them
+        # was hit, the untouched ones keep the polygon index
+        self.face_origin = dict()
+        self.polygon_faces = dict()
 
+        # Faces of the polygons as they were loaded, the ones nobody
+        # touched are still there and keep being looked up here
+        self.original_faces = list(self.bme.faces)
+
+        # Faces removed by every subdivision to be able to undo it
         self.sub_vert_undo = dict()
 
-        non_tris = [f for f in self.bme.faces if len(f.verts) > 3]
-        bmesh.ops.triangulate(self.bme, faces=non_tris)
+        # Arrays fed to the geodesic solver, patched with every
+        # subdivision instead of being read back from the mesh.
+        # Original vertices are never removed so they keep their index
+        # as slot, the ones we create get theirs assigned here.
+        # Polygons are only triangulated in the BMesh when they are
+        # subdivided, following the triangles of these arrays
+        self.mesh_arrays = MeshArrays(
+            *get_triangulation(selected_obj.data))
+        self.vert_slots = dict()
+
+        # Touched every time the working mesh is modified so the
+        # geodesic solver can be reused while the mesh stays the same
+        self.geometry = MeshArraysGeometry(self.mesh_arrays)
+        self.backend = get_backend(get_prefs().settings.geodesic_backend)
+        self.solver_cache = self.backend.create_cache(self.geometry)
+
+        # While dragging a point the segments are walked along the edges,
+        # a lot cheaper than a geodesic on dense meshes. The positions of
+        # those segments are kept to compute them properly on release.
+        # Backends that can't be patched would be built again for every
+        # move, their drags are always previewed
+        self.preview_backend = None
+        if get_prefs().settings.drag_preview or \
+                not is_patchable(self.backend):
+            self.preview_backend = get_backend(PREVIEW_BACKEND)
+            self.preview_cache = self.preview_backend.create_cache(
+                self.geometry)
+        self.preview_segments = set()
 
         self.key_verts = []
         self.path_segments = []
 
+        # Length of every segment and of the whole path, kept up to date
+        # by the methods that insert, replace and remove segments
+        self.segment_lengths = []
+        self.total_length = 0.
+
+        # World space points of the whole path, segment i is
+        # path_buffer[path_offsets[i]:path_offsets[i+1]]. Transformed
+        # segments are kept by identity, segments are always replaced
+        # and never modified in place
+        self.path_buffer = np.empty((0, 3))
+        self.path_offsets = np.zeros(1, dtype=np.int64)
+        self.path_key = None
+        self.world_segments = dict()
+        self.world_matrix = None
+
+        # While set, segments to recompute are collected here by
+        # position instead of being computed on the spot
+        self.deferred_segments = None
+
         self.point_size = 8
         self.circle_radius = 8
         self.point_color = (1, 0, 0, 1)
@@ -50,6 +108,12 @@ class GeoPath(object):
 
         self.distance_threshold = 0.006
 
+        # Spatial indices for hovering key points and segments.
+        # Key vertices are keyed along with their location, BMesh can
+        # hand out a removed vertex again for a new one
+        self.key_index = PointGrid(self.distance_threshold)
+        self.path_index = PathIndex()
+
         # geos, fixed, close, far
         self.hover_point_index = None
         self.selected_point_index = None
@@ -62,13 +126,11 @@ class GeoPath(object):
 
     def click_add_point(self, context, x, y):
 
-        hit, hit_location, face_ind = self.raycast(context, x, y)
+        hit, hit_location, hit_face = self.raycast(context, x, y)
 
         if not hit:
             return
 
-        hit_face = self.bme.faces[face_ind]
-
         vert = self.decide_vert_from_face(hit_location, hit_face,
                                           self.distance_threshold*0.5)
 
@@ -80,14 +142,9 @@ class GeoPath(object):
         #  The elements just before the ones we just pushed
         start_vert = self.key_verts[-2]
 
-        path = geodesic_walk(
-            self.bme,
-            start_vert.index,
-            vert.index,
-            self.selected_obj.data
-        )
+        path = self.compute_geodesic(start_vert, vert)
 
-        self.path_segments.append(path)
+        self.insert_segment(len(self.path_segments), path)
 
     def grab_mouse_move(self, context, x, y):
 
@@ -95,7 +152,7 @@ class GeoPath(object):
         if len(self.path_segments) == 0:
             return
 
-        hit, hit_loc, face_ind = self.raycast(context, x, y)
+        hit, hit_loc, hit_face = self.raycast(context, x, y)
 
         if not hit:
             self.grab_cancel()
@@ -114,30 +171,30 @@ class GeoPath(object):
         # it means we might make a mess if we carry on
         # we won't do any changes
         if any(x != vert_moving and x in self.key_verts
-               for x in self.bme.faces[face_ind].verts):
+               for x in hit_face.verts):
             # print("I won't do any grabbing, bye!")
             return
 
         # Before deciding, try undoing
         if self.try_undo_subdivision(vert_moving) is True:
             # We'll need to do another raycast to get the new hit face
-            hit, hit_loc, face_ind = self.raycast(context, x, y)
+            hit, hit_loc, hit_face = self.raycast(context, x, y)
 
         new_vert = self.decide_vert_from_face(
-            hit_loc, self.bme.faces[face_ind],
-            self.distance_threshold)
+            hit_loc, hit_face, self.distance_threshold)
 
         # I have a segment before point
         if point_pos > 0:
             start_vert = self.key_verts[point_pos-1]
             self.redo_geodesic_segment(
-                point_pos-1, start_vert, new_vert)
+                point_pos-1, start_vert, new_vert, preview=True)
 
-        # I have a segment after point
+        # I have a segment after point, walked from the key point that
+        # stays put so backends keeping its distance field reuse it
         if point_pos < len(self.key_verts)-1:
             end_vert = self.key_verts[point_pos+1]
             self.redo_geodesic_segment(
-                point_pos, new_vert, end_vert)
+                point_pos, new_vert, end_vert, preview=True, from_end=True)
 
         # Finally move the key_point
         self.key_verts[point_pos] = new_vert
@@ -158,6 +215,8 @@ class GeoPath(object):
         self.hover_point_index = None
         self.selected_point_index = None
 
+        self.refine_segments()
+
         return
 
     def grab_finish(self):
@@ -167,11 +226,13 @@ class GeoPath(object):
 
         self.selected_point_index = None
 
+        self.refine_segments()
+
         return
 
     def erase_mouse_move(self, context, x, y):
 
-        hit, hit_loc, face_ind = self.raycast(context, x, y)
+        hit, hit_loc, hit_face = self.raycast(context, x, y)
 
         if not hit:
             context.window.cursor_set("DEFAULT")
@@ -193,19 +254,15 @@ class GeoPath(object):
         self.hover_point_index = None
 
         # I have a segment before point
-        segment_before = None
-        if point_pos > 0:
-            segment_before = self.path_segments[point_pos-1]
+        segment_before = point_pos > 0
 
         # I have a segment after point
-        segment_after = None
-        if point_pos < len(self.key_verts)-1:
-            segment_after = self.path_segments[point_pos]
+        segment_after = point_pos < len(self.key_verts)-1
 
-        if segment_before:
-            self.path_segments.remove(segment_before)
         if segment_after:
-            self.path_segments.remove(segment_after)
+            self.remove_segment(point_pos)
+        if segment_before:
+            self.remove_segment(point_pos-1)
 
         # Remove position from keypoints
         self.key_verts.pop(point_pos)
@@ -215,7 +272,7 @@ class GeoPath(object):
             start_vert = self.key_verts[point_pos-1]
             end_vert = self.key_verts[point_pos]
             # Recreate the position
-            self.path_segments.insert(point_pos-1, [])
+            self.insert_segment(point_pos-1, [])
             self.redo_geodesic_segment(
                 point_pos-1, start_vert, end_vert)
 
@@ -226,7 +283,7 @@ class GeoPath(object):
 
     def insert_mouse_move(self, context, x, y):
 
-        hit, hit_loc, face_ind = self.raycast(context, x, y)
+        hit, hit_loc, hit_face = self.raycast(context, x, y)
 
         if not hit:
             self.insert_cursor_info = None
@@ -235,7 +292,7 @@ class GeoPath(object):
             context.window.cursor_set("DEFAULT")
             return
 
-        self.insert_cursor_info = (hit_loc, self.bme.faces[face_ind])
+        self.insert_cursor_info = (hit_loc, hit_face)
         context.window.cursor_set("NONE")
 
         if self.insert_vert is None:
@@ -253,11 +310,11 @@ class GeoPath(object):
         # the inserted point
         if self.try_undo_subdivision(self.insert_vert) is True:
             # We'll need to do another raycast to get the new hit face
-            hit, hit_loc, face_ind = self.raycast(context, x, y)
+            hit, hit_loc, hit_face = self.raycast(context, x, y)
 
         # establish the key point
         new_vert = self.decide_vert_from_face(
-            hit_loc, self.bme.faces[face_ind], self.distance_threshold)
+            hit_loc, hit_face, self.distance_threshold)
 
         # Reassign key point
         self.key_verts[self.insert_segment_index+1] = \
@@ -270,7 +327,7 @@ class GeoPath(object):
         # Recreate the segment
         self.redo_geodesic_segment(
             self.insert_segment_index,
-            start_vert, end_vert)
+            start_vert, end_vert, preview=True)
 
         # Second segment locations
         start_vert = \
@@ -279,10 +336,10 @@ class GeoPath(object):
         end_vert = \
             self.key_verts[self.insert_segment_index+2]
 
-        # Recreate the segment
+        # Recreate the segment from the key point that stays put
         self.redo_geodesic_segment(
             self.insert_segment_index+1,
-            start_vert, end_vert)
+            start_vert, end_vert, preview=True, from_end=True)
 
     def insert_start(self):
 
@@ -305,7 +362,7 @@ class GeoPath(object):
             return
 
         # Add new segment
-        self.path_segments.insert(self.insert_segment_index, [])
+        self.insert_segment(self.insert_segment_index, [])
 
         # First segment locations
         start_vert = self.key_verts[self.insert_segment_index]
@@ -314,7 +371,7 @@ class GeoPath(object):
         # Recreate the position
         self.redo_geodesic_segment(
             self.insert_segment_index,
-            start_vert, end_vert)
+            start_vert, end_vert, preview=True)
 
         # Add the new key_point
         self.key_verts.insert(self.insert_segment_index+1,
@@ -327,7 +384,7 @@ class GeoPath(object):
         # Recreate the geodesic path on next segment
         self.redo_geodesic_segment(
             self.insert_segment_index+1,
-            start_vert, end_vert)
+            start_vert, end_vert, preview=True)
 
         # Set vertex property that will remain
         # until we release the mouse button
@@ -337,11 +394,13 @@ class GeoPath(object):
         self.insert_cursor_info = None
         self.insert_segment_index = None
         self.insert_vert = None
+        self.refine_segments()
 
     def insert_cancel(self, context):
         self.insert_cursor_info = None
         self.insert_segment_index = None
         self.insert_vert = None
+        self.refine_segments()
         context.window.cursor_set("DEFAULT")
 
     def toggle_debugging(self):
@@ -349,52 +408,127 @@ class GeoPath(object):
 
     def get_segment_point_intersection(self, hit_loc, epsilon):
 
-        # Find closest segment to point
-        segment_index = self.get_closest_segment_index(
-            hit_loc, self.path_segments)
+        # Only the segments that changed since the last call are indexed
+        self.path_index.update(self.path_segments)
 
-        # Within that segment, look for the closest subsegment
-        # We'll create the subsegment zipping pair by pair
-        segment = self.path_segments[segment_index]
-        inner_segment_index = self.get_closest_segment_index(
-            hit_loc, list(zip(segment[:-1], segment[1:])))
+        closest = self.path_index.find_closest(hit_loc, epsilon)
 
-        segment_distance = self.point_segment_distance(
-            hit_loc, segment[inner_segment_index],
-            segment[inner_segment_index+1])
+        if closest is None:
+            return None
 
-        # If the distance is very close
-        # we can safely assume we're in the segment
-        if (segment_distance <= epsilon):
-            return segment_index
+        segment_index, _ = closest
 
-        return None
+        return segment_index
 
-    def get_closest_segment_index(self, hit_loc, segment_list):
+    def redo_geodesic_segment(self, segment_pos, start_vert, end_vert,
+                              preview=False, from_end=False):
 
-        distances = list(map(lambda x:
-                             self.point_segment_distance(hit_loc, x[0], x[-1]),
-                             segment_list))
+        preview = preview and self.preview_backend is not None
 
-        index_min = min(range(len(distances)), key=distances.__getitem__)
+        if preview:
+            self.preview_segments.add(segment_pos)
+        else:
+            self.preview_segments.discard(segment_pos)
 
-        return index_min
+        if self.deferred_segments is not None:
+            self.deferred_segments[segment_pos] = \
+                (start_vert, end_vert, preview, from_end)
+            return
 
-    def point_segment_distance(self, point, segment_start, segment_end):
-        return (point - (intersect_point_line(point,
-                                              segment_start,
-                                              segment_end)[0])).length
+        path = self.compute_geodesic(start_vert, end_vert, preview,
+                                     from_end)
 
-    def redo_geodesic_segment(self, segment_pos,
-                              start_vert, end_vert):
+        self.set_segment(segment_pos, path)
 
-        path = geodesic_walk(
-            self.bme,
-            start_vert.index,
-            end_vert.index,
-            self.selected_obj.data)
+    def insert_segment(self, segment_pos, path):
+
+        length = get_path_length(path)
+
+        self.path_segments.insert(segment_pos, path)
+        self.segment_lengths.insert(segment_pos, length)
+        self.total_length += length
+
+    def set_segment(self, segment_pos, path):
+
+        length = get_path_length(path)
 
         self.path_segments[segment_pos] = path
+        self.total_length += length - self.segment_lengths[segment_pos]
+        self.segment_lengths[segment_pos] = length
+
+    def remove_segment(self, segment_pos):
+
+        self.path_segments.pop(segment_pos)
+        self.total_length -= self.segment_lengths.pop(segment_pos)
+
+        # Don't let rounding errors pile up on an empty path
+        if not self.segment_lengths:
+            self.total_length = 0.
+
+    def refine_segments(self):
+        '''
+        Computes the geodesic of the segments previewed during a drag.
+        Two of them sharing a key point are walked together from it
+        when the backend can walk to several ends at once
+        '''
+        positions = sorted(self.preview_segments)
+
+        if self.deferred_segments is not None or \
+                not hasattr(self.backend, 'geodesic_walks'):
+            for segment_pos in positions:
+                self.redo_geodesic_segment(
+                    segment_pos,
+                    self.key_verts[segment_pos],
+                    self.key_verts[segment_pos+1])
+            return
+
+        while positions:
+            segment_pos = positions.pop(0)
+
+            if not positions or positions[0] != segment_pos + 1:
+                self.redo_geodesic_segment(
+                    segment_pos,
+                    self.key_verts[segment_pos],
+                    self.key_verts[segment_pos+1])
+                continue
+
+            positions.pop(0)
+            before, shared, after = \
+                self.key_verts[segment_pos:segment_pos+3]
+
+            paths = self.backend.geodesic_walks(
+                self.bme,
+                self.get_vert_slot(shared),
+                [self.get_vert_slot(before), self.get_vert_slot(after)],
+                cache=self.solver_cache)
+
+            self.preview_segments.discard(segment_pos)
+            self.preview_segments.discard(segment_pos + 1)
+            self.set_segment(segment_pos, paths[0][::-1])
+            self.set_segment(segment_pos + 1, paths[1])
+
+    def compute_geodesic(self, start_vert, end_vert, preview=False,
+                         from_end=False):
+        '''
+        from_end - walks from the end and reverses the path,
+        the same path unless the backend is approximate
+        '''
+        backend, cache = self.backend, self.solver_cache
+        if preview:
+            backend, cache = self.preview_backend, self.preview_cache
+
+        if from_end:
+            return backend.geodesic_walk(
+                self.bme,
+                self.get_vert_slot(end_vert),
+                self.get_vert_slot(start_vert),
+                cache=cache)[::-1]
+
+        return backend.geodesic_walk(
+            self.bme,
+            self.get_vert_slot(start_vert),
+            self.get_vert_slot(end_vert),
+            cache=cache)
 
     def draw(self, context, plugin_state):
 
@@ -450,9 +584,44 @@ class GeoPath(object):
                                     self.debug_color)
 
     def get_whole_path(self):
-        mx = self.selected_obj.matrix_world
-        return reduce(lambda a, b: a + [mx @ point for point in b],
-                      self.path_segments, [])
+        '''
+        returns - (N,3) world space points of the path,
+        shared with the cache so it must not be modified
+        '''
+        matrix = np.array(self.selected_obj.matrix_world, dtype=np.float64)
+
+        if self.world_matrix is None or \
+                not np.array_equal(matrix, self.world_matrix):
+            self.world_matrix = matrix
+            self.world_segments.clear()
+            self.path_key = None
+
+        path_key = [id(s) for s in self.path_segments]
+
+        if path_key == self.path_key:
+            return self.path_buffer
+
+        world_segments = dict()
+        for segment in self.path_segments:
+            cached = self.world_segments.get(id(segment))
+            if cached is None:
+                points = np.array(segment, dtype=np.float64).reshape(-1, 3)
+                points = points @ matrix[:3, :3].T + matrix[:3, 3]
+                cached = (segment, points)
+            world_segments[id(segment)] = cached
+
+        # Holding the segments keeps their ids from being reused
+        self.world_segments = world_segments
+        self.path_key = path_key
+
+        buffers = [world_segments[k][1] for k in path_key]
+        self.path_offsets = np.concatenate(
+            ([0], np.cumsum([len(b) for b in buffers], dtype=np.int64)))
+        self.path_buffer = np.concatenate(buffers) if buffers \
+            else np.empty((0, 3))
+        self.path_buffer.flags.writeable = False
+
+        return self.path_buffer
 
     def raycast(self, context, x, y):
 
@@ -466,26 +635,54 @@ class GeoPath(object):
         res, loc, normal, face_ind, object, matrix = context.scene.ray_cast(
             context.view_layer.depsgraph, origin, direction)
 
-        return res, self.selected_obj.matrix_world.inverted() @ loc, face_ind
+        if not res:
+            return res, loc, None
+
+        loc = self.selected_obj.matrix_world.inverted() @ loc
+
+        return res, loc, self.get_polygon_face(face_ind, loc)
+
+    def get_polygon_face(self, polygon_index, point):
+        '''
+        Face of the working mesh under the point of a polygon
+        of the original mesh
+        '''
+        faces = self.polygon_faces.get(polygon_index)
+
+        if faces is None:
+            return self.original_faces[polygon_index]
+
+        return self.closest_face(faces, point)
 
     def find_keypoint_hover(self, point):
 
         self.hover_point_index = None
 
-        selected_keypoints = list(
-            filter(lambda x: (x.co-point).length <= self.distance_threshold,
-                   self.key_verts)
-        )
+        self.update_key_index()
+
+        selected_keypoints = [
+            vert for (vert, _), _ in self.key_index.query(
+                point, self.distance_threshold)]
 
         if selected_keypoints:
-            self.hover_point_index = \
-                self.key_verts.index(selected_keypoints[0])
+            positions = {v: i for i, v in enumerate(self.key_verts)}
+            self.hover_point_index = min(
+                positions[v] for v in selected_keypoints)
+
+    def update_key_index(self):
+
+        keys = {(v, v.co.to_tuple()) for v in self.key_verts}
+
+        for key in [k for k in self.key_index.keys() if k not in keys]:
+            self.key_index.remove(key)
+
+        for key in keys:
+            if key not in self.key_index:
+                self.key_index.add(key, key[1])
 
     def decide_vert_from_face(self, point: Vector,
                               face: BMFace, epsilon):
 
-        bm = self.bme
-
         # Case 1: If any of the verts in the face is close enough,
         # start from that vert
         distances = list(map(lambda x: (x.co-point).length,
@@ -496,6 +693,9 @@ class GeoPath(object):
             # print("Case 1: Vertex close enough")
             return face.verts[index_min]
 
+        # Any other case subdivides a triangle
+        face = self.triangulate_face(face, point)
+
         # Case 2: Am I close enough to an edge?
         # Create a vertex of the collision point
         # Create four faces out of the 2 we have connecting to the new vertex
@@ -506,95 +706,181 @@ class GeoPath(object):
 
         if distances[index_min] <= epsilon:
             edge = face.edges[index_min]
-            new_vert = bm.verts.new(point)
-            faces = list(edge.link_faces)
-            for f in faces:
-                opposed_vert = [v for v in f.verts if v not in edge.verts][0]
-                bm.faces.remove(f)
-                for vert in edge.verts:
-                    create_face_with_ccw_normal(
-                        bm, new_vert, vert, opposed_vert)
+            for f in list(edge.link_faces):
+                self.triangulate_face(f)
+
+            new_vert = self.new_vert(point)
+            edge_verts = list(edge.verts)
+            removed = []
+            for f in list(edge.link_faces):
+                # Same winding as the face so the normals don't flip
+                loop_verts = [loop.vert for loop in f.loops]
+                origin = self.get_face_origin(f)
+                removed.append(self.remove_face(f))
+                for tri in split_tri_edge(loop_verts, edge_verts, new_vert):
+                    self.new_face(tri, origin)
 
             # Store undo of vertex
             self.sub_vert_undo[new_vert] = (
                 Geodesic_Subdivide.EDGE,
-                (edge.verts[0], edge.verts[1])
+                (removed, (list(edge.verts), edge.seam, edge.smooth))
             )
 
-            bm.edges.remove(edge)
+            self.bme.edges.remove(edge)
 
-            self.save_bm_to_object()
+            self.geometry.touch()
 
             # print("Case 2: Edge was close enough")
             return new_vert
 
         # Case 3: If not case 1 or 2
         # Create 3 faces out of the old one, all connecting to the collision
-        new_vert = bm.verts.new(point)
-        for e in face.edges:
-            create_face_with_ccw_normal(
-                bm, e.verts[0], e.verts[1], new_vert)
+        new_vert = self.new_vert(point)
+        origin = self.get_face_origin(face)
+        loop_verts = [loop.vert for loop in face.loops]
+        for tri in split_tri(loop_verts, new_vert):
+            self.new_face(tri, origin)
 
-        bm.faces.remove(face)
+        removed = [self.remove_face(face)]
 
-        self.save_bm_to_object()
+        self.geometry.touch()
 
         # Store undo of vertex
         self.sub_vert_undo[new_vert] = (
             Geodesic_Subdivide.FACE,
-            (None)
+            (removed, None)
         )
 
         # print("Case 3: Collision was quite at the center")
         return new_vert
 
-    def save_bm_to_object(self):
-        self.bme.verts.ensure_lookup_table()
-        self.bme.edges.ensure_lookup_table()
-        self.bme.faces.ensure_lookup_table()
+    def triangulate_face(self, face, point=None):
+        '''
+        Splits a polygon in the triangles the solver has for it
+
+        returns - the face itself if it was a triangle, otherwise
+        the triangle closest to point
+        '''
+        if len(face.verts) == 3:
+            return face
+
+        arrays = self.mesh_arrays
+        verts = {self.get_vert_slot(v): v for v in face.verts}
+        loops = {loop.vert: loop for loop in face.loops}
+
+        tris = sorted({t for v in verts for t in arrays.get_vert_tris(v)
+                       if arrays.tri_alive[t]
+                       and set(arrays.tris[t].tolist()) <= verts.keys()})
+
+        origin = self.get_face_origin(face)
+
+        new_faces = []
+        for t in tris:
+            tri = self.bme.faces.new(
+                [verts[v] for v in arrays.tris[t].tolist()])
+            tri.copy_from(face)
+            for loop in tri.loops:
+                loop.copy_from(loops[loop.vert])
+            self.add_face_origin(tri, origin)
+            new_faces.append(tri)
+
+        self.forget_face(face)
+        self.bme.faces.remove(face)
 
-        # Update objects back
-        current_mode = bpy.context.object.mode
-        bpy.ops.object.mode_set(mode='OBJECT')
-        self.bme.to_mesh(self.selected_obj.data)
-        self.selected_obj.data.update()
-        bpy.ops.object.mode_set(mode=current_mode)
+        if point is None:
+            return None
+
+        return self.closest_face(new_faces, point)
+
+    def closest_face(self, faces, point):
+        return min(faces, key=lambda f: (point - closest_point_on_tri(
+            point, *[v.co for v in f.verts])).length)
 
     def try_undo_subdivision(self, in_vert):
 
         if in_vert not in self.sub_vert_undo:
             return False  # There was not subdivision
 
-        action, args = self.sub_vert_undo[in_vert]
+        self.undo_subdivision(in_vert)
+        self.geometry.touch()
+        return True
+
+    def undo_subdivision(self, in_vert):
+
+        action, (removed, edge) = self.sub_vert_undo.pop(in_vert)
+
+        for face in list(in_vert.link_faces):
+            self.remove_face(face)
+        for e in list(in_vert.link_edges):
+            self.bme.edges.remove(e)
+
+        self.remove_vert(in_vert)
+
+        # Bring back the faces we replaced as they were
+        for record in removed:
+            self.restore_face(record)
 
         if action is Geodesic_Subdivide.EDGE:
-            # Verts composing the original edge
-            vert1, vert2 = args
-            verts = [e.other_vert(in_vert) for e in in_vert.link_edges]
-            faces = list(in_vert.link_faces)
-            edges = list(in_vert.link_edges)
-            for face in faces:
-                self.bme.faces.remove(face)
-            for edge in edges:
-                self.bme.edges.remove(edge)
-            for vert in [v for v in verts if v not in {vert1, vert2}]:
-                create_face_with_ccw_normal(self.bme, vert1, vert2, vert)
-
-        elif action is Geodesic_Subdivide.FACE:
-            verts = [e.other_vert(in_vert) for e in in_vert.link_edges]
-            faces = list(in_vert.link_faces)
-            edges = list(in_vert.link_edges)
-            for face in faces:
-                self.bme.faces.remove(face)
-            for edge in edges:
-                self.bme.edges.remove(edge)
-            create_face_with_ccw_normal(
-                self.bme, verts[0], verts[1], verts[2])
-
-        self.sub_vert_undo.pop(in_vert)
-        self.bme.verts.remove(in_vert)
-        self.save_bm_to_object()
-        return True
+            verts, seam, smooth = edge
+            e = self.bme.edges.get(verts)
+            e.seam = seam
+            e.smooth = smooth
+
+    def new_vert(self, co):
+        vert = self.bme.verts.new(co)
+        self.vert_slots[vert] = self.mesh_arrays.add_vert(co)
+        return vert
+
+    def remove_vert(self, vert):
+        self.mesh_arrays.remove_vert(self.vert_slots.pop(vert))
+        self.bme.verts.remove(vert)
+
+    def new_face(self, verts, origin):
+        '''
+        verts - vertices in the order of the loops, the winding of the
+        face it replaces so patched solvers find it consistent
+        '''
+        face = self.bme.faces.new(verts)
+        face.loops.index_update()
+        self.mesh_arrays.add_tri(*[self.get_vert_slot(v) for v in face.verts])
+        self.add_face_origin(face, origin)
+        return face
+
+    def remove_face(self, face):
+        '''
+        returns - the record to restore the face
+        '''
+        record = (capture_face(self.bme, face), self.get_face_origin(face))
+        self.mesh_arrays.remove_tri(
+            *[self.get_vert_slot(v) for v in face.verts])
+        self.forget_face(face)
+        self.bme.faces.remove(face)
+        return record
+
+    def restore_face(self, record):
+        face_record, origin = record
+        face = restore_face(self.bme, face_record)
+        self.mesh_arrays.add_tri(*[self.get_vert_slot(v) for v in face.verts])
+        self.add_face_origin(face, origin)
+        return face
+
+    def get_face_origin(self, face):
+        '''
+        returns - index of the polygon of the original mesh
+        the face comes from
+        '''
+        return self.face_origin.get(face, face.index)
+
+    def add_face_origin(self, face, origin):
+        self.face_origin[face] = origin
+        self.polygon_faces.setdefault(origin, set()).add(face)
+
+    def forget_face(self, face):
+        origin = self.face_origin.pop(face, face.index)
+        self.polygon_faces.setdefault(origin, set()).discard(face)
+
+    def get_vert_slot(self, vert):
+        return self.vert_slots.get(vert, vert.index)
 
     def point_edge_distance(self, point, edge):
         return (point - (intersect_point_line(point,
@@ -603,10 +889,18 @@ class GeoPath(object):
                 ).length
 
     def finish(self):
+        # The object was never modified, nothing to revert
         self.bme.free()
-        self.bme = self.original_bme
-        self.save_bm_to_object()
-        self.bme.free()
+
+
+def get_path_length(path) -> float:
+
+    if len(path) < 2:
+        return 0.
+
+    points = np.array(path, dtype=np.float64).reshape(-1, 3)
+
+    return float(np.linalg.norm(np.diff(points, axis=0), axis=1).sum())
 
 
 class Geodesic_State(Enum):
@@ -1,13 +1,15 @@
-from bmesh.types import BMesh
 import bpy
 import bmesh
 import traceback
 import math
+import numpy as np
 
 from mathutils import Euler, Matrix, Vector
-from ..utility.draw import draw_messages
+from ..algorithms.cross_section import CrossSection, \
+    get_closest_contour, get_hull_lengths, trace_contours
+from ..utility.draw import draw_messages, draw_polyline_from_3dpoints
 from ..utility.ray import mouse_raycast_to_scene
-from functools import reduce
+from ..utility.triangulation import get_triangulation
 
 
 class MEASURES_CIRCULAR_OT(bpy.types.Operator):
@@ -28,6 +30,12 @@ class MEASURES_CIRCULAR_OT(bpy.types.Operator):
         subtype='EULER',
         min=-2*math.pi, max=2*math.pi
     )
+    tape_measure: bpy.props.BoolProperty(
+        name="Tape Measure",
+        description="Measure the convex hull of the loop, "
+        "like a tape bridging its concavities",
+        default=False
+    )
 
     @classmethod
     def poll(cls, context):
@@ -44,17 +52,26 @@ class MEASURES_CIRCULAR_OT(bpy.types.Operator):
         self.height = 0
         self.hit_point = None
         self.total_length = 0
-
-        self.bm = bmesh.new()
-        self.bm.from_object(
-            context.object,  # default to selected object
-            context.evaluated_depsgraph_get()
-        )
-        bmesh.ops.transform(
-            self.bm,
-            verts=self.bm.verts,
-            matrix=context.object.matrix_world
-        )
+        self.tape_length = 0
+        self.plane_no = None
+        self.contours = []
+        self.tape_lengths = np.zeros(0)
+        self.contour_index = None
+        self.line_color = (.2, .1, .8, 1)
+        self.tape_color = (1, 1, 0, 1)
+        self.line_thickness = 3
+
+        # The evaluated mesh is read straight into arrays and kept
+        # that way to cut it without copying it
+        obj = context.object.evaluated_get(
+            context.evaluated_depsgraph_get())
+        verts, tris = get_triangulation(obj.to_mesh())
+        obj.to_mesh_clear()
+
+        matrix = np.array(context.object.matrix_world)
+        verts = verts @ matrix[:3, :3].T + matrix[:3, 3]
+
+        self.cross_section = CrossSection(verts, tris)
 
         # Do some setup
         self.draw_handle = bpy.types.SpaceView3D.draw_handler_add(
@@ -72,8 +89,11 @@ class MEASURES_CIRCULAR_OT(bpy.types.Operator):
         }:
             return {'PASS_THROUGH'}
 
-        # Confirm
+        # Confirm, the object is only created now
         elif event.type == 'LEFTMOUSE' and event.value == 'PRESS':
+            if self.contour_index is not None:
+                self.create_bisect_object(
+                    context, self.contours[self.contour_index])
             self.remove_shaders(context)
             return {'FINISHED'}
 
@@ -82,6 +102,10 @@ class MEASURES_CIRCULAR_OT(bpy.types.Operator):
             self.remove_shaders(context)
             return {'CANCELLED'}
 
+        # Switch between the loop and the tape around it
+        elif event.type == 'T' and event.value == 'PRESS':
+            self.tape_measure = not self.tape_measure
+
         # Adjust
         elif event.type == 'MOUSEMOVE':
 
@@ -91,7 +115,7 @@ class MEASURES_CIRCULAR_OT(bpy.types.Operator):
             if hit:
                 self.height = location.z
                 self.hit_point = location
-                self.execute(context)
+                self.update_section()
 
         context.area.tag_redraw()
         return {'RUNNING_MODAL'}
@@ -101,9 +125,22 @@ class MEASURES_CIRCULAR_OT(bpy.types.Operator):
         layout.use_property_split = True
         layout.prop(self, 'height')
         layout.prop(self, 'normal_rotation')
+        layout.prop(self, 'tape_measure')
 
     def execute(self, context):
 
+        self.update_section()
+
+        # Could be that the angle of plane finds
+        # no vertices after bisection
+        if self.contour_index is not None:
+            self.create_bisect_object(
+                context, self.contours[self.contour_index])
+
+        return {'FINISHED'}
+
+    def update_section(self):
+
         rotation = Matrix()
 
         if self.normal_rotation != Euler():
@@ -114,71 +151,46 @@ class MEASURES_CIRCULAR_OT(bpy.types.Operator):
             plane_co.z = self.height
 
         plane_no = rotation @ Vector((0, 0, 1))
-        bm = self.bm.copy()
 
         # Perform bisection
-        bmesh.ops.bisect_plane(
-            bm,
-            geom=bm.faces[:] + bm.edges[:] + bm.verts[:],
-            clear_inner=True,
-            clear_outer=True,
-            plane_co=plane_co,
-            plane_no=plane_no
-        )
-
-        # Bisection cleanup
-        closest_edge = self.find_closest_edge(bm, self.hit_point)
-
-        # Could be that the angle of plane finds
-        # no vertices after bisection
-        if closest_edge is not None:
-            vertex_list = self.get_reachable_vertices(closest_edge)
-            for v in [v for v in bm.verts if v not in vertex_list]:
-                bm.verts.remove(v)
-
-            # Object creation and addition to scene
-            bisect_obj = bpy.data.objects.get("Bisect")
-            if bisect_obj is not None:
-                bpy.data.objects.remove(bisect_obj, do_unlink=True)
-
-            me = bpy.data.meshes.new("Bisect")
-            bm.to_mesh(me)
-            ob = bpy.data.objects.new("Bisect", me)
-            context.collection.objects.link(ob)
-            ob.select_set(True)
+        points, segments = self.cross_section.slice(plane_co, plane_no)
+
+        # Every loop of the section, the one the mouse is on is kept
+        self.contours = trace_contours(points, segments)
+        self.contour_index = get_closest_contour(
+            self.contours, self.hit_point)
+
+        # Tape lengths of all the loops in one pass
+        self.tape_lengths = get_hull_lengths(self.contours, plane_no)
+
+        if self.contour_index is not None:
+            contour = self.contours[self.contour_index]
+            self.total_length = contour.length
+            self.tape_length = self.tape_lengths[self.contour_index]
+            self.plane_no = plane_no
+
+    def create_bisect_object(self, context, contour):
+
+        points, closed = contour.points, contour.closed
+        if self.tape_measure:
+            points, closed = contour.get_hull(self.plane_no), True
+
+        bm = bmesh.new()
+        verts = [bm.verts.new(p) for p in points.tolist()]
+        for i in range(1, len(verts)):
+            bm.edges.new((verts[i-1], verts[i]))
+        if closed:
+            bm.edges.new((verts[-1], verts[0]))
+
+        # Object creation and addition to scene
+        me = bpy.data.meshes.new("Bisect")
+        bm.to_mesh(me)
+        ob = bpy.data.objects.new("Bisect", me)
+        context.collection.objects.link(ob)
+        ob.select_set(True)
 
         bm.free()
 
-        return {'FINISHED'}
-
-    def get_reachable_vertices(self, closest_edge):
-        edge_list = [closest_edge]
-        vertex_list = [v for v in closest_edge.verts]
-        for v in vertex_list:
-            for e in [edge for edge in v.link_edges if edge not in edge_list]:
-                edge_list.append(e)
-                if (e.other_vert(v) not in vertex_list):
-                    vertex_list.append(e.other_vert(v))
-
-        self.total_length = reduce(
-            lambda a, b: a + b.calc_length(), edge_list, 0)
-
-        return vertex_list
-
-    def find_closest_edge(self, bm: BMesh, hit_point: Vector):
-        result = None
-        min_dist = 9999.99
-        for e in bm.edges:
-            for v in e.verts:
-                dist = (v.co - hit_point).magnitude
-                if dist < min_dist:
-                    result = e
-                    min_dist = dist
-                    if min_dist < 0.01:
-                        return e  # If its close enough dont continue iterating
-
-        return result
-
     def remove_shaders(self, context):
         '''Remove shader handle.'''
 
@@ -191,21 +203,53 @@ class MEASURES_CIRCULAR_OT(bpy.types.Operator):
     def safe_draw_shader_2d(self, context):
 
         try:
+            self.draw_contour(context)
             self.draw_debug_panel(context)
         except Exception:
             print("2D Shader Failed in Ray Caster")
             traceback.print_exc()
             self.remove_shaders(context)
 
+    def draw_contour(self, context):
+
+        # The section is only drawn until it's confirmed
+        if self.contour_index is None:
+            return
+
+        contour = self.contours[self.contour_index]
+
+        points = contour.points
+        if contour.closed:
+            points = np.concatenate((points, points[:1]))
+
+        draw_polyline_from_3dpoints(context, points,
+                                    self.line_color, self.line_thickness)
+
+        if self.tape_measure:
+            hull = contour.get_hull(self.plane_no)
+            draw_polyline_from_3dpoints(
+                context, np.concatenate((hull, hull[:1])),
+                self.tape_color, self.line_thickness)
+
     def draw_debug_panel(self, context):
 
         messages = []
 
         # Draw measurement length
         if self.total_length != 0:
-            messages.append(
-                "LENGTH: {:.3f}".format(self.total_length)
-            )
+            message = "LENGTH: {:.3f}".format(self.total_length)
+            if self.tape_measure:
+                message += " | TAPE: {:.3f}".format(self.tape_length)
+            messages.append(message)
+
+        # Lengths of all the loops, the measured one between brackets
+        if len(self.contours) > 1:
+            lengths = [c.length for c in self.contours]
+            if self.tape_measure:
+                lengths = self.tape_lengths.tolist()
+            messages.append("LOOPS: " + ", ".join(
+                ("[{:.3f}]" if i == self.contour_index else "{:.3f}")
+                .format(length) for i, length in enumerate(lengths)))
 
         # Hit point information
         if (self.hit_point):
@@ -1,12 +1,20 @@
-from functools import reduce
 import bpy
 import bmesh
 import traceback
 
 from ..utility.draw import draw_messages
+from ..utility.path_scheduler import PathScheduler, TIMER_STEP
 from ..utility.ray import mouse_raycast_to_scene
 from .geopath_datastructure import GeoPath, Geodesic_State
 
+# Events committing or cancelling what the last mouse moves did, the path
+# is brought up to date before they are handled. Any other event leaves
+# the segments being computed in the background alone
+COMMIT_EVENTS = {
+    ('LEFTMOUSE', 'PRESS'), ('LEFTMOUSE', 'RELEASE'),
+    ('P', 'PRESS'), ('G', 'PRESS'), ('E', 'PRESS'), ('I', 'PRESS')
+}
+
 
 class MEASURES_GEODESIC_OT(bpy.types.Operator):
     bl_label = "Create Geodesic Measure"
@@ -30,27 +38,40 @@ class MEASURES_GEODESIC_OT(bpy.types.Operator):
         # Initialize some props
         self.hit_point = None
         self.geopath = GeoPath(context, context.object)
+        self.scheduler = PathScheduler(self.geopath)
         self.state = Geodesic_State.POINTS
 
         # Do some setup
         self.draw_handle = bpy.types.SpaceView3D.draw_handler_add(
             self.draw_custom_controls, (context,), 'WINDOW', 'POST_PIXEL')
+        self.timer = context.window_manager.event_timer_add(
+            TIMER_STEP, window=context.window)
         context.window_manager.modal_handler_add(self)
         return {"RUNNING_MODAL"}
 
     # Running in loop until we leave the modal
     def modal(self, context, event):
 
+        # Swap in paths computed in the background
+        if event.type == 'TIMER':
+            if self.scheduler.update(context):
+                context.area.tag_redraw()
+            return {'RUNNING_MODAL'}
+
         # Confirm path an exit gracefully
         if event.type == 'RET' and event.value == 'PRESS':
+            self.scheduler.flush(context)
             self.execute(context)
             self.remove_shaders(context)
+            self.remove_timer(context)
             return {'FINISHED'}
 
         # Cancel
         elif event.type in {'RIGHTMOUSE', 'ESC'} and event.value == 'PRESS':
             context.window.cursor_set("DEFAULT")
+            self.scheduler.cancel()
             self.remove_shaders(context)
+            self.remove_timer(context)
             self.geopath.finish()
             return {'CANCELLED'}
 
@@ -66,6 +87,9 @@ class MEASURES_GEODESIC_OT(bpy.types.Operator):
         if event.type == 'MOUSEMOVE':
             self.detect_collision(context, event)
 
+        elif (event.type, event.value) in COMMIT_EVENTS:
+            self.scheduler.flush(context)
+
         # Enable visual debugging
         if event.type == 'SPACE' and event.value == 'PRESS':
             self.geopath.toggle_debugging()
@@ -105,7 +129,7 @@ class MEASURES_GEODESIC_OT(bpy.types.Operator):
 
         if event.type == 'MOUSEMOVE':
             x, y = (event.mouse_region_x, event.mouse_region_y)
-            self.geopath.grab_mouse_move(context, x, y)
+            self.scheduler.push(self.geopath.grab_mouse_move, x, y)
 
         elif event.type == 'LEFTMOUSE' and event.value == 'PRESS':
             self.geopath.grab_start()
@@ -156,7 +180,7 @@ class MEASURES_GEODESIC_OT(bpy.types.Operator):
 
         if event.type == 'MOUSEMOVE':
             x, y = (event.mouse_region_x, event.mouse_region_y)
-            self.geopath.insert_mouse_move(context, x, y)
+            self.scheduler.push(self.geopath.insert_mouse_move, x, y)
 
         elif event.type == 'LEFTMOUSE' and event.value == 'PRESS':
             self.geopath.insert_start()
@@ -193,6 +217,9 @@ class MEASURES_GEODESIC_OT(bpy.types.Operator):
 
     def execute(self, context):
 
+        # Don't keep previews of a drag that didn't finish
+        self.geopath.refine_segments()
+
         path = self.geopath.get_whole_path()
 
         if len(path) == 0:
@@ -201,7 +228,7 @@ class MEASURES_GEODESIC_OT(bpy.types.Operator):
         bm = bmesh.new()
         vertices = []
         edges = []
-        for vert in path:
+        for vert in path.tolist():
             vertices.append(bm.verts.new(vert))
 
         for i in range(1, len(path)):
@@ -228,6 +255,12 @@ class MEASURES_GEODESIC_OT(bpy.types.Operator):
             )
             context.area.tag_redraw()
 
+    def remove_timer(self, context):
+
+        if self.timer is not None:
+            context.window_manager.event_timer_remove(self.timer)
+            self.timer = None
+
     def draw_custom_controls(self, context):
         try:
             self.geopath.draw(context, self.state)
@@ -249,15 +282,8 @@ class MEASURES_GEODESIC_OT(bpy.types.Operator):
         messages.append(mode)
 
         # Path information
-        num_segments = 0
-        total_length = 0
-
-        if len(self.geopath.path_segments) > 0:
-            total_length = reduce(lambda a, b:
-                                  a + self.get_segment_length(b),
-                                  self.geopath.path_segments, 0)
-
-            num_segments = len(self.geopath.path_segments)
+        num_segments = len(self.geopath.path_segments)
+        total_length = self.geopath.total_length
 
         messages.append(
             "#SEGMENTS: {}, LENGTH: {:.3f}".format(
@@ -273,11 +299,3 @@ class MEASURES_GEODESIC_OT(bpy.types.Operator):
             )
 
         draw_messages(context, messages)
-
-    def get_segment_length(self, segment):
-        result = 0
-
-        for i in range(1, len(segment)-1):
-            result += (segment[i-1] - segment[i]).length
-
-        return result
@@ -3,8 +3,6 @@ from ..register.dependency_handling import \
     are_dependencies_installed, get_dependencies,\
     install_and_import_module, install_pip, set_dependency_installed_flag
 
-from ..register import register_dependent_objects
-
 import bpy
 
 
@@ -34,7 +32,6 @@ class MEASURES_OT_Install_Dependencies(bpy.types.Operator):
 
         set_dependency_installed_flag(True)
 
-        # Register the panels, operators, etc. since dependencies are installed
-        register_dependent_objects()
-
+        # Panels and operators are already registered, the backends
+        # needing the dependencies show up in the preferences now
         return {"FINISHED"}
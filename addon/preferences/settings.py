@@ -1,5 +1,6 @@
 import bpy
-from bpy.props import IntProperty
+from bpy.props import BoolProperty, EnumProperty, IntProperty
+from ..algorithms.geodesic_backends import get_backend_items
 
 
 class MEASURES_Settings(bpy.types.PropertyGroup):
@@ -8,6 +9,21 @@ class MEASURES_Settings(bpy.types.PropertyGroup):
         name='Font Size', description='Font Size',
         min=10, max=32, default=24)
 
+    # Dynamic items, the backends needing the dependencies are only
+    # listed once they are installed. When the selected one can't be
+    # imported the property reads empty and the default is used
+    geodesic_backend: EnumProperty(
+        name='Geodesic Backend',
+        description='Algorithm used to compute geodesic paths',
+        items=get_backend_items)
+
+    drag_preview: BoolProperty(
+        name='Preview While Dragging',
+        description='Walk along the edges while a point is dragged '
+        'and compute the geodesic once it is released. Always on '
+        'for Edge Flipping, which is built again for every new point',
+        default=True)
+
 
 def draw_settings(prefs, layout):
 
@@ -18,4 +34,12 @@ def draw_settings(prefs, layout):
 
     row = box.row()
     row.label(text='Font Size')
-    row.prop(prefs.settings, 'font_size', text='Font Size')
\ No newline at end of file
+    row.prop(prefs.settings, 'font_size', text='Font Size')
+
+    row = box.row()
+    row.label(text='Geodesic Backend')
+    row.prop(prefs.settings, 'geodesic_backend', text='')
+
+    row = box.row()
+    row.label(text='Preview While Dragging')
+    row.prop(prefs.settings, 'drag_preview', text='')
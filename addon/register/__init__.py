@@ -1,5 +1,4 @@
 from ..register.dependency_handling import \
-    are_dependencies_installed, \
     import_dependencies, \
     set_dependency_installed_flag
 
@@ -16,12 +15,13 @@ def register_addon():
     from ..panel import register_main_panel
     register_main_panel()
 
+    # Only the compiled geodesic backends need the dependencies,
+    # the tools work with the other ones without them
     try:
         import_dependencies()
         set_dependency_installed_flag(True)
     except ModuleNotFoundError:
         print("Dependencies were not installed...")
-        return
 
     register_dependent_objects()
 
@@ -35,9 +35,6 @@ def unregister_addon():
     from ..panel import unregister_main_panel
     unregister_main_panel()
 
-    if not are_dependencies_installed():
-        return
-
     # Menus
     # from ..menu import unregister_menus
     # unregister_menus()
@@ -115,7 +115,8 @@ def install_and_import_module(module_name, package_name=None, global_name=None):
 
 def show_no_dependencies_warning(layout):
 
-        lines = [f"Please install the missing dependencies for the Measures add-on.",
+        lines = [f"Please install the missing dependencies,",
+            f"the compiled geodesic backends of Measures need them.",
             f"1. Open the preferences (Edit > Preferences > Add-ons).",
             f"2. Search for the Measures Library add-on.",
             f"3. Open the details section of the add-on.",
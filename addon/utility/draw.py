@@ -2,6 +2,7 @@ import bpy
 import blf
 import gpu
 import bgl
+import numpy as np
 
 from math import pi, cos, sin
 from gpu_extras.batch import batch_for_shader
@@ -168,6 +169,9 @@ def get_2d_points(context, points):
     region = context.region
     rv3d = context.space_data.region_3d
 
+    if isinstance(points, np.ndarray):
+        return project_points(region, rv3d, points)
+
     vertices = []
 
     for point in points:
@@ -179,6 +183,24 @@ def get_2d_points(context, points):
     return vertices
 
 
+def project_points(region, rv3d, points):
+    '''
+    Same as location_3d_to_region_2d for a (N,3) array,
+    points behind the view are dropped
+    '''
+    matrix = np.array(rv3d.perspective_matrix, dtype=np.float64)
+
+    clip = points @ matrix[:3, :3].T + matrix[:3, 3]
+    w = points @ matrix[3, :3] + matrix[3, 3]
+
+    visible = w > 0
+    ndc = clip[visible, :2] / w[visible, None]
+
+    half_size = np.array((region.width, region.height)) / 2
+
+    return (half_size * (1 + ndc)).tolist()
+
+
 def circle(x, y, radius, segments):
     coords = []
     m = (1.0 / (segments - 1)) * (pi * 2)
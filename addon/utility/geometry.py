@@ -32,3 +32,35 @@ def get_angle_signed(v1: Vector, v2: Vector, n: Vector) -> float:
         return -angle
     else:
         return 0
+
+
+def capture_face(bm: BMesh, face: BMFace):
+    '''
+    Vertices and attributes of a face, enough to create it again
+    with restore_face once it has been removed
+    '''
+    uvs = [(layer, [loop[layer].uv.copy() for loop in face.loops])
+           for layer in bm.loops.layers.uv.values()]
+    colors = [(layer, [loop[layer].copy() for loop in face.loops])
+              for layer in bm.loops.layers.color.values()]
+
+    return (list(face.verts), face.material_index, face.smooth, uvs, colors)
+
+
+def restore_face(bm: BMesh, record) -> BMFace:
+
+    verts, material_index, smooth, uvs, colors = record
+
+    face = bm.faces.new(verts)
+    face.material_index = material_index
+    face.smooth = smooth
+
+    for layer, values in uvs:
+        for loop, uv in zip(face.loops, values):
+            loop[layer].uv = uv
+
+    for layer, values in colors:
+        for loop, color in zip(face.loops, values):
+            loop[layer] = color
+
+    return face
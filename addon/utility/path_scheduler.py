@@ -0,0 +1,123 @@
+'''
+Created on October 18, 2026
+
+@author: Albert Rodriguez (@UncleFirefox)
+
+Keeps dragging points responsive when the geodesic queries are slower
+than the mouse events.
+
+Mouse moves are not handled as they come, only the last position is kept
+and processed on the next tick of a modal timer. Editing the mesh stays
+on the main thread but the segments it invalidates are computed on a
+worker thread, the previous path is drawn until they are swapped in.
+The mesh is not edited again until the worker is done with it.
+
+'''
+
+import threading
+import traceback
+
+# Seconds between the ticks of the modal timer
+TIMER_STEP = 1 / 60
+
+
+class PathScheduler(object):
+
+    def __init__(self, geopath):
+        self.geopath = geopath
+        self.pending = None
+        self.worker = None
+        self.results = None
+
+    def push(self, mouse_move, x, y):
+        '''
+        mouse_move - method of the GeoPath handling the position
+
+        Positions that weren't processed yet are replaced
+        '''
+        self.pending = (mouse_move, x, y)
+
+    def update(self, context) -> bool:
+        '''
+        Swaps in the segments of a finished worker and
+        processes the last mouse position if it's idle
+
+        returns - True when there is something new to draw
+        '''
+        changed = False
+
+        if self.worker is not None:
+            if self.worker.is_alive():
+                return False
+            changed = self.swap()
+
+        if self.pending is None:
+            return changed
+
+        mouse_move, x, y = self.pending
+        self.pending = None
+
+        self.geopath.deferred_segments = dict()
+        try:
+            mouse_move(context, x, y)
+        finally:
+            segments = self.geopath.deferred_segments
+            self.geopath.deferred_segments = None
+
+        if segments:
+            self.worker = threading.Thread(
+                target=self.compute, args=(segments,), daemon=True)
+            self.worker.start()
+
+        return True
+
+    def flush(self, context):
+        '''
+        Brings the path up to date before anything else
+        touches the mesh, waiting for the worker if needed
+        '''
+        if self.worker is not None:
+            self.worker.join()
+            self.swap()
+
+        if self.pending is None:
+            return
+
+        mouse_move, x, y = self.pending
+        self.pending = None
+
+        mouse_move(context, x, y)
+
+    def cancel(self):
+        self.pending = None
+
+        if self.worker is not None:
+            self.worker.join()
+            self.worker = None
+            self.results = None
+
+    def compute(self, segments):
+
+        results = dict()
+
+        try:
+            for segment_pos, segment in segments.items():
+                results[segment_pos] = self.geopath.compute_geodesic(
+                    *segment)
+        except Exception:
+            print("Failed to compute geodesic segments")
+            traceback.print_exc()
+
+        self.results = results
+
+    def swap(self) -> bool:
+
+        self.worker.join()
+        self.worker = None
+
+        results, self.results = self.results, None
+
+        for segment_pos, path in results.items():
+            self.geopath.set_segment(segment_pos, path)
+
+        return len(results) > 0
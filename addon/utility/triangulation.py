@@ -0,0 +1,63 @@
+from bpy.types import Mesh
+from collections import OrderedDict
+import hashlib
+import numpy as np
+
+# Number of meshes whose triangulation is kept around
+CACHE_SIZE = 4
+
+cache = OrderedDict()
+
+
+def get_triangulation(mesh: Mesh):
+    '''
+    Vertex (N,3) and triangle (M,3) arrays of the mesh,
+    triangles follow the winding of the polygons they come from.
+
+    The result is cached by data-block name and a hash of the geometry
+    so opening the tools again on the same mesh doesn't triangulate it,
+    the arrays are shared and must not be modified.
+    '''
+    verts = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', verts)
+
+    key = (mesh.name, get_geometry_hash(mesh, verts))
+
+    result = cache.get(key)
+
+    if result is not None:
+        cache.move_to_end(key)
+        return result
+
+    mesh.calc_loop_triangles()
+    tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get('vertices', tris)
+
+    result = (verts.astype(np.float64).reshape(-1, 3),
+              tris.astype(np.int64).reshape(-1, 3))
+
+    for arr in result:
+        arr.flags.writeable = False
+
+    cache[key] = result
+    if len(cache) > CACHE_SIZE:
+        cache.popitem(last=False)
+
+    return result
+
+
+def get_geometry_hash(mesh: Mesh, verts: np.ndarray) -> str:
+    '''
+    Hash of the coordinates and the polygons of the mesh
+    '''
+    loops = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get('vertex_index', loops)
+
+    totals = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get('loop_total', totals)
+
+    h = hashlib.blake2b(digest_size=16)
+    for arr in (verts, loops, totals):
+        h.update(arr.tobytes())
+
+    return h.hexdigest()
@@ -0,0 +1,9 @@
+'''
+The algorithm modules only depend on NumPy, they are imported straight
+from the addon folder without going through Blender
+'''
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
@@ -0,0 +1,57 @@
+'''
+Test meshes as (N,3) vertex and (M,3) triangle arrays
+'''
+
+import numpy as np
+
+
+def grid(n: int, jitter: float = 0., seed: int = 0):
+    '''
+    Unit square split in n x n vertices, jitter moves them randomly
+    by up to that fraction of the spacing
+    '''
+    rng = np.random.default_rng(seed)
+
+    xs, ys = np.meshgrid(np.linspace(0, 1, n), np.linspace(0, 1, n),
+                         indexing='ij')
+    verts = np.stack((xs.ravel(), ys.ravel(), np.zeros(n * n)), axis=1)
+    verts[:, :2] += rng.uniform(-jitter, jitter, (n * n, 2)) / (n - 1)
+
+    i, j = np.meshgrid(np.arange(n - 1), np.arange(n - 1), indexing='ij')
+    a = (i * n + j).ravel()
+    b, c, d = a + n, a + n + 1, a + 1
+    tris = np.concatenate((np.stack((a, b, c), axis=1),
+                           np.stack((a, c, d), axis=1)))
+
+    return verts, tris
+
+
+def sphere(radius: float = 1., rings: int = 64, segments: int = 128):
+    '''
+    UV sphere centered at the origin with its poles on the z axis
+    '''
+    theta = np.linspace(0, np.pi, rings + 1)[1:-1]
+    phi = np.linspace(0, 2 * np.pi, segments, endpoint=False)
+    t, p = np.meshgrid(theta, phi, indexing='ij')
+
+    verts = radius * np.stack((np.sin(t) * np.cos(p),
+                               np.sin(t) * np.sin(p),
+                               np.cos(t)), axis=-1)
+    verts = np.concatenate((verts.reshape(-1, 3),
+                            [(0, 0, radius), (0, 0, -radius)]))
+    top, bottom = len(verts) - 2, len(verts) - 1
+
+    ring = np.arange(segments)
+    following = (ring + 1) % segments
+
+    tris = [np.stack((np.full(segments, top), ring, following), axis=1)]
+    for r in range(rings - 2):
+        a, b = r * segments + ring, r * segments + following
+        c, d = a + segments, b + segments
+        tris.append(np.stack((a, c, d), axis=1))
+        tris.append(np.stack((a, d, b), axis=1))
+    last = (rings - 2) * segments
+    tris.append(np.stack((np.full(segments, bottom),
+                          last + following, last + ring), axis=1))
+
+    return verts, np.concatenate(tris)
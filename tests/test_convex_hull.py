@@ -0,0 +1,66 @@
+from itertools import permutations
+
+import numpy as np
+
+from addon.algorithms.cross_section import Contour, convex_hull, \
+    get_hull_lengths
+
+
+def brute_force_hull_edges(points: np.ndarray):
+    '''
+    Directed edges with every other point strictly to their left
+    '''
+    edges = set()
+
+    for i, j in permutations(range(len(points)), 2):
+        edge = points[j] - points[i]
+        offsets = np.delete(points, [i, j], axis=0) - points[i]
+        if (edge[0] * offsets[:, 1] - edge[1] * offsets[:, 0] > 0).all():
+            edges.add((i, j))
+
+    return edges
+
+
+def test_hull_matches_brute_force():
+    rng = np.random.default_rng(4)
+
+    for size in (3, 4, 10, 40, 80):
+        for _ in range(5):
+            points = rng.normal(size=(size, 2))
+            hull = convex_hull(points).tolist()
+
+            edges = set(zip(hull, hull[1:] + hull[:1]))
+            assert edges == brute_force_hull_edges(points)
+
+
+def test_hull_drops_collinear_and_inner_points():
+    square = [(0, 0), (1, 0), (1, 1), (0, 1)]
+    points = np.array(square + [(0.5, 0), (1, 0.5), (0.5, 0.5), (0.2, 0.7)])
+
+    assert sorted(convex_hull(points).tolist()) == [0, 1, 2, 3]
+
+
+def star(center, radius: float, tips: int = 7) -> Contour:
+    angles = np.linspace(0, 2 * np.pi, 2 * tips, endpoint=False)
+    radii = np.where(np.arange(2 * tips) % 2 == 0, radius, radius / 3)
+    points = np.stack((radii * np.cos(angles), radii * np.sin(angles),
+                       np.zeros(2 * tips)), axis=1)
+    return Contour(points + center, True)
+
+
+def test_hull_lengths_bridge_concavities():
+    contours = [star((0, 0, 0), 1.), star((5, 0, 0), 2., 5),
+                Contour(np.zeros((1, 3)), True)]
+
+    lengths = get_hull_lengths(contours, (0, 0, 1))
+
+    for contour, length in zip(contours, lengths):
+        hull = contour.get_hull((0, 0, 1))
+        ends = np.concatenate((hull, hull[:1]))
+        assert np.isclose(
+            length, np.linalg.norm(np.diff(ends, axis=0), axis=1).sum())
+        assert length <= contour.length + 1e-12
+
+    # Perimeter of the polygon of the tips
+    assert np.isclose(lengths[0], 14 * np.sin(np.pi / 7))
+    assert lengths[2] == 0
@@ -0,0 +1,71 @@
+import numpy as np
+
+from addon.algorithms.cross_section import CrossSection, \
+    get_closest_contour, trace_contours
+from meshes import grid, sphere
+
+
+def test_sphere_sections_are_circles():
+    radius = 2.
+    verts, tris = sphere(radius, 128, 256)
+    section = CrossSection(verts, tris)
+
+    for height in (-1.5, -0.4, 0., 0.7, 1.9):
+        contours = trace_contours(*section.slice((0, 0, height), (0, 0, 1)))
+
+        assert len(contours) == 1 and contours[0].closed
+        circle = 2 * np.pi * np.sqrt(radius**2 - height**2)
+        assert np.isclose(contours[0].length, circle, rtol=1e-3)
+
+
+def test_tilted_sections_are_great_circles():
+    verts, tris = sphere()
+    section = CrossSection(verts, tris)
+
+    for normal in ((1, 0, 0), (1, 1, 0), (0.3, -0.2, 1)):
+        contours = trace_contours(*section.slice((0, 0, 0), normal))
+
+        assert len(contours) == 1
+        assert np.isclose(contours[0].length, 2 * np.pi, rtol=2e-3)
+
+
+def test_indexed_slices_match_full_slices():
+    verts, tris = sphere(rings=20, segments=40)
+    section = CrossSection(verts, tris)
+    all_tris = np.arange(len(tris))
+
+    for height in np.linspace(-0.95, 0.95, 9):
+        plane = ((0.1, 0, height), (0.2, 0.1, 1))
+        indexed = trace_contours(*section.slice(*plane))
+        full = trace_contours(*section.slice(*plane, all_tris))
+
+        assert [c.length for c in indexed] == \
+            [c.length for c in full]
+
+
+def test_sections_through_vertices_have_no_gaps():
+    verts, tris = grid(11)
+    section = CrossSection(verts, tris)
+
+    # The plane goes along a row of vertices and edges of the grid
+    points, segments = section.slice((0, 0.5, 0), (0, 1, 0))
+    contours = trace_contours(points, segments)
+
+    assert len(contours) == 1 and not contours[0].closed
+    assert np.isclose(contours[0].length, 1)
+
+
+def test_separate_loops_are_traced_apart():
+    verts, tris = sphere(rings=16, segments=32)
+    shifted = verts + (3, 0, 0)
+    section = CrossSection(np.concatenate((verts, shifted)),
+                           np.concatenate((tris, tris + len(verts))))
+
+    contours = trace_contours(*section.slice((0, 0, 0.5), (0, 0, 1)))
+
+    assert len(contours) == 2
+    assert all(c.closed for c in contours)
+    assert np.isclose(contours[0].length, contours[1].length)
+
+    closest = get_closest_contour(contours, (3, 1, 0.5))
+    assert contours[closest].points[:, 0].mean() > 1.5
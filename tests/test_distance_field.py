@@ -0,0 +1,139 @@
+import numpy as np
+
+from addon.algorithms.distance_field import DistanceField, FieldCache, \
+    FastMarchingSolver, SourceFieldSolver
+from addon.algorithms.fast_marching_arrays import FAR, FIXED, march
+from meshes import grid
+
+
+def split_face(solver, tri) -> int:
+    '''
+    Patches a vertex in the middle of a triangle, returns its index
+    '''
+    a, b, c = tri
+    vert = solver.mesh.vert_count
+    solver.patch([solver.mesh.verts[[a, b, c]].mean(axis=0)],
+                 [(a, b, c)], [(a, b, vert), (b, c, vert), (c, a, vert)])
+    return vert
+
+
+def test_second_query_from_a_source_does_not_march_again():
+    verts, tris = grid(41, 0.2)
+    solver = FastMarchingSolver(verts, tris)
+    source, far, near = 0, 30 * 41 + 30, 10 * 41 + 12
+
+    first = solver.find_geodesic_path(source, far)
+    field = solver.fields.get(source)
+    fixed = (field.front.state == FIXED).sum()
+
+    # Inside what is marched already, from the source or to it
+    solver.find_geodesic_path(source, near)
+    reverse = solver.find_geodesic_path(far, source)
+
+    assert solver.fields.get(source) is field
+    assert far not in solver.fields
+    assert (field.front.state == FIXED).sum() == fixed
+    np.testing.assert_allclose(reverse, first[::-1])
+
+    # Farther away the same front is carried on
+    solver.find_geodesic_path(source, len(verts) - 1)
+    assert solver.fields.get(source) is field
+    assert field.front.state[len(verts) - 1] == FIXED
+
+
+def test_fields_follow_subdivisions():
+    verts, tris = grid(41)
+    solver = FastMarchingSolver(verts, tris)
+    source, end = 0, 20 * 41 + 20
+
+    before = solver.find_geodesic_path(source, end)
+    field = solver.fields.get(source)
+
+    # Behind the front the new vertex takes the interpolated value
+    inside = split_face(solver, tris[10])
+    assert solver.fields.get(source) is field
+    assert field.front.state[inside] == FIXED
+    np.testing.assert_allclose(solver.find_geodesic_path(source, end),
+                               before)
+
+    full = march(solver.mesh, source)[0]
+    assert np.isclose(field.distances[inside], full[inside], rtol=1e-2)
+
+    # Ahead of it the march reaches the new vertex on its own
+    outside = split_face(solver, tris[-1])
+    assert field.front.state[outside] == FAR
+
+    solver.find_geodesic_path(source, outside)
+    assert solver.fields.get(source) is field
+    assert field.distances[outside] == \
+        march(solver.mesh, source)[0][outside]
+
+    # Across the front the field is marched again when needed
+    unfixed = np.flatnonzero(field.front.state != FIXED)
+    tri = next(t for t in tris if np.isin(t, unfixed).any() and
+               (field.front.state[t] == FIXED).any())
+    split_face(solver, tri)
+    assert source not in solver.fields
+
+
+def test_field_cache_keeps_the_recently_used_within_bytes():
+    verts, tris = grid(11)
+    solver = FastMarchingSolver(verts, tris)
+    size = DistanceField(solver.mesh, 0, np.zeros(len(verts))).nbytes
+
+    cache = FieldCache(3 * size)
+    for source in range(4):
+        cache.add(DistanceField(solver.mesh, source, np.zeros(len(verts))))
+        cache.get(0)
+
+    assert list(cache.fields) == [2, 3, 0]
+
+
+class EuclideanDistance(object):
+    '''
+    Exact distances of a flat mesh, standing in for the factored heat
+    method: it only takes the vertices of the mesh it was built with
+    '''
+    def __init__(self, verts):
+        self.verts = np.array(verts)
+        self.sources = []
+
+    def __call__(self, source: int) -> np.ndarray:
+        assert source < len(self.verts)
+        self.sources.append(source)
+        return np.linalg.norm(self.verts - self.verts[source], axis=1)
+
+
+def test_source_fields_take_new_vertices_without_rebuilding():
+    verts, tris = grid(21, 0.2)
+    distance = EuclideanDistance(verts)
+    solver = SourceFieldSolver(verts, tris, distance)
+    spacing = 1 / 20
+
+    solver.find_geodesic_path(0, 200)
+    field = solver.fields.get(0)
+
+    # A point placed in a face and another one in the faces it made
+    a, b, c = tris[150]
+    first = split_face(solver, (a, b, c))
+    second = split_face(solver, (a, b, first))
+
+    co = solver.mesh.verts
+    assert solver.fields.get(0) is field
+    np.testing.assert_allclose(field.distances,
+                               np.linalg.norm(co - co[0], axis=1),
+                               atol=spacing / 10)
+
+    for source in (first, second):
+        path = solver.find_geodesic_path(source, len(verts) - 1)
+        exact = np.linalg.norm(co - co[source], axis=1)
+        distances = solver.fields.get(source).distances
+
+        assert np.allclose(path[0], co[source])
+        assert np.allclose(path[-1], co[len(verts) - 1])
+        assert (distances >= exact - 1e-9).all()
+        assert (distances <= exact + 2 * spacing).all()
+
+    # Only vertices the function knows, each of them once
+    assert all(source < len(verts) for source in distance.sources)
+    assert len(distance.sources) == len(set(distance.sources))
@@ -0,0 +1,42 @@
+import numpy as np
+
+from addon.algorithms.edge_graph import EdgeGraph, shortest_path
+from meshes import grid
+
+
+def path_length(graph: EdgeGraph, path) -> float:
+    return np.linalg.norm(np.diff(graph.verts[path], axis=0), axis=1).sum()
+
+
+def test_guided_search_finds_paths_as_short():
+    verts, tris = grid(25, 0.3)
+    graph = EdgeGraph(verts, tris)
+    rng = np.random.default_rng(2)
+
+    for start, end in rng.integers(len(verts), size=(20, 2)):
+        guided = shortest_path(graph, start, end)
+        plain = shortest_path(graph, start, end, guided=False)
+
+        assert guided[0] == start and guided[-1] == end
+        assert np.isclose(path_length(graph, guided),
+                          path_length(graph, plain))
+
+
+def test_path_follows_the_edges():
+    verts, tris = grid(10)
+    graph = EdgeGraph(verts, tris)
+
+    path = shortest_path(graph, 0, 99)
+
+    for a, b in zip(path[:-1], path[1:]):
+        assert b in graph.get_edges(a)[0]
+
+    # Diagonals of the grid go from (i, j) to (i+1, j+1)
+    assert np.isclose(path_length(graph, path), np.sqrt(2))
+
+
+def test_unreachable_vertices():
+    verts, tris = grid(4)
+    graph = EdgeGraph(np.concatenate((verts, [(5, 5, 5)])), tris)
+
+    assert shortest_path(graph, 0, 16) is None
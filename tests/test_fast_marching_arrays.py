@@ -0,0 +1,146 @@
+from time import perf_counter
+
+import numpy as np
+import pytest
+
+from addon.algorithms.edge_graph import EdgeGraph, shortest_path
+from addon.algorithms.fast_marching_arrays import FIXED, MarchingMesh, \
+    march, march_bidirectional
+from addon.algorithms.mesh_gradient import trace_path
+from meshes import grid
+
+
+def best_time(function, *args, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        function(*args)
+        times.append(perf_counter() - start)
+    return min(times)
+
+
+def test_flat_distances_are_euclidean():
+    verts, tris = grid(41)
+    mesh = MarchingMesh(verts, tris)
+
+    geos, state = march(mesh, 0, None, None)
+
+    assert (state == FIXED).all()
+    np.testing.assert_allclose(geos, np.linalg.norm(verts, axis=1),
+                               atol=2e-2)
+
+
+def test_march_stops_at_targets():
+    verts, tris = grid(41)
+    mesh = MarchingMesh(verts, tris)
+
+    target = 20 * 41 + 20
+    geos, state = march(mesh, 0, {target})
+
+    assert state[target] == FIXED
+    assert (state == FIXED).sum() < len(verts)
+
+
+def test_march_is_not_slower_than_a_few_dijkstras():
+    '''
+    The update of every accepted vertex only touches a handful of
+    triangles, per vertex NumPy calls made the whole march ~3x slower.
+    Timed against a shortest path over the same vertices so the check
+    doesn't depend on the machine
+    '''
+    verts, tris = grid(80, 0.3)
+    mesh = MarchingMesh(verts, tris)
+    graph = EdgeGraph(verts, tris)
+
+    reference = best_time(shortest_path, graph, 0, len(verts) - 1, False)
+    elapsed = best_time(march, mesh, 0, None, None)
+
+    assert elapsed < 6 * reference, \
+        "March took {:.1f} times a shortest path".format(
+            elapsed / reference)
+
+
+def test_early_exit_is_exact_on_irregular_meshes():
+    '''
+    Stopping at the targets gives the same distances as the whole march
+    '''
+    verts, tris = grid(60, 0.3)
+    mesh = MarchingMesh(verts, tris)
+    rng = np.random.default_rng(1)
+
+    for start, target in rng.integers(len(verts), size=(20, 2)):
+        full, _ = march(mesh, start, None, None)
+        geos, state = march(mesh, start, {target})
+
+        assert state[target] == FIXED
+        assert geos[target] == full[target]
+
+
+def test_patched_mesh_marches_like_a_rebuild():
+    verts, tris = grid(20, 0.3)
+    mesh = MarchingMesh(verts, tris)
+
+    # Split two faces, then take the first split back
+    kept = [t for i, t in enumerate(tris.tolist()) if i not in (40, 300)]
+    first, second = len(verts), len(verts) + 1
+    centers = verts[tris[[40, 300]]].mean(axis=1)
+    fans = [[(a, b, v), (b, c, v), (c, a, v)]
+            for (a, b, c), v in zip(tris[[40, 300]].tolist(),
+                                    (first, second))]
+
+    mesh.patch(centers, tris[[40, 300]], fans[0] + fans[1])
+    mesh.patch([], fans[0], tris[[40]])
+
+    rebuilt = MarchingMesh(np.concatenate((verts, centers)),
+                           kept + [tris[40].tolist()] + fans[1])
+
+    for start in (0, second):
+        np.testing.assert_allclose(march(mesh, start, None, None)[0],
+                                   march(rebuilt, start, None, None)[0])
+
+
+def test_step_limit_never_truncates_silently():
+    verts, tris = grid(30)
+    mesh = MarchingMesh(verts, tris)
+    far = len(verts) - 1
+
+    with pytest.raises(ValueError):
+        march(mesh, 0, {far}, 100)
+
+    # Without a limit the march goes as far as it takes
+    geos, state = march(mesh, 0, {far})
+    assert state[far] == FIXED
+
+
+def path_length(points: np.ndarray) -> float:
+    return np.linalg.norm(np.diff(points, axis=0), axis=1).sum()
+
+
+def test_bidirectional_march_fixes_fewer_vertices():
+    verts, tris = grid(81, 0.1)
+    mesh = MarchingMesh(verts, tris)
+    start, end = 40 * 81 + 25, 40 * 81 + 55
+
+    geos, state = march(mesh, start, {end})
+    meeting, fronts = march_bidirectional(mesh, start, end)
+
+    fixed = sum((front.state == FIXED).sum() for front in fronts)
+    assert fixed < 0.75 * (state == FIXED).sum()
+
+    # Fixed values are the ones of the whole march from each end
+    full = march(mesh, start)[0], march(mesh, end)[0]
+    for front, values in zip(fronts, full):
+        done = front.state == FIXED
+        np.testing.assert_allclose(front.geos[done], values[done])
+
+    total = fronts[0].geos[meeting] + fronts[1].geos[meeting]
+    assert np.isclose(total, geos[end], rtol=1e-2)
+
+    forward = trace_path(mesh, geos, end, start)
+    joined = np.concatenate(
+        (trace_path(mesh, fronts[0].geos, meeting, start)[::-1],
+         trace_path(mesh, fronts[1].geos, meeting, end)[1:]))
+
+    assert np.allclose(joined[0], verts[start])
+    assert np.allclose(joined[-1], verts[end])
+    assert np.isclose(path_length(joined), path_length(forward), rtol=1e-2)
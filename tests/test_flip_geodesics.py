@@ -0,0 +1,70 @@
+import numpy as np
+
+from addon.algorithms.edge_graph import EdgeGraph, shortest_path
+from addon.algorithms.flip_geodesics import FlipOutSolver
+from meshes import sphere
+
+RINGS, SEGMENTS = 24, 48
+
+
+def path_length(points: np.ndarray) -> float:
+    return np.linalg.norm(np.diff(points, axis=0), axis=1).sum()
+
+
+def ring_vert(ring: int, segment: int) -> int:
+    return (ring - 1) * SEGMENTS + segment
+
+
+def test_paths_on_a_sphere_follow_great_circles():
+    verts, tris = sphere(2., RINGS, SEGMENTS)
+    solver = FlipOutSolver(verts, tris)
+    graph = EdgeGraph(verts, tris)
+
+    for start, end in ((ring_vert(5, 0), ring_vert(18, 20)),
+                       (ring_vert(3, 10), ring_vert(9, 40)),
+                       (ring_vert(12, 0), ring_vert(12, 24))):
+        path = solver.find_geodesic_path(start, end)
+
+        assert np.allclose(path[0], verts[start])
+        assert np.allclose(path[-1], verts[end])
+
+        # The surface is inscribed in the sphere, its geodesics are a
+        # bit shorter than the great circles
+        cos = np.dot(verts[start], verts[end]) / 4
+        arc = 2. * np.arccos(np.clip(cos, -1, 1))
+        length = path_length(path)
+        assert 0.98 * arc < length <= arc
+
+        edges = path_length(verts[shortest_path(graph, start, end)])
+        assert length < edges
+
+
+def test_patched_solver_matches_a_rebuilt_one():
+    verts, tris = sphere(1., RINGS, SEGMENTS)
+    solver = FlipOutSolver(verts, tris)
+
+    # Points placed inside two faces
+    new_verts, removed, added = [], [], []
+    for f in (100, 700):
+        a, b, c = tris[f]
+        vert = len(verts) + len(new_verts)
+        new_verts.append(verts[[a, b, c]].mean(axis=0))
+        removed.append((a, b, c))
+        added.extend(((a, b, vert), (b, c, vert), (c, a, vert)))
+
+    solver.patch(new_verts, removed, added)
+
+    rebuilt = FlipOutSolver(
+        np.concatenate((verts, new_verts)),
+        np.concatenate((np.delete(tris, (100, 700), axis=0), added)))
+
+    first, second = len(verts), len(verts) + 1
+
+    for start, end in ((first, second), (first, ring_vert(20, 5)),
+                       (ring_vert(2, 30), second)):
+        patched_path = solver.find_geodesic_path(start, end)
+        rebuilt_path = rebuilt.find_geodesic_path(start, end)
+
+        assert np.isclose(path_length(patched_path),
+                          path_length(rebuilt_path))
+        assert np.allclose(patched_path[[0, -1]], rebuilt_path[[0, -1]])
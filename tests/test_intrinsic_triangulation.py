@@ -0,0 +1,147 @@
+import numpy as np
+import pytest
+
+from addon.algorithms.intrinsic_triangulation import IntrinsicTriangulation, \
+    IntrinsicOverlay
+from addon.algorithms.mesh_arrays import split_tri, split_tri_edge
+from meshes import grid
+
+
+class Mesh(object):
+    '''
+    Vertex and triangle lists edited alongside a patched triangulation
+    '''
+    def __init__(self, verts, tris):
+        self.verts = [tuple(v) for v in verts.tolist()]
+        self.tris = [tuple(t) for t in tris.tolist()]
+        self.tri = IntrinsicTriangulation(verts, tris)
+
+    def edit(self, verts, removed, added):
+        self.verts += verts
+        for tri in removed:
+            self.tris.remove(tri)
+        self.tris += added
+        self.tri.patch(np.array(verts).reshape(-1, 3), removed, added)
+
+    def rebuild(self) -> IntrinsicTriangulation:
+        return IntrinsicTriangulation(np.array(self.verts),
+                                      np.array(self.tris))
+
+
+def split_face(mesh: Mesh, tri) -> int:
+    vert = len(mesh.verts)
+    a, b, c = tri
+    mesh.edit([tuple(np.mean([mesh.verts[i] for i in tri], axis=0))],
+              [tri], [(a, b, vert), (b, c, vert), (c, a, vert)])
+    return vert
+
+
+def assert_same_signposts(patched: IntrinsicTriangulation,
+                          rebuilt: IntrinsicTriangulation):
+
+    for v in range(len(rebuilt.verts)):
+
+        boundary = rebuilt.is_boundary_vert(v)
+        assert patched.is_boundary_vert(v) == boundary
+        assert np.isclose(patched.angle_sum(v), rebuilt.angle_sum(v))
+
+        angles = {patched.head(h): (patched.angle(h), patched.length(h))
+                  for h in patched.outgoing(v)}
+        expected = {rebuilt.head(h): (rebuilt.angle(h), rebuilt.length(h))
+                    for h in rebuilt.outgoing(v)}
+        assert angles.keys() == expected.keys()
+
+        if not expected:
+            continue
+
+        # Interior vertices may be measured from another half-edge
+        offset = 0
+        if not boundary:
+            first = next(iter(expected))
+            offset = angles[first][0] - expected[first][0]
+
+        for head, (angle, length) in expected.items():
+            turn = (angles[head][0] - angle - offset) % rebuilt.angle_sum(v)
+            assert min(turn, rebuilt.angle_sum(v) - turn) < 1e-9
+            assert np.isclose(angles[head][1], length)
+
+
+def test_patched_faces_match_a_rebuild():
+    verts, tris = grid(8, 0.3)
+    mesh = Mesh(verts, tris)
+
+    a, b, c = mesh.tris[20]
+    vert = split_face(mesh, (a, b, c))
+    split_face(mesh, mesh.tris[0])
+    assert_same_signposts(mesh.tri, mesh.rebuild())
+
+    # Move the first vertex like a dragged point does
+    mesh.edit([], [(a, b, vert), (b, c, vert), (c, a, vert)], [(a, b, c)])
+    split_face(mesh, mesh.tris[30])
+    assert_same_signposts(mesh.tri, mesh.rebuild())
+
+
+def test_patched_boundary_edges_match_a_rebuild():
+    verts, tris = grid(5)
+    mesh = Mesh(verts, tris)
+
+    # Split the boundary edge 0-1 of the triangle (0, 6, 1)
+    vert = len(mesh.verts)
+    mesh.edit([tuple(verts[[0, 1]].mean(axis=0))], [(0, 6, 1)],
+              [(0, 6, vert), (vert, 6, 1)])
+    assert mesh.tri.is_boundary_vert(vert)
+    assert_same_signposts(mesh.tri, mesh.rebuild())
+
+    # Taking it back leaves it without faces
+    mesh.edit([], [(0, 6, vert), (vert, 6, 1)], [(0, 6, 1)])
+    assert mesh.tri.vert_half_edge(vert) == -1
+    assert_same_signposts(mesh.tri, mesh.rebuild())
+
+
+def test_flipped_edges_trace_straight_over_a_plane():
+    verts, tris = grid(6, 0.3)
+    base = IntrinsicTriangulation(verts, tris)
+    tri = IntrinsicOverlay(base)
+
+    lengths = base.edge_length.copy()
+    flipped = [e for e in range(base.edge_count) if tri.flip_edge(e)]
+    assert flipped and np.array_equal(base.edge_length, lengths)
+
+    for e in flipped:
+        points = tri.trace_half_edge(2 * e, base)
+
+        assert np.allclose(points[0], verts[tri.tail(2 * e)])
+        assert np.allclose(points[-1], verts[tri.head(2 * e)])
+        assert np.isclose(
+            np.linalg.norm(np.diff(points, axis=0), axis=1).sum(),
+            tri.length(2 * e))
+
+
+def test_splits_keep_the_winding_of_the_faces():
+    verts, tris = grid(8, 0.3)
+    mesh = Mesh(verts, tris)
+
+    face = mesh.tris[20]
+    vert = len(mesh.verts)
+    mesh.edit([tuple(np.mean([mesh.verts[i] for i in face], axis=0))],
+              [face], split_tri(face, vert))
+
+    # The diagonal of a quad of the grid and the faces on both sides
+    first = mesh.tris[5]
+    edge = (first[0], first[2])
+    second = next(t for t in mesh.tris
+                  if t != first and set(edge) <= set(t))
+    vert = len(mesh.verts)
+    mesh.edit([tuple(np.mean([mesh.verts[i] for i in edge], axis=0))],
+              [first, second],
+              split_tri_edge(first, edge, vert) +
+              split_tri_edge(second, edge, vert))
+
+    assert_same_signposts(mesh.tri, mesh.rebuild())
+
+    # Faces wound the other way are refused
+    face = mesh.tris[40]
+    flipped = [t[::-1] for t in split_tri(face, len(mesh.verts))]
+    with pytest.raises(ValueError):
+        mesh.tri.patch(np.mean([mesh.verts[i] for i in face], axis=0),
+                       [face], flipped)
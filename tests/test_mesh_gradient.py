@@ -0,0 +1,35 @@
+import numpy as np
+
+from addon.algorithms.fast_marching_arrays import MarchingMesh, march
+from addon.algorithms.mesh_gradient import trace_path
+from meshes import grid
+
+
+def test_path_descends_to_the_source():
+    verts, tris = grid(21)
+    mesh = MarchingMesh(verts, tris)
+    source, start = 0, len(verts) - 1
+
+    geos, _ = march(mesh, source, None, None)
+    path = trace_path(mesh, geos, start, source)
+
+    np.testing.assert_array_equal(path[0], verts[start])
+    np.testing.assert_array_equal(path[-1], verts[source])
+    length = np.linalg.norm(np.diff(path, axis=0), axis=1).sum()
+    assert abs(length - np.sqrt(2)) < 1e-2
+
+
+def test_path_ends_at_the_source_past_a_local_minimum():
+    verts, tris = grid(21)
+    mesh = MarchingMesh(verts, tris)
+    source, start = 0, len(verts) - 1
+
+    # A well in the middle of the field the descent gets stuck in
+    geos = np.linalg.norm(verts, axis=1)
+    well = 10 * 21 + 10
+    geos[well] = 0.01
+
+    path = trace_path(mesh, geos, start, source)
+
+    np.testing.assert_array_equal(path[-1], verts[source])
+    assert any(np.array_equal(p, verts[well]) for p in path)
@@ -0,0 +1,108 @@
+import threading
+
+from addon.utility.path_scheduler import PathScheduler
+
+
+class StubPath(object):
+    '''
+    Stands in for GeoPath: a mouse move redoes segment 0 towards the
+    mouse position, its geodesic waits for the gate to open
+    '''
+    def __init__(self):
+        self.deferred_segments = None
+        self.segments = dict()
+        self.moves = []
+        self.computed = []
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def mouse_move(self, context, x, y):
+        self.moves.append((x, y))
+
+        if self.deferred_segments is not None:
+            self.deferred_segments[0] = (x, y)
+        else:
+            self.set_segment(0, self.compute_geodesic(x, y))
+
+    def compute_geodesic(self, x, y):
+        self.gate.wait()
+        self.computed.append((x, y))
+        return [(x, y)]
+
+    def set_segment(self, segment_pos, path):
+        self.segments[segment_pos] = path
+
+
+def finish(scheduler: PathScheduler):
+    scheduler.worker.join()
+    return scheduler.update(None)
+
+
+def test_moves_are_coalesced_into_the_last_one():
+    path = StubPath()
+    scheduler = PathScheduler(path)
+
+    for x in range(5):
+        scheduler.push(path.mouse_move, x, -x)
+
+    assert scheduler.update(None)
+    assert finish(scheduler)
+
+    assert path.moves == [(4, -4)]
+    assert path.computed == [(4, -4)]
+    assert path.segments == {0: [(4, -4)]}
+
+
+def test_busy_worker_is_swapped_in_once_done():
+    path = StubPath()
+    path.gate.clear()
+    scheduler = PathScheduler(path)
+
+    scheduler.push(path.mouse_move, 1, 1)
+    scheduler.update(None)
+
+    # Moves pile up while the worker runs, the old path stays
+    scheduler.push(path.mouse_move, 2, 2)
+    scheduler.push(path.mouse_move, 3, 3)
+    assert not scheduler.update(None)
+    assert path.segments == {}
+
+    path.gate.set()
+    assert finish(scheduler)
+    assert path.segments == {0: [(1, 1)]}
+
+    # The last pending move went to the next worker
+    assert finish(scheduler)
+    assert path.moves == [(1, 1), (3, 3)]
+    assert path.segments == {0: [(3, 3)]}
+
+
+def test_cancel_drops_pending_moves_and_results():
+    path = StubPath()
+    scheduler = PathScheduler(path)
+
+    scheduler.push(path.mouse_move, 1, 1)
+    scheduler.update(None)
+    scheduler.push(path.mouse_move, 2, 2)
+
+    scheduler.cancel()
+
+    assert scheduler.worker is None
+    assert not scheduler.update(None)
+    assert path.moves == [(1, 1)]
+    assert path.segments == {}
+
+
+def test_flush_brings_the_path_up_to_date():
+    path = StubPath()
+    scheduler = PathScheduler(path)
+
+    scheduler.push(path.mouse_move, 1, 1)
+    scheduler.update(None)
+    scheduler.push(path.mouse_move, 2, 2)
+
+    scheduler.flush(None)
+
+    assert scheduler.worker is None
+    assert path.moves == [(1, 1), (2, 2)]
+    assert path.segments == {0: [(2, 2)]}
@@ -0,0 +1,64 @@
+import numpy as np
+
+from addon.algorithms.point_grid import PathIndex, PointGrid, \
+    point_segment_distance
+
+
+def test_query_matches_brute_force():
+    rng = np.random.default_rng(1)
+    grid = PointGrid(0.1)
+    groups = {key: rng.uniform(-1, 1, (50, 3)) for key in range(6)}
+
+    for key, points in groups.items():
+        grid.add(key, points)
+    grid.remove(3)
+    del groups[3]
+
+    for point in rng.uniform(-1, 1, (20, 3)):
+        for radius in (0.05, 0.2, 0.5):
+            expected = sorted(
+                (np.linalg.norm(points[i] - point), key, i)
+                for key, points in groups.items()
+                for i in range(len(points))
+                if np.linalg.norm(points[i] - point) <= radius)
+
+            found = grid.query(point, radius)
+            assert sorted(found) == sorted((k, i) for _, k, i in expected)
+
+
+def test_path_index_finds_the_closest_sub_segment():
+    rng = np.random.default_rng(5)
+    segments = [np.cumsum(rng.normal(0, 0.05, (30, 3)), axis=0) + offset
+                for offset in rng.uniform(-1, 1, (4, 3))]
+
+    index = PathIndex()
+    index.update(segments)
+
+    for point in rng.uniform(-1, 1, (50, 3)):
+        distances = [
+            (point_segment_distance(point, s[j], s[j+1]), pos, j)
+            for pos, s in enumerate(segments) for j in range(len(s) - 1)]
+        best = min(distances)
+
+        found = index.find_closest(point, 0.3)
+
+        if best[0] > 0.3:
+            assert found is None
+        else:
+            pos, j = found
+            distance = point_segment_distance(
+                point, segments[pos][j], segments[pos][j+1])
+            assert np.isclose(distance, best[0])
+
+
+def test_path_index_only_reindexes_replaced_segments():
+    first, second = np.zeros((2, 3)), np.ones((2, 3))
+    index = PathIndex()
+    index.update([first, second])
+
+    replaced = np.array([(5., 5, 5), (6, 5, 5)])
+    index.update([first, replaced])
+
+    assert id(second) not in index.grid
+    assert index.find_closest((5.5, 5, 5), 0.1) == (1, 0)
+    assert index.find_closest((1, 1, 1), 0.1) is None
@@ -0,0 +1,149 @@
+import numpy as np
+
+from addon.algorithms.edge_graph import EdgeGraph, shortest_path
+from addon.algorithms.geometry_provider import MeshArraysGeometry
+from addon.algorithms.mesh_arrays import MeshArrays
+from addon.algorithms.solver_cache import SolverCache
+from meshes import grid
+
+
+class CountingBuilder(object):
+
+    def __init__(self, build_solver):
+        self.build_solver = build_solver
+        self.builds = 0
+
+    def __call__(self, verts, tris):
+        self.builds += 1
+        return self.build_solver(verts, tris)
+
+
+class UnpatchableGraph(EdgeGraph):
+    '''
+    Graph standing in for the solvers that can't be patched
+    '''
+    @property
+    def patch(self):
+        raise AttributeError('patch')
+
+
+def split_face(arrays: MeshArrays, tri: int) -> int:
+    '''
+    Places a vertex in the middle of a triangle like a
+    point placed by the user, returns its slot
+    '''
+    a, b, c = arrays.tris[tri].tolist()
+    vert = arrays.add_vert(arrays.verts[[a, b, c]].mean(axis=0))
+
+    arrays.remove_tri(a, b, c)
+    for u, v in ((a, b), (b, c), (c, a)):
+        arrays.add_tri(u, v, vert)
+
+    return vert
+
+
+def undo_split(arrays: MeshArrays, vert: int, tri):
+    a, b, c = tri
+    for u, v in ((a, b), (b, c), (c, a)):
+        arrays.remove_tri(u, v, vert)
+    arrays.remove_vert(vert)
+    arrays.add_tri(a, b, c)
+
+
+def path_length(graph: EdgeGraph, start: int, end: int) -> float:
+    path = shortest_path(graph, start, end)
+    return np.linalg.norm(np.diff(graph.verts[path], axis=0), axis=1).sum()
+
+
+def query(cache: SolverCache, geometry, start: int, end: int) -> float:
+    graph = cache.get_solver(geometry.version, (start, end))
+    return path_length(graph, cache.solver_index(start),
+                       cache.solver_index(end))
+
+
+def test_drag_patches_the_graph_instead_of_rebuilding():
+    verts, tris = grid(30, 0.2)
+    arrays = MeshArrays(verts, tris)
+    geometry = MeshArraysGeometry(arrays)
+    builder = CountingBuilder(EdgeGraph)
+    cache = SolverCache(builder, geometry)
+
+    start = 0
+    query(cache, geometry, start, len(verts) - 1)
+
+    # Every move undoes the last split and places a new vertex
+    rng = np.random.default_rng(0)
+    vert, tri = None, None
+    for face in rng.integers(len(tris), size=10):
+        if vert is not None:
+            undo_split(arrays, vert, tri)
+            geometry.touch()
+
+        slot = arrays.find_tri(*tris[face].tolist())
+        tri = arrays.tris[slot].tolist()
+        vert = split_face(arrays, slot)
+        geometry.touch()
+
+        length = query(cache, geometry, start, vert)
+
+        rebuilt = EdgeGraph(*arrays.compact()[:2])
+        vert_map = arrays.compact()[2]
+        assert np.isclose(length, path_length(rebuilt, vert_map[start],
+                                              vert_map[vert]))
+
+    assert builder.builds == 1
+
+
+def test_edges_split_in_two_are_removed():
+    verts, tris = grid(3)
+    arrays = MeshArrays(verts, tris)
+    geometry = MeshArraysGeometry(arrays)
+    cache = SolverCache(EdgeGraph, geometry)
+    graph = cache.get_solver(None, ())
+
+    # Split the diagonal 0-4 shared by the triangles (0, 3, 4), (0, 4, 1)
+    vert = arrays.add_vert(verts[[0, 4]].mean(axis=0))
+    arrays.remove_tri(0, 3, 4)
+    arrays.remove_tri(0, 4, 1)
+    for tri in ((0, 3, vert), (3, 4, vert), (4, 1, vert), (1, 0, vert)):
+        arrays.add_tri(*tri)
+    geometry.touch()
+
+    assert cache.get_solver(None, (0, vert)) is graph
+    assert 4 not in graph.get_edges(0)[0].tolist()
+    assert sorted(graph.get_edges(cache.solver_index(vert))[0]) == \
+        [0, 1, 3, 4]
+
+
+def test_unpatchable_solvers_rebuild_for_new_vertices():
+    verts, tris = grid(10)
+    arrays = MeshArrays(verts, tris)
+    geometry = MeshArraysGeometry(arrays)
+    builder = CountingBuilder(UnpatchableGraph)
+    cache = SolverCache(builder, geometry)
+
+    query(cache, geometry, 0, 99)
+    vert = split_face(arrays, 50)
+    geometry.touch()
+
+    # Vertices it knows are still answered by the old one
+    query(cache, geometry, 0, 99)
+    assert builder.builds == 1
+
+    query(cache, geometry, 0, vert)
+    assert builder.builds == 2
+
+
+def test_rebuilds_past_the_threshold():
+    verts, tris = grid(10)
+    arrays = MeshArrays(verts, tris)
+    geometry = MeshArraysGeometry(arrays)
+    builder = CountingBuilder(EdgeGraph)
+    cache = SolverCache(builder, geometry, rebuild_threshold=4)
+
+    for i in range(8):
+        split_face(arrays, i)
+        geometry.touch()
+        query(cache, geometry, 0, 99)
+
+    assert builder.builds == 2